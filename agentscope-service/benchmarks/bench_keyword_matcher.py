@@ -0,0 +1,126 @@
+"""
+Micro-benchmark: per-keyword ``in`` scans vs. the compiled keyword matcher.
+
+Run from agentscope-service/:
+
+    python benchmarks/bench_keyword_matcher.py [--keywords N]
+
+"all categories" classifies a message against every table with a cold
+matcher cache; "call sites" replays the short-circuiting checks the
+orchestrator, assistant and engineer did before the matcher existed,
+against one cold scan plus two cached lookups of the same message, each
+followed by the same ``has``/``count`` checks.
+``--keywords`` pads every category with synthetic keywords to show how
+both approaches scale as the tables grow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.heuristics import DEFAULT_KEYWORD_TABLES, KeywordMatcher  # noqa: E402
+
+MESSAGES = {
+    "short": "你好，订单一直显示异常，能不能帮我看看？",
+    "medium": "我们的系统从今天早上开始出现报错，部分用户登录后白屏，"
+    "刷新几次之后又恢复正常，但是下单接口偶尔返回500。" * 3,
+    "long": "客服你好，我想咨询一下关于账单和发票的问题，上个月的费用明细和合同不一致，"
+    "希望尽快给出解释，否则我们会考虑投诉。" * 30,
+}
+
+
+def naive_all(tables: dict[str, list[str]], text: str) -> dict[str, set[str]]:
+    lowered = text.lower()
+    hits: dict[str, set[str]] = {}
+    for category, keywords in tables.items():
+        found = {kw for kw in keywords if kw in lowered}
+        if found:
+            hits[category] = found
+    return hits
+
+
+def naive_call_sites(tables: dict[str, list[str]], text: str) -> None:
+    lowered = text.lower()
+    any(kw in lowered for kw in tables["fault"]) or any(kw in lowered for kw in tables["complaint"])
+    any(kw in text for kw in tables["requirement"])
+    sum(1 for kw in tables["complex"] if kw in text)
+    any(kw in text for kw in tables["negative"]) or any(kw in text for kw in tables["positive"])
+    (
+        any(kw in lowered for kw in tables["severity_p0"])
+        or any(kw in lowered for kw in tables["severity_p1"])
+        or any(kw in lowered for kw in tables["severity_p2"])
+    )
+
+
+def matcher_call_sites(matcher: KeywordMatcher, text: str) -> None:
+    # orchestrator (scenario/requirement/complexity), assistant, engineer
+    matcher._cache.clear()
+    hits = matcher.scan(text)
+    hits.has("fault") or hits.has("complaint")
+    hits.has("requirement")
+    hits.count("complex")
+    hits = matcher.scan(text)
+    hits.has("negative") or hits.has("positive")
+    hits = matcher.scan(text)
+    hits.has("severity_p0") or hits.has("severity_p1") or hits.has("severity_p2")
+
+
+def matcher_all(matcher: KeywordMatcher, text: str) -> None:
+    # len() completes every category, also for hits searched on demand
+    len(matcher.scan(text))
+
+
+def padded_tables(extra: int) -> dict[str, list[str]]:
+    tables = {category: list(keywords) for category, keywords in DEFAULT_KEYWORD_TABLES.items()}
+    for category, keywords in tables.items():
+        keywords.extend(f"{category}词{i}号" for i in range(extra))
+    return tables
+
+
+def bench(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--keywords", type=int, default=0, help="synthetic keywords added per category"
+    )
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    tables = padded_tables(args.keywords)
+    matcher = KeywordMatcher(tables)
+    cold = KeywordMatcher(tables, cache_size=0)
+    total = sum(len(keywords) for keywords in tables.values())
+    print(f"{total} keywords in {len(tables)} categories, {len(matcher._delta)} automaton states")
+    print(
+        f"{'message':<8} {'chars':>6} {'case':<15} {'naive µs':>10} {'matcher µs':>11} {'speedup':>8}"
+    )
+    for name, text in MESSAGES.items():
+        assert naive_all(tables, text) == cold.scan(text)
+        rows = [
+            ("all categories", partial(naive_all, tables, text), partial(matcher_all, cold, text)),
+            (
+                "call sites",
+                partial(naive_call_sites, tables, text),
+                partial(matcher_call_sites, matcher, text),
+            ),
+        ]
+        for case, naive_fn, matcher_fn in rows:
+            naive_us = bench(naive_fn, args.number)
+            matcher_us = bench(matcher_fn, args.number)
+            print(
+                f"{name:<8} {len(text):>6} {case:<15} {naive_us:>10.2f} {matcher_us:>11.2f} "
+                f"{naive_us / matcher_us:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: routing feature extraction via ``asyncio.to_thread`` vs. inline.
+
+Run from agentscope-service/:
+
+    python benchmarks/bench_routing_features.py [--concurrency N]
+
+"before" dispatches every extraction to the default executor, as
+``_analyze_request`` used to do for the complexity heuristic; "after" is
+``extract_routing_features_async`` with the default offload threshold.
+Both use a matcher without result cache so every call does the full scan.
+The last table shows how long one extraction blocks the event loop per
+message size, which is what the offload threshold trades against.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.config.settings import settings  # noqa: E402
+from src.heuristics import (  # noqa: E402
+    DEFAULT_KEYWORD_TABLES,
+    KeywordMatcher,
+    extract_routing_features,
+    extract_routing_features_async,
+)
+
+MATCHER = KeywordMatcher(DEFAULT_KEYWORD_TABLES, cache_size=0)
+SAMPLE = "我们的系统从今天早上开始出现报错，部分用户登录后白屏，能不能尽快处理？为什么一直这样？"
+
+
+async def before(content: str) -> None:
+    await asyncio.to_thread(extract_routing_features, content, MATCHER)
+
+
+async def after(content: str) -> None:
+    await extract_routing_features_async(content, settings.routing_offload_chars, MATCHER)
+
+
+async def _timed(fn, content: str) -> float:
+    start = time.perf_counter()
+    await fn(content)
+    return time.perf_counter() - start
+
+
+async def sequential(fn, content: str, number: int) -> float:
+    samples = [await _timed(fn, content) for _ in range(number)]
+    return statistics.median(samples) * 1e6
+
+
+async def concurrent(fn, content: str, concurrency: int) -> tuple[float, float, float]:
+    start = time.perf_counter()
+    samples = sorted(await asyncio.gather(*(_timed(fn, content) for _ in range(concurrency))))
+    wall = time.perf_counter() - start
+    p50 = samples[len(samples) // 2] * 1e3
+    p99 = samples[int(len(samples) * 0.99) - 1] * 1e3
+    return wall * 1e3, p50, p99
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"offload threshold: {settings.routing_offload_chars} chars")
+    print("\nsequential, median µs per request")
+    print(f"{'chars':>7} {'before':>9} {'after':>9} {'speedup':>8}")
+    for repeat in (1, 4, 40):
+        content = SAMPLE * repeat
+        b = await sequential(before, content, args.number)
+        a = await sequential(after, content, args.number)
+        print(f"{len(content):>7} {b:>9.2f} {a:>9.2f} {b / a:>7.2f}x")
+
+    print(f"\n{args.concurrency} concurrent requests, ms")
+    print(f"{'variant':<8} {'wall':>8} {'p50':>8} {'p99':>8}")
+    for name, fn in (("before", before), ("after", after)):
+        await concurrent(fn, SAMPLE * 4, args.concurrency)  # warm the executor
+        wall, p50, p99 = await concurrent(fn, SAMPLE * 4, args.concurrency)
+        print(f"{name:<8} {wall:>8.2f} {p50:>8.2f} {p99:>8.2f}")
+
+    print("\nevent-loop time of one inline extraction, µs")
+    for chars in (1_000, 4_000, 16_000, 64_000):
+        content = (SAMPLE * (chars // len(SAMPLE) + 1))[:chars]
+        start = time.perf_counter()
+        for _ in range(20):
+            extract_routing_features(content, MATCHER)
+        print(f"{chars:>7} {(time.perf_counter() - start) / 20 * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -2,12 +2,20 @@ from .assistant_agent import AssistantAgent
 from .engineer_agent import EngineerAgent
 from .inspector_agent import InspectorAgent
 from .human_agent_adapter import HumanAgentAdapter
+from .handoff import HandoffCapacityError, HandoffQueue
 from .base_agent import BaseReActAgent
+from .agent_pool import AgentPool
+from .prefetch import PrefetchEngine, PrefetchSource
 
 __all__ = [
     "AssistantAgent",
     "EngineerAgent",
     "InspectorAgent",
     "HumanAgentAdapter",
+    "HandoffQueue",
+    "HandoffCapacityError",
     "BaseReActAgent",
+    "AgentPool",
+    "PrefetchEngine",
+    "PrefetchSource",
 ]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from agentscope.memory import InMemoryMemory
+from prometheus_client import Counter, Gauge
+
+POOL_SIZE = Gauge(
+    "agentscope_agent_pool_size",
+    "Per-conversation agent contexts currently held by the pool",
+    ["agent"],
+)
+POOL_CHECKOUTS = Counter(
+    "agentscope_agent_pool_checkouts_total",
+    "Agent context checkouts by result (hit/miss/ephemeral)",
+    ["agent", "result"],
+)
+POOL_EVICTIONS = Counter(
+    "agentscope_agent_pool_evictions_total",
+    "Agent contexts evicted from the pool (LRU)",
+    ["agent"],
+)
+
+
+@dataclass
+class _PoolEntry:
+    agent: Any
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    in_use: int = 0
+
+
+class AgentPool:
+    """
+    Bounded LRU pool of per-conversation agent contexts.
+
+    The template agent (created once in lifespan) is never mutated per call.
+    Each conversation gets its own sibling instance that shares the model,
+    formatter, toolkit and MCP clients with the template but owns its memory
+    and composed system prompt. Calls for the same conversation are serialized
+    via a per-entry lock; different conversations run concurrently.
+    """
+
+    def __init__(self, template: Any, max_size: int = 256) -> None:
+        self._template = template
+        self._max_size = max(1, max_size)
+        self._entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+
+    @property
+    def agent_name(self) -> str:
+        return str(self._template.name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, conversation_id: object) -> bool:
+        return conversation_id in self._entries
+
+    def spawn(self) -> Any:
+        """Create a sibling instance of the template with fresh per-call state."""
+        template = self._template
+        return type(template)(
+            name=template.name,
+            sys_prompt=template._sys_prompt,
+            model=template.model,
+            formatter=template.formatter,
+            toolkit=template.toolkit,
+            mcp_client=template.mcp_client,
+            persistence=template.persistence,
+            memory=InMemoryMemory(),
+            max_iters=template.max_iters,
+        )
+
+    @asynccontextmanager
+    async def checkout(self, conversation_id: str | None) -> AsyncIterator[Any]:
+        """
+        Check out the agent context bound to a conversation.
+
+        Requests without a conversation id get an ephemeral, unpooled instance.
+        """
+        if not conversation_id:
+            POOL_CHECKOUTS.labels(self.agent_name, "ephemeral").inc()
+            yield self.spawn()
+            return
+
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            entry = _PoolEntry(agent=self.spawn())
+            self._entries[conversation_id] = entry
+            POOL_CHECKOUTS.labels(self.agent_name, "miss").inc()
+        else:
+            self._entries.move_to_end(conversation_id)
+            POOL_CHECKOUTS.labels(self.agent_name, "hit").inc()
+
+        entry.in_use += 1
+        try:
+            async with entry.lock:
+                yield entry.agent
+        finally:
+            entry.in_use -= 1
+            self._evict()
+
+    def discard(self, conversation_id: str) -> None:
+        """Drop an idle conversation context (e.g. when the conversation closes)."""
+        entry = self._entries.get(conversation_id)
+        if entry is not None and entry.in_use == 0:
+            del self._entries[conversation_id]
+        POOL_SIZE.labels(self.agent_name).set(len(self._entries))
+
+    def _evict(self) -> None:
+        overflow = len(self._entries) - self._max_size
+        if overflow > 0:
+            for key in [k for k, e in self._entries.items() if e.in_use == 0][:overflow]:
+                del self._entries[key]
+                POOL_EVICTIONS.labels(self.agent_name).inc()
+        POOL_SIZE.labels(self.agent_name).set(len(self._entries))
@@ -24,9 +24,15 @@ from agentscope.message import Msg
 from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
-from src.tools.mcp_tools import BackendMCPClient
+from src.agents.agent_pool import AgentPool
+from src.agents.base_agent import DeadlineChatModel
+from src.agents.prefetch import PrefetchEngine, PrefetchSource
+from src.agents.streaming import publish_delta
+from src.config.settings import settings
+from src.heuristics import routing_keywords
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
 from src.tools.persistence import PersistenceClient
-from src.memory.persistent_memory import PersistentMemory
+from src.memory.persistent_memory import PersistentMemory, flush_agent_memory
 from src.prompts.loader import prompt_registry
 from src.prompts.agent_prompt import build_agent_prompt
 
@@ -170,12 +176,25 @@ class AssistantAgent(ReActAgent):
         self.mcp_client = mcp_client
         self.persistence = persistence
         self._prompt_filename = "agents/assistant/base.md"
+        self.pool: AgentPool | None = None
+
+    async def print(self, msg: Msg, last: bool = True, speech: Any = None) -> None:
+        """推送流式增量到当前请求的客户端，再交给默认输出"""
+        await publish_delta(self.name, msg, last)
+        await super().print(msg, last, speech)
 
     async def __call__(self, msg: Msg) -> Msg:
+        if self.pool is not None:
+            # Run on the conversation's own context instead of mutating this shared instance
+            conversation_id = msg.metadata.get("conversationId") if msg.metadata else None
+            async with self.pool.checkout(conversation_id) as agent:
+                response = await agent(msg)
+            await self._broadcast_to_subscribers(response)
+            return response
         # Hot reload prompt on each call
         base_prompt = prompt_registry.get(self._prompt_filename, fallback=ASSISTANT_AGENT_PROMPT)
         if self.persistence:
-            memory = PersistentMemory(
+            memory = PersistentMemory.from_settings(
                 self.persistence,
                 msg.metadata.get("conversationId") if msg.metadata else None,
                 self.name,
@@ -185,7 +204,7 @@ class AssistantAgent(ReActAgent):
         if os.getenv("AGENTSCOPE_PREFETCH_ENABLED", "false").lower() == "true":
             await self._prefetch_context(msg)
         combined_prompt = build_agent_prompt(base_prompt, "assistant", msg.metadata or {})
-        self.sys_prompt = self._inject_prefetch_context(combined_prompt, msg.metadata or {})
+        self._sys_prompt = self._inject_prefetch_context(combined_prompt, msg.metadata or {})
         start = time.time()
         try:
             response = await super().__call__(msg)
@@ -216,29 +235,26 @@ class AssistantAgent(ReActAgent):
                     metadata=msg.metadata or {},
                 )
             raise
+        finally:
+            # Also after a failed or cancelled call, so the user's turn is not lost
+            await flush_agent_memory(self.memory)
 
     async def _prefetch_context(self, msg: Msg) -> None:
         metadata = msg.metadata or {}
-        prefetch: dict[str, Any] = {}
-        try:
-            prefetch["sentiment"] = await self.analyze_sentiment(msg)
-        except Exception:
-            pass
+        sources = [
+            PrefetchSource("sentiment", fetch=lambda: self.analyze_sentiment(msg)),
+            PrefetchSource("knowledge", ToolCall("searchKnowledge", {
+                "query": msg.content,
+                "mode": "semantic",
+                "filters": {"limit": 5},
+            })),
+        ]
         customer_id = metadata.get("customerId")
         if customer_id:
-            try:
-                prefetch["customer_profile"] = await self.get_customer_profile(customer_id)
-            except Exception:
-                pass
-        try:
-            prefetch["knowledge"] = await self.mcp_client.call_tool(
-                "searchKnowledge",
-                query=msg.content,
-                mode="semantic",
-                filters={"limit": 5},
-            )
-        except Exception:
-            pass
+            sources.append(PrefetchSource(
+                "customer_profile", ToolCall("getCustomerProfile", {"customerId": customer_id})
+            ))
+        prefetch = await PrefetchEngine(self.mcp_client, self.name).fetch(sources)
         if prefetch:
             metadata["prefetch"] = {**metadata.get("prefetch", {}), **prefetch}
             msg.metadata = metadata
@@ -274,10 +290,8 @@ class AssistantAgent(ReActAgent):
         Returns:
             AssistantAgent实例
         """
-        from src.config.settings import settings
-
         cfg = settings.deepseek_config
-        model = OpenAIChatModel(
+        model = DeadlineChatModel(
             model_name=cfg["model_name"],
             api_key=cfg["api_key"],
             stream=cfg.get("stream", True),
@@ -285,10 +299,11 @@ class AssistantAgent(ReActAgent):
                 "base_url": cfg["base_url"],
                 "timeout": cfg["timeout"]
             },
+            timeout=cfg["timeout"],
         )
         formatter = OpenAIChatFormatter()
 
-        return cls(
+        agent = cls(
             name="AssistantAgent",
             sys_prompt=prompt_registry.get("agents/assistant/base.md", fallback=ASSISTANT_AGENT_PROMPT),
             model=model,
@@ -299,6 +314,9 @@ class AssistantAgent(ReActAgent):
             memory=InMemoryMemory(),
             max_iters=6,  # 最多6轮对话
         )
+        if settings.agent_pool_size > 0:
+            agent.pool = AgentPool(agent, max_size=settings.agent_pool_size)
+        return agent
 
     async def analyze_sentiment(self, msg: Msg) -> dict[str, Any]:
         """
@@ -310,17 +328,15 @@ class AssistantAgent(ReActAgent):
         Returns:
             情感分析结果
         """
-        content = msg.content or ""
-        negative_keywords = ["烂", "差", "垃圾", "投诉", "退款", "不满意", "太差", "欺骗", "生气", "愤怒"]
-        positive_keywords = ["谢谢", "很好", "满意", "赞", "表扬", "不错"]
-        if any(kw in content for kw in negative_keywords):
+        hits = routing_keywords.scan(msg.content)
+        if hits.has("negative"):
             return {
                 "sentiment": "negative",
                 "intensity": "angry",
                 "score": 0.2,
                 "risk_level": "high",
             }
-        if any(kw in content for kw in positive_keywords):
+        if hits.has("positive"):
             return {
                 "sentiment": "positive",
                 "intensity": "calm",
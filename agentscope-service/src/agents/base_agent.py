@@ -8,6 +8,21 @@ from agentscope.memory import InMemoryMemory
 from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
+from src.tools.deadline import budget, check_deadline
+
+
+class DeadlineChatModel(OpenAIChatModel):
+    """OpenAIChatModel whose per-call timeout shrinks to the remaining request deadline."""
+
+    def __init__(self, *args: Any, timeout: float = 30.0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.timeout = timeout
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        check_deadline("llm")
+        kwargs.setdefault("timeout", budget(self.timeout))
+        return await super().__call__(*args, **kwargs)
+
 
 class BaseReActAgent(ReActAgent):
     """Shared base so subclasses can quickly bind prompts and toolkit."""
@@ -18,14 +33,15 @@ class BaseReActAgent(ReActAgent):
         toolkit: Toolkit,
         sys_prompt: str,
         max_iters: int = 6,
-    ) -> "BaseReActAgent":
+    ) -> BaseReActAgent:
         from src.config.settings import settings
         cfg = settings.deepseek_config
-        model = OpenAIChatModel(
+        model = DeadlineChatModel(
             model_name=cfg["model_name"],
             api_key=cfg["api_key"],
             stream=cfg.get("stream", True),
             client_kwargs={"base_url": cfg["base_url"], "timeout": cfg["timeout"]},
+            timeout=cfg["timeout"],
         )
         formatter = OpenAIChatFormatter()
         return cls(
@@ -24,9 +24,15 @@ from agentscope.message import Msg
 from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
-from src.tools.mcp_tools import BackendMCPClient
+from src.agents.agent_pool import AgentPool
+from src.agents.base_agent import DeadlineChatModel
+from src.agents.prefetch import PrefetchEngine, PrefetchSource
+from src.agents.streaming import publish_delta
+from src.config.settings import settings
+from src.heuristics import routing_keywords
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
 from src.tools.persistence import PersistenceClient
-from src.memory.persistent_memory import PersistentMemory
+from src.memory.persistent_memory import PersistentMemory, flush_agent_memory
 from src.prompts.loader import prompt_registry
 from src.prompts.agent_prompt import build_agent_prompt
 
@@ -204,11 +210,24 @@ class EngineerAgent(ReActAgent):
         self.mcp_client = mcp_client
         self.persistence = persistence
         self._prompt_filename = "agents/engineer/base.md"
+        self.pool: AgentPool | None = None
+
+    async def print(self, msg: Msg, last: bool = True, speech: Any = None) -> None:
+        """推送流式增量到当前请求的客户端，再交给默认输出"""
+        await publish_delta(self.name, msg, last)
+        await super().print(msg, last, speech)
 
     async def __call__(self, msg: Msg) -> Msg:
+        if self.pool is not None:
+            # Run on the conversation's own context instead of mutating this shared instance
+            conversation_id = msg.metadata.get("conversationId") if msg.metadata else None
+            async with self.pool.checkout(conversation_id) as agent:
+                response = await agent(msg)
+            await self._broadcast_to_subscribers(response)
+            return response
         base_prompt = prompt_registry.get(self._prompt_filename, fallback=ENGINEER_AGENT_PROMPT)
         if self.persistence:
-            memory = PersistentMemory(
+            memory = PersistentMemory.from_settings(
                 self.persistence,
                 msg.metadata.get("conversationId") if msg.metadata else None,
                 self.name,
@@ -218,7 +237,7 @@ class EngineerAgent(ReActAgent):
         if os.getenv("AGENTSCOPE_PREFETCH_ENABLED", "false").lower() == "true":
             await self._prefetch_context(msg)
         combined_prompt = build_agent_prompt(base_prompt, "engineer", msg.metadata or {})
-        self.sys_prompt = self._inject_prefetch_context(combined_prompt, msg.metadata or {})
+        self._sys_prompt = self._inject_prefetch_context(combined_prompt, msg.metadata or {})
         start = time.time()
         try:
             response = await super().__call__(msg)
@@ -249,35 +268,25 @@ class EngineerAgent(ReActAgent):
                     metadata=msg.metadata or {},
                 )
             raise
+        finally:
+            # Also after a failed or cancelled call, so the user's turn is not lost
+            await flush_agent_memory(self.memory)
 
     async def _prefetch_context(self, msg: Msg) -> None:
         metadata = msg.metadata or {}
-        prefetch: dict[str, Any] = {}
-        try:
-            prefetch["system_status"] = await self.mcp_client.call_tool(
-                "getSystemStatus",
-                includeStats=False,
-            )
-        except Exception:
-            pass
-        try:
-            prefetch["knowledge"] = await self.mcp_client.call_tool(
-                "searchKnowledge",
-                query=msg.content,
-                mode="semantic",
-                filters={"limit": 5},
-            )
-        except Exception:
-            pass
-        try:
-            prefetch["similar_tickets"] = await self.mcp_client.call_tool(
-                "searchTickets",
-                query=msg.content,
-                limit=5,
-                offset=0,
-            )
-        except Exception:
-            pass
+        prefetch = await PrefetchEngine(self.mcp_client, self.name).fetch([
+            PrefetchSource("system_status", ToolCall("getSystemStatus", {"includeStats": False})),
+            PrefetchSource("knowledge", ToolCall("searchKnowledge", {
+                "query": msg.content,
+                "mode": "semantic",
+                "filters": {"limit": 5},
+            })),
+            PrefetchSource("similar_tickets", ToolCall("searchTickets", {
+                "query": msg.content,
+                "limit": 5,
+                "offset": 0,
+            })),
+        ])
         if prefetch:
             metadata["prefetch"] = {**metadata.get("prefetch", {}), **prefetch}
             msg.metadata = metadata
@@ -313,10 +322,8 @@ class EngineerAgent(ReActAgent):
         Returns:
             EngineerAgent实例
         """
-        from src.config.settings import settings
-
         cfg = settings.deepseek_config
-        model = OpenAIChatModel(
+        model = DeadlineChatModel(
             model_name=cfg["model_name"],
             api_key=cfg["api_key"],
             stream=cfg.get("stream", True),
@@ -324,10 +331,11 @@ class EngineerAgent(ReActAgent):
                 "base_url": cfg["base_url"],
                 "timeout": cfg["timeout"]
             },
+            timeout=cfg["timeout"],
         )
         formatter = OpenAIChatFormatter()
 
-        return cls(
+        agent = cls(
             name="EngineerAgent",
             sys_prompt=prompt_registry.get("agents/engineer/base.md", fallback=ENGINEER_AGENT_PROMPT),
             model=model,
@@ -338,6 +346,9 @@ class EngineerAgent(ReActAgent):
             memory=InMemoryMemory(),
             max_iters=10,  # 故障诊断可能需要更多轮推理
         )
+        if settings.agent_pool_size > 0:
+            agent.pool = AgentPool(agent, max_size=settings.agent_pool_size)
+        return agent
 
     async def search_knowledge(
         self,
@@ -430,20 +441,13 @@ class EngineerAgent(ReActAgent):
         Returns:
             严重性等级（P0-P4）
         """
-        # P0关键词
-        p0_keywords = ["宕机", "崩溃", "所有用户", "完全不可用", "无法访问"]
-        # P1关键词
-        p1_keywords = ["核心功能", "无法", "失败", "500", "错误"]
-        # P2关键词
-        p2_keywords = ["异常", "问题", "不正常"]
-
-        desc_lower = fault_description.lower()
+        hits = routing_keywords.scan(fault_description)
 
-        if any(kw in desc_lower for kw in p0_keywords):
+        if hits.has("severity_p0"):
             return "P0"
-        if any(kw in desc_lower for kw in p1_keywords):
+        if hits.has("severity_p1"):
             return "P1"
-        if any(kw in desc_lower for kw in p2_keywords):
+        if hits.has("severity_p2"):
             return "P2"
 
         return "P3"
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+import uuid
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+HANDOFFS_OPEN = Gauge(
+    "agentscope_handoffs_open",
+    "Human handoffs waiting for input, by kind (blocking/async)",
+    ["kind"],
+)
+HANDOFF_INPUTS_BUFFERED = Gauge(
+    "agentscope_handoff_inputs_buffered",
+    "Human inputs received while no handoff was waiting for them",
+)
+HANDOFF_EVENTS = Counter(
+    "agentscope_handoff_events_total",
+    "Handoff queue events (delivered/resumed/buffered/dropped/timeout/expired/rejected)",
+    ["event"],
+)
+HANDOFF_WAIT = Histogram(
+    "agentscope_handoff_wait_seconds",
+    "Time from opening a handoff until human input arrived",
+    ["kind"],
+)
+
+# Called with (handoff_id, input) once input arrives, or (handoff_id, None) when the handoff expires
+ResumeCallback = Callable[[str, "dict[str, Any] | None"], Awaitable[None]]
+
+
+class HandoffCapacityError(RuntimeError):
+    """Raised when opening a handoff would exceed ``max_open``."""
+
+
+@dataclass
+class _Input:
+    item: dict[str, Any]
+    received_at: float
+    seq: int
+
+
+@dataclass
+class _Pending:
+    handoff_id: str
+    conversation_id: str
+    resume: ResumeCallback
+    opened_at: float
+    timer: asyncio.TimerHandle | None = None
+
+
+@dataclass
+class _Mailbox:
+    inputs: deque[_Input] = field(default_factory=deque)
+    waiters: deque[tuple[asyncio.Future[dict[str, Any]], float]] = field(default_factory=deque)
+    pending: OrderedDict[str, _Pending] = field(default_factory=OrderedDict)
+
+    def empty(self) -> bool:
+        return not (self.inputs or self.waiters or self.pending)
+
+
+class HandoffQueue:
+    """
+    Per-conversation mailboxes between waiting agents and human agents.
+
+    Human input goes to the oldest blocking waiter of the conversation, then
+    to the oldest async (pending) handoff, and is buffered otherwise, so input
+    that arrives before anyone waits is not lost. Each input is consumed
+    once. Buffers keep at most ``buffer_size`` inputs per conversation for
+    ``buffer_ttl`` seconds and ``max_buffered`` inputs in total; expired and
+    the oldest inputs are dropped when new ones arrive. At most ``max_open``
+    handoffs are open at a time.
+    """
+
+    def __init__(
+        self,
+        max_open: int = 1000,
+        buffer_size: int = 16,
+        buffer_ttl: float = 300.0,
+        max_buffered: int = 1000,
+    ) -> None:
+        self.max_open = max_open
+        self.buffer_size = max(1, buffer_size)
+        self.buffer_ttl = buffer_ttl
+        self.max_buffered = max_buffered
+        self._boxes: dict[str, _Mailbox] = {}
+        self._pending_index: dict[str, str] = {}
+        self._open = {"blocking": 0, "async": 0}
+        self._buffered = 0
+        # Conversation of every buffered input by arrival; the head is the oldest input overall
+        self._arrivals: OrderedDict[int, str] = OrderedDict()
+        self._input_seq = itertools.count()
+        self._tasks: set[asyncio.Future[None]] = set()
+
+    @property
+    def open_count(self) -> int:
+        return sum(self._open.values())
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "open": dict(self._open),
+            "max_open": self.max_open,
+            "buffered_inputs": self._buffered,
+            "conversations": len(self._boxes),
+        }
+
+    def deliver(self, conversation_id: str, item: dict[str, Any]) -> str:
+        """Hand ``item`` to whoever waits on the conversation; returns delivered/resumed/buffered."""
+        box = self._boxes.setdefault(conversation_id, _Mailbox())
+        while box.waiters:
+            future, _ = box.waiters.popleft()
+            if not future.done():
+                future.set_result(item)
+                HANDOFF_EVENTS.labels("delivered").inc()
+                return "delivered"
+        if box.pending:
+            _, pending = box.pending.popitem(last=False)
+            self._close_pending(pending)
+            self._start_resume(pending, item)
+            HANDOFF_EVENTS.labels("resumed").inc()
+            return "resumed"
+        if len(box.inputs) >= self.buffer_size:
+            self._pop_input(box)
+            HANDOFF_EVENTS.labels("dropped").inc()
+        self._evict_buffered()
+        entry = _Input(item, time.monotonic(), next(self._input_seq))
+        # Eviction may have pruned the (empty) mailbox, so look it up again
+        self._boxes.setdefault(conversation_id, _Mailbox()).inputs.append(entry)
+        self._arrivals[entry.seq] = conversation_id
+        self._count_buffered(1)
+        HANDOFF_EVENTS.labels("buffered").inc()
+        return "buffered"
+
+    async def wait(self, conversation_id: str, timeout: float) -> dict[str, Any] | None:
+        """Next human input for the conversation, or None after ``timeout`` seconds."""
+        buffered = self._take_buffered(conversation_id)
+        if buffered is not None:
+            HANDOFF_WAIT.labels("blocking").observe(0.0)
+            return buffered
+        self._reserve("blocking")
+        box = self._boxes.setdefault(conversation_id, _Mailbox())
+        future: asyncio.Future[dict[str, Any]] = asyncio.get_running_loop().create_future()
+        entry = (future, time.monotonic())
+        box.waiters.append(entry)
+        try:
+            item = await asyncio.wait_for(future, timeout)
+        except TimeoutError:
+            HANDOFF_EVENTS.labels("timeout").inc()
+            return None
+        finally:
+            if entry in box.waiters:
+                box.waiters.remove(entry)
+            self._release("blocking")
+            self._prune(conversation_id)
+        HANDOFF_WAIT.labels("blocking").observe(time.monotonic() - entry[1])
+        return item
+
+    def open_pending(
+        self, conversation_id: str, resume: ResumeCallback, ttl: float | None = None
+    ) -> str:
+        """
+        Register an async handoff and return its id without waiting.
+
+        ``resume`` runs in its own task when input arrives (immediately if
+        some is already buffered), or with ``None`` after ``ttl`` seconds.
+        """
+        handoff_id = uuid.uuid4().hex
+        pending = _Pending(handoff_id, conversation_id, resume, time.monotonic())
+        buffered = self._take_buffered(conversation_id)
+        if buffered is not None:
+            self._start_resume(pending, buffered)
+            HANDOFF_EVENTS.labels("resumed").inc()
+            return handoff_id
+        self._reserve("async")
+        if ttl is not None and ttl > 0:
+            pending.timer = asyncio.get_running_loop().call_later(ttl, self._expire, handoff_id)
+        self._boxes.setdefault(conversation_id, _Mailbox()).pending[handoff_id] = pending
+        self._pending_index[handoff_id] = conversation_id
+        return handoff_id
+
+    def cancel_pending(self, handoff_id: str) -> bool:
+        pending = self._pop_pending(handoff_id)
+        if pending is None:
+            return False
+        self._close_pending(pending)
+        return True
+
+    async def close(self) -> None:
+        """Drop waiters and pending handoffs and let running resume callbacks finish."""
+        for box in self._boxes.values():
+            for future, _ in box.waiters:
+                future.cancel()
+            for pending in box.pending.values():
+                if pending.timer is not None:
+                    pending.timer.cancel()
+                self._release("async")
+        self._boxes.clear()
+        self._pending_index.clear()
+        self._arrivals.clear()
+        self._count_buffered(-self._buffered)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _take_buffered(self, conversation_id: str) -> dict[str, Any] | None:
+        box = self._boxes.get(conversation_id)
+        if box is None:
+            return None
+        cutoff = time.monotonic() - self.buffer_ttl
+        item: dict[str, Any] | None = None
+        while box.inputs and item is None:
+            entry = self._pop_input(box)
+            if entry.received_at < cutoff:
+                HANDOFF_EVENTS.labels("expired").inc()
+            else:
+                item = entry.item
+        self._prune(conversation_id)
+        return item
+
+    def _evict_buffered(self) -> None:
+        """Drop expired buffered inputs, then the oldest ones while at ``max_buffered``."""
+        cutoff = time.monotonic() - self.buffer_ttl
+        while self._arrivals:
+            conversation_id = next(iter(self._arrivals.values()))
+            box = self._boxes[conversation_id]
+            if box.inputs[0].received_at < cutoff:
+                event = "expired"
+            elif self.max_buffered > 0 and self._buffered >= self.max_buffered:
+                event = "dropped"
+            else:
+                return
+            self._pop_input(box)
+            HANDOFF_EVENTS.labels(event).inc()
+            self._prune(conversation_id)
+
+    def _pop_input(self, box: _Mailbox) -> _Input:
+        entry = box.inputs.popleft()
+        del self._arrivals[entry.seq]
+        self._count_buffered(-1)
+        return entry
+
+    def _expire(self, handoff_id: str) -> None:
+        pending = self._pop_pending(handoff_id)
+        if pending is None:
+            return
+        self._close_pending(pending)
+        HANDOFF_EVENTS.labels("expired").inc()
+        self._start_resume(pending, None)
+
+    def _pop_pending(self, handoff_id: str) -> _Pending | None:
+        conversation_id = self._pending_index.get(handoff_id)
+        box = self._boxes.get(conversation_id) if conversation_id is not None else None
+        if box is None:
+            return None
+        return box.pending.pop(handoff_id, None)
+
+    def _close_pending(self, pending: _Pending) -> None:
+        self._pending_index.pop(pending.handoff_id, None)
+        if pending.timer is not None:
+            pending.timer.cancel()
+        self._release("async")
+        self._prune(pending.conversation_id)
+
+    def _start_resume(self, pending: _Pending, item: dict[str, Any] | None) -> None:
+        if item is not None:
+            HANDOFF_WAIT.labels("async").observe(time.monotonic() - pending.opened_at)
+        task = asyncio.ensure_future(pending.resume(pending.handoff_id, item))
+        self._tasks.add(task)
+        task.add_done_callback(self._resume_done)
+
+    def _resume_done(self, task: asyncio.Future[None]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[AgentScope] handoff resume failed: {task.exception()}")
+
+    def _reserve(self, kind: str) -> None:
+        if self.max_open > 0 and self.open_count >= self.max_open:
+            HANDOFF_EVENTS.labels("rejected").inc()
+            raise HandoffCapacityError(f"{self.open_count} human handoffs already open")
+        self._open[kind] += 1
+        HANDOFFS_OPEN.labels(kind).set(self._open[kind])
+
+    def _release(self, kind: str) -> None:
+        self._open[kind] -= 1
+        HANDOFFS_OPEN.labels(kind).set(self._open[kind])
+
+    def _count_buffered(self, delta: int) -> None:
+        self._buffered += delta
+        HANDOFF_INPUTS_BUFFERED.set(self._buffered)
+
+    def _prune(self, conversation_id: str) -> None:
+        box = self._boxes.get(conversation_id)
+        if box is not None and box.empty():
+            del self._boxes[conversation_id]
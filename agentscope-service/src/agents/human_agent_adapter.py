@@ -1,20 +1,23 @@
 from __future__ import annotations
 
-import asyncio
 from typing import Any
 
 from agentscope.agent import AgentBase
 from agentscope.message import Msg
 
+from src.agents.handoff import HandoffCapacityError, HandoffQueue, ResumeCallback
+from src.config.settings import settings
+from src.tools.deadline import budget
+
 
 class HumanAgentAdapter(AgentBase):
     """Adapter that waits for human input coming through WebSockets."""
 
-    def __init__(self, name: str, ws_manager: Any) -> None:
+    def __init__(self, name: str, ws_manager: Any, handoffs: HandoffQueue | None = None) -> None:
         super().__init__()
         self._name = name
         self.ws_manager = ws_manager
-        self.pending_responses: dict[str, asyncio.Future] = {}
+        self.handoffs = handoffs if handoffs is not None else HandoffQueue()
 
     @property
     def name(self) -> str:
@@ -29,7 +32,7 @@ class HumanAgentAdapter(AgentBase):
             "metadata": x.metadata or {},
         })
 
-        human_response = await self._wait_for_human_input(conversation_id)
+        human_response = await self._wait_for_human_input(conversation_id, settings.human_handoff_timeout)
 
         return Msg(
             name=self._name,
@@ -38,17 +41,34 @@ class HumanAgentAdapter(AgentBase):
             metadata=human_response.get("metadata", {}),
         )
 
-    async def _wait_for_human_input(self, conversation_id: str, timeout: int = 300) -> dict[str, Any]:
-        future = asyncio.get_running_loop().create_future()
-        self.pending_responses[conversation_id] = future
+    async def request_async(self, x: Msg, resume: ResumeCallback, ttl: float | None = None) -> str:
+        """
+        Notify frontend like ``reply`` but return a handoff id right away.
+
+        ``resume`` is called with the human input once it arrives, or with
+        ``None`` after ``ttl`` seconds; raises ``HandoffCapacityError`` when
+        too many handoffs are open.
+        """
+        conversation_id = str((x.metadata or {}).get("conversationId", "default"))
+        # Register first so input sent right after the notification cannot miss the handoff
+        handoff_id = self.handoffs.open_pending(conversation_id, resume, ttl)
+        await self.ws_manager.send_to_client(conversation_id, {
+            "type": "human_input_required",
+            "message": x.content,
+            "metadata": x.metadata or {},
+            "handoffId": handoff_id,
+        })
+        return handoff_id
+
+    async def _wait_for_human_input(self, conversation_id: str, timeout: float = 300) -> dict[str, Any]:
         try:
-            return await asyncio.wait_for(future, timeout)
-        except asyncio.TimeoutError:
+            # The caller's deadline caps how long a human can take
+            item = await self.handoffs.wait(conversation_id, budget(timeout))
+        except HandoffCapacityError:
+            return {"content": "[繁忙] 正在分配其他客服", "metadata": {}}
+        if item is None:
             return {"content": "[超时] 正在分配其他客服", "metadata": {}}
-        finally:
-            self.pending_responses.pop(conversation_id, None)
+        return item
 
     def receive_human_input(self, conversation_id: str, content: str, metadata: dict[str, Any]) -> None:
-        future = self.pending_responses.get(conversation_id)
-        if future and not future.done():
-            future.set_result({"content": content, "metadata": metadata})
+        self.handoffs.deliver(conversation_id, {"content": content, "metadata": metadata})
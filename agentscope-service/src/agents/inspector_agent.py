@@ -24,11 +24,15 @@ from agentscope.message import Msg
 from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
-from src.tools.mcp_tools import BackendMCPClient
+from src.agents.agent_pool import AgentPool
+from src.agents.base_agent import DeadlineChatModel
+from src.agents.prefetch import PrefetchEngine, PrefetchSource
+from src.config.settings import settings
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
 from src.tools.persistence import PersistenceClient
-from src.memory.persistent_memory import PersistentMemory
+from src.memory.persistent_memory import PersistentMemory, flush_agent_memory
 from src.prompts.loader import prompt_registry
-from src.prompts.agent_prompt import build_agent_prompt, load_agent_stage_config
+from src.prompts.agent_prompt import build_agent_prompt, load_stage_config
 
 
 # InspectorAgent的系统Prompt
@@ -177,11 +181,19 @@ class InspectorAgent(ReActAgent):
         self.mcp_client = mcp_client
         self.persistence = persistence
         self._prompt_filename = "agents/inspector/base.md"
+        self.pool: AgentPool | None = None
 
     async def __call__(self, msg: Msg) -> Msg:
+        if self.pool is not None:
+            # Run on the conversation's own context instead of mutating this shared instance
+            conversation_id = msg.metadata.get("conversationId") if msg.metadata else None
+            async with self.pool.checkout(conversation_id) as agent:
+                response = await agent(msg)
+            await self._broadcast_to_subscribers(response)
+            return response
         base_prompt = prompt_registry.get(self._prompt_filename, fallback=INSPECTOR_AGENT_PROMPT)
         if self.persistence:
-            memory = PersistentMemory(
+            memory = PersistentMemory.from_settings(
                 self.persistence,
                 msg.metadata.get("conversationId") if msg.metadata else None,
                 self.name,
@@ -191,7 +203,7 @@ class InspectorAgent(ReActAgent):
         if os.getenv("AGENTSCOPE_PREFETCH_ENABLED", "false").lower() == "true":
             await self._prefetch_context(msg)
         combined_prompt = build_agent_prompt(base_prompt, "inspector", msg.metadata or {})
-        self.sys_prompt = self._inject_prefetch_context(combined_prompt, msg.metadata or {})
+        self._sys_prompt = self._inject_prefetch_context(combined_prompt, msg.metadata or {})
         start = time.time()
         try:
             response = await super().__call__(msg)
@@ -222,21 +234,34 @@ class InspectorAgent(ReActAgent):
                     metadata=msg.metadata or {},
                 )
             raise
+        finally:
+            # Also after a failed or cancelled call, so the user's turn is not lost
+            await flush_agent_memory(self.memory)
 
     async def _prefetch_context(self, msg: Msg) -> None:
         metadata = msg.metadata or {}
-        prefetch: dict[str, Any] = {}
         conversation_id = metadata.get("conversationId") or msg.id
-        try:
-            prefetch["conversation_history"] = await self.get_conversation_history(conversation_id)
-        except Exception:
-            pass
+        sources = [
+            PrefetchSource(
+                "conversation_history",
+                ToolCall("getConversationHistory", {
+                    "conversationId": conversation_id,
+                    "includeMetadata": True,
+                }),
+                on_error=lambda error: [{"role": "system", "content": f"获取对话历史失败: {error}"}],
+            ),
+        ]
         customer_id = metadata.get("customerId")
         if customer_id:
-            try:
-                prefetch["customer_history"] = await self.get_customer_history(customer_id)
-            except Exception:
-                pass
+            sources.append(PrefetchSource(
+                "customer_history",
+                ToolCall("getCustomerHistory", {"customerId": customer_id, "limit": 10}),
+            ))
+        fetched = await PrefetchEngine(self.mcp_client, self.name).fetch(sources)
+        prefetch = {
+            key: value if isinstance(value, list) else []
+            for key, value in fetched.items()
+        }
         if prefetch:
             metadata["prefetch"] = {**metadata.get("prefetch", {}), **prefetch}
             msg.metadata = metadata
@@ -272,10 +297,8 @@ class InspectorAgent(ReActAgent):
         Returns:
             InspectorAgent实例
         """
-        from src.config.settings import settings
-
         cfg = settings.deepseek_config
-        model = OpenAIChatModel(
+        model = DeadlineChatModel(
             model_name=cfg["model_name"],
             api_key=cfg["api_key"],
             stream=cfg.get("stream", True),
@@ -283,10 +306,11 @@ class InspectorAgent(ReActAgent):
                 "base_url": cfg["base_url"],
                 "timeout": cfg["timeout"]
             },
+            timeout=cfg["timeout"],
         )
         formatter = OpenAIChatFormatter()
 
-        return cls(
+        agent = cls(
             name="InspectorAgent",
             sys_prompt=prompt_registry.get("agents/inspector/base.md", fallback=INSPECTOR_AGENT_PROMPT),
             model=model,
@@ -297,6 +321,9 @@ class InspectorAgent(ReActAgent):
             memory=InMemoryMemory(),
             max_iters=8,
         )
+        if settings.agent_pool_size > 0:
+            agent.pool = AgentPool(agent, max_size=settings.agent_pool_size)
+        return agent
 
     async def get_conversation_history(
         self,
@@ -472,7 +499,11 @@ class InspectorAgent(ReActAgent):
         )
 
         # 3. Agent执行质检（调用父类reply方法，LLM会生成结构化报告）
-        result = await self.reply(inspect_msg)
+        if self.pool is not None:
+            async with self.pool.checkout(conversation_id) as agent:
+                result = await agent.reply(inspect_msg)
+        else:
+            result = await self.reply(inspect_msg)
 
         # 4. 解析结果（假设LLM返回JSON格式）
         try:
@@ -521,11 +552,7 @@ class InspectorAgent(ReActAgent):
         return report
 
     def _load_quality_stages(self) -> list[str]:
-        data = load_agent_stage_config()
-        stages = data.get("inspector", {}).get("quality") if isinstance(data, dict) else None
-        if isinstance(stages, list) and stages:
-            return [str(s) for s in stages]
-        return ["quality_report", "follow_up", "report_summary"]
+        return list(load_stage_config().inspector_quality)
 
     async def generate_report(self, inspection_data: dict[str, Any]) -> dict[str, Any]:
         """
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Histogram
+
+from src.config.settings import settings
+from src.tools.deadline import budget
+from src.tools.mcp_tools import BackendMCPClient, ToolCall, ToolResult
+
+PREFETCH_SOURCE_LATENCY = Histogram(
+    "agentscope_prefetch_source_duration_seconds",
+    "Latency of each prefetch source (status: ok/error/timeout)",
+    ["agent", "source", "status"],
+)
+
+
+@dataclass
+class PrefetchSource:
+    """
+    One independent lookup; set either ``call`` (an MCP tool) or ``fetch``.
+
+    ``on_error`` maps the reason a lookup failed or timed out to the value
+    reported in its place.
+    """
+
+    key: str
+    call: ToolCall | None = None
+    fetch: Callable[[], Awaitable[Any]] | None = None
+    deadline: float | None = None
+    on_error: Callable[[str], Any] | None = None
+
+
+class PrefetchEngine:
+    """
+    Run an agent's prefetch lookups concurrently, each under its own deadline.
+
+    Tool sources share one ``call_tools_batch`` request when the backend
+    supports batching and otherwise run as separate concurrent calls.
+    A source that fails or misses its deadline is left out of the result
+    unless it has ``on_error``; in-flight requests nobody waits for any more
+    are cancelled.
+    """
+
+    def __init__(self, client: BackendMCPClient, agent_name: str) -> None:
+        self._client = client
+        self._agent_name = agent_name
+
+    def deadline_for(self, source: PrefetchSource) -> float:
+        if source.deadline is not None:
+            return source.deadline
+        return settings.prefetch_deadlines.get(source.key, settings.prefetch_deadline)
+
+    async def fetch(self, sources: Sequence[PrefetchSource]) -> dict[str, Any]:
+        """Return the values of the sources that succeeded in time, keyed by source key."""
+        tool_sources = [s for s in sources if s.call is not None]
+        batch: asyncio.Future[list[ToolResult]] | None = None
+        if tool_sources and self._client.supports_batch:
+            batch = asyncio.ensure_future(
+                self._client.call_tools_batch([s.call for s in tool_sources if s.call])
+            )
+        positions = {id(source): index for index, source in enumerate(tool_sources)}
+        tasks = [
+            asyncio.ensure_future(self._run(source, self._start(source, positions, batch)))
+            for source in sources
+        ]
+        try:
+            outcomes = await asyncio.gather(*tasks)
+        finally:
+            if batch is not None and not batch.done():
+                batch.cancel()
+        return {source.key: value for source, (ok, value) in zip(sources, outcomes) if ok}
+
+    def _start(
+        self,
+        source: PrefetchSource,
+        positions: dict[int, int],
+        batch: asyncio.Future[list[ToolResult]] | None,
+    ) -> Awaitable[Any]:
+        if source.call is None:
+            assert source.fetch is not None
+            return source.fetch()
+        if batch is None:
+            return self._client.call_tool(source.call.name, **source.call.arguments)
+        return self._from_batch(batch, positions[id(source)])
+
+    @staticmethod
+    async def _from_batch(batch: asyncio.Future[list[ToolResult]], index: int) -> Any:
+        # Shield so one source timing out does not cancel the shared request
+        item = (await asyncio.shield(batch))[index]
+        if not item.ok:
+            raise RuntimeError(item.error)
+        return item.result
+
+    async def _run(self, source: PrefetchSource, request: Awaitable[Any]) -> tuple[bool, Any]:
+        start = time.perf_counter()
+        status = "ok"
+        value: Any = None
+        deadline = budget(self.deadline_for(source))
+        try:
+            value = await asyncio.wait_for(request, deadline)
+        except TimeoutError:
+            status = "timeout"
+            value = f"no response within {deadline:.2f}s"
+        except Exception as exc:
+            status = "error"
+            value = str(exc)
+        PREFETCH_SOURCE_LATENCY.labels(self._agent_name, source.key, status).observe(
+            time.perf_counter() - start
+        )
+        if status != "ok" and source.on_error is not None:
+            return True, source.on_error(value)
+        return status == "ok", value
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar
+from typing import Any
+
+from agentscope.message import Msg
+from prometheus_client import Counter, Histogram
+
+STREAM_DELTAS = Counter(
+    "agentscope_stream_deltas_total",
+    "Partial LLM output frames pushed to clients",
+    ["agent"],
+)
+STREAM_FIRST_TOKEN = Histogram(
+    "agentscope_stream_first_token_seconds",
+    "Time from the start of a streamed request to its first delta frame",
+    ["agent"],
+)
+
+DeltaSender = Callable[[dict[str, Any]], Awaitable[None]]
+
+_current_stream: ContextVar[TokenStream | HeldStream | None] = ContextVar(
+    "agentscope_token_stream", default=None
+)
+
+
+class TokenStream:
+    """
+    Turn the cumulative messages a streaming agent prints into ``delta`` frames.
+
+    ReActAgent re-prints the whole text accumulated so far for every chunk;
+    only the new suffix is sent, keyed by message id so parallel agents in
+    the same request do not interfere.
+    """
+
+    def __init__(self, conversation_id: str, send: DeltaSender) -> None:
+        self.conversation_id = conversation_id
+        self._send = send
+        self._sent: dict[str, int] = {}
+        self._started = time.perf_counter()
+        self._first_token = False
+
+    async def publish(self, agent_name: str, msg: Msg, last: bool) -> None:
+        await self.publish_text(agent_name, msg.id, msg.get_text_content() or "", last)
+
+    async def publish_text(self, agent_name: str, message_id: str, text: str, last: bool) -> None:
+        offset = self._sent.get(message_id, 0)
+        delta = text[offset:]
+        if not delta and not last:
+            return
+        self._sent[message_id] = len(text)
+        if delta and not self._first_token:
+            self._first_token = True
+            STREAM_FIRST_TOKEN.labels(agent_name).observe(time.perf_counter() - self._started)
+        STREAM_DELTAS.labels(agent_name).inc()
+        await self._send(
+            {
+                "type": "delta",
+                "conversationId": self.conversation_id,
+                "messageId": message_id,
+                "agent": agent_name,
+                "delta": delta,
+                "last": last,
+            }
+        )
+
+
+class HeldStream:
+    """
+    Hold back the output of a speculative run until it is kept or dropped.
+
+    Only the latest cumulative text per message is kept, so ``release``
+    sends one catch-up delta per message and then passes frames through;
+    ``discard`` drops everything and ignores later output.
+    """
+
+    def __init__(self, target: TokenStream | HeldStream, released: bool = False) -> None:
+        self._target = target
+        self._held: dict[str, tuple[str, str, bool]] = {}
+        self._released = released
+        self._discarded = False
+
+    async def publish(self, agent_name: str, msg: Msg, last: bool) -> None:
+        await self.publish_text(agent_name, msg.id, msg.get_text_content() or "", last)
+
+    async def publish_text(self, agent_name: str, message_id: str, text: str, last: bool) -> None:
+        if self._discarded:
+            return
+        if self._released:
+            await self._target.publish_text(agent_name, message_id, text, last)
+            return
+        self._held[message_id] = (agent_name, text, last)
+
+    async def release(self) -> None:
+        if self._discarded or self._released:
+            return
+        self._released = True
+        held, self._held = self._held, {}
+        for message_id, (agent_name, text, last) in held.items():
+            await self._target.publish_text(agent_name, message_id, text, last)
+
+    def discard(self) -> None:
+        self._discarded = True
+        self._held.clear()
+
+
+def hold_current_stream() -> HeldStream | None:
+    """A ``HeldStream`` in front of the active stream, if there is one."""
+    stream = _current_stream.get()
+    return HeldStream(stream) if stream is not None else None
+
+
+def detachable_stream() -> HeldStream | None:
+    """Pass-through to the active stream that ``discard`` cuts off once the request has answered."""
+    stream = _current_stream.get()
+    return HeldStream(stream, released=True) if stream is not None else None
+
+
+def with_stream(context: Context, stream: TokenStream | HeldStream | None) -> Context:
+    """Make ``stream`` (or no stream) the active one for tasks started in ``context``."""
+    context.run(_current_stream.set, stream)
+    return context
+
+
+@contextmanager
+def stream_to(stream: TokenStream | HeldStream) -> Iterator[TokenStream | HeldStream]:
+    """Route agent output printed inside this block (and its tasks) to ``stream``."""
+    token = _current_stream.set(stream)
+    try:
+        yield stream
+    finally:
+        _current_stream.reset(token)
+
+
+async def publish_delta(agent_name: str, msg: Msg, last: bool) -> None:
+    """Forward a printed chunk to the active stream, if any; never fails the reply."""
+    stream = _current_stream.get()
+    if stream is None:
+        return
+    try:
+        await stream.publish(agent_name, msg, last)
+    except Exception:
+        return
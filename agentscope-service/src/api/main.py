@@ -16,34 +16,23 @@ from prometheus_client import (
 from src.agents.assistant_agent import AssistantAgent
 from src.agents.engineer_agent import EngineerAgent
 from src.agents.inspector_agent import InspectorAgent
+from src.agents.handoff import HandoffQueue
 from src.agents.human_agent_adapter import HumanAgentAdapter
 from src.api.routes import agents as agents_router, chat as chat_router, events as events_router
 from src.api.state import agent_manager
+from src.api.websocket_manager import WebSocketManager
 from src.config.settings import settings
+from src.api.routes.events import register_bridge_handlers
 from src.events.bridge import AgentEventPublisher, NodeEventLedger
+from src.events.dispatcher import EventDispatcher
+from src.memory.persistent_memory import flush_pending_memories
+from src.prompts.watcher import PromptWatcher
 from src.router.orchestrator_agent import OrchestratorAgent
+from src.tools.audit_sink import AuditSink
 from src.tools.mcp_tools import setup_toolkit
 from src.tools.persistence import PersistenceClient
 
 
-class WebSocketManager:
-    """Minimal WebSocket manager placeholder used during early development."""
-
-    def __init__(self) -> None:
-        self.clients: dict[str, Any] = {}
-
-    def register_client(self, conversation_id: str, socket: Any) -> None:
-        self.clients[conversation_id] = socket
-
-    def unregister_client(self, conversation_id: str) -> None:
-        self.clients.pop(conversation_id, None)
-
-    async def send_to_client(self, conversation_id: str, payload: dict[str, Any]) -> None:
-        client = self.clients.get(conversation_id)
-        if client:
-            await client.send_json(payload)
-
-
 REQUEST_COUNT = Counter(
     "agentscope_http_requests_total",
     "Total HTTP requests received by AgentScope",
@@ -61,7 +50,28 @@ async def lifespan(app: FastAPI):
     settings.initialize_agentscope()
     toolkit_bundle = await setup_toolkit()
 
-    persistence = PersistenceClient(toolkit_bundle.backend_client)
+    prompt_watcher = None
+    if settings.prompt_watch:
+        prompt_watcher = PromptWatcher(
+            backend=settings.prompt_watch_backend,
+            poll_interval=settings.prompt_watch_poll_interval,
+        )
+        await prompt_watcher.start()
+
+    audit_sink = None
+    if settings.audit_async:
+        audit_sink = AuditSink(
+            toolkit_bundle.backend_client,
+            max_queue=settings.audit_queue_size,
+            batch_size=settings.audit_batch_size,
+            flush_interval=settings.audit_flush_interval,
+            max_retries=settings.audit_max_retries,
+            retry_backoff=settings.audit_retry_backoff,
+            overflow=settings.audit_overflow,
+            drain_timeout=settings.audit_drain_timeout,
+        )
+        audit_sink.start()
+    persistence = PersistenceClient(toolkit_bundle.backend_client, audit_sink=audit_sink)
 
     # 创建3个独立Agent
     assistant_agent = await AssistantAgent.create(
@@ -79,7 +89,16 @@ async def lifespan(app: FastAPI):
         toolkit_bundle.backend_client,
         persistence,
     )
-    human_agent = HumanAgentAdapter("HumanSupport", app.state.ws_manager)
+    human_agent = HumanAgentAdapter(
+        "HumanSupport",
+        app.state.ws_manager,
+        handoffs=HandoffQueue(
+            max_open=settings.human_handoff_max_open,
+            buffer_size=settings.human_handoff_buffer,
+            buffer_ttl=settings.human_handoff_timeout,
+            max_buffered=settings.human_handoff_max_buffered,
+        ),
+    )
 
     # 使用OrchestratorAgent替换AdaptiveRouter
     router = OrchestratorAgent(
@@ -97,19 +116,47 @@ async def lifespan(app: FastAPI):
     agent_manager["inspector_agent"] = inspector_agent
     agent_manager["human_agent"] = human_agent
     agent_manager["toolkit_bundle"] = toolkit_bundle
-    event_ledger = NodeEventLedger()
+    agent_manager["prompt_watcher"] = prompt_watcher
+    event_ledger = NodeEventLedger(
+        max_entries=settings.event_ledger_max_entries,
+        max_age_seconds=settings.event_ledger_max_age,
+    )
     event_publisher = AgentEventPublisher(
         base_url=settings.node_backend_url,
         path=settings.backend_event_bridge_path,
         timeout_seconds=settings.backend_event_bridge_timeout,
+        batch_path=settings.backend_event_bridge_batch_path or None,
+        max_queue=settings.backend_event_queue_size,
+        batch_size=settings.backend_event_batch_size,
+        flush_interval=settings.backend_event_flush_interval,
+        max_retries=settings.backend_event_max_retries,
+        retry_backoff=settings.backend_event_retry_backoff,
+        spool_path=settings.backend_event_spool_path or None,
     )
+    event_publisher.start()
     agent_manager["node_event_ledger"] = event_ledger
+    event_dispatcher = EventDispatcher(
+        workers=settings.event_dispatch_workers,
+        max_queue=settings.event_queue_size,
+        drain_timeout=settings.event_drain_timeout,
+    )
+    register_bridge_handlers(event_dispatcher, event_ledger, app.state.ws_manager)
+    event_dispatcher.start()
+    agent_manager["event_dispatcher"] = event_dispatcher
     agent_manager["event_publisher"] = event_publisher
 
     yield
 
     # Clean up agent resources if necessary
+    await flush_pending_memories()
+    if audit_sink is not None:
+        await audit_sink.close()
+    await event_dispatcher.close()
+    await human_agent.handoffs.close()
+    await app.state.ws_manager.close()
     await toolkit_bundle.backend_client.close()
+    if prompt_watcher is not None:
+        await prompt_watcher.stop()
     event_publisher = agent_manager.get("event_publisher")
     if event_publisher:
         await event_publisher.close()
@@ -121,7 +168,11 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
 )
-app.state.ws_manager = WebSocketManager()
+app.state.ws_manager = WebSocketManager(
+    queue_size=settings.ws_send_queue_size,
+    slow_consumer_policy=settings.ws_slow_consumer_policy,
+    send_timeout=settings.ws_send_timeout,
+)
 agent_manager["ws_manager"] = app.state.ws_manager
 
 @app.middleware("http")
@@ -153,10 +204,19 @@ app.include_router(events_router.router, prefix="/api/events", tags=["events"])
 
 @app.get("/health")
 async def health_check() -> dict[str, Any]:
+    prompt_watcher = agent_manager.get("prompt_watcher")
+    human_agent = agent_manager.get("human_agent")
+    event_dispatcher = agent_manager.get("event_dispatcher")
+    event_publisher = agent_manager.get("event_publisher")
     return {
         "status": "healthy",
         "agentscope_version": agentscope.__version__,
         "agents_ready": "router" in agent_manager,
+        "prompt_watcher": prompt_watcher.status() if prompt_watcher else None,
+        "handoffs": human_agent.handoffs.status() if human_agent else None,
+        "websockets": app.state.ws_manager.status(),
+        "event_dispatcher": event_dispatcher.status() if event_dispatcher else None,
+        "event_publisher": event_publisher.status() if event_publisher else None,
     }
 
 
@@ -1,10 +1,24 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import asyncio
+import json
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Header, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any
 
 from agentscope.message import Msg
 
+from src.agents.streaming import TokenStream, stream_to
 from src.api.state import agent_manager
+from src.config.settings import settings
+from src.tools.deadline import (
+    DEADLINE_EXCEEDED,
+    Deadline,
+    DeadlineExceeded,
+    deadline_scope,
+    parse_timeout,
+)
 
 router = APIRouter()
 
@@ -25,19 +39,8 @@ class ChatResponse(BaseModel):
     metadata: Dict[str, Any] = {}
 
 
-@router.post("/message", response_model=ChatResponse)
-async def handle_chat_message(request: ChatRequest) -> ChatResponse:
-    router = agent_manager.get("router")
-    if not router:
-        return ChatResponse(
-            success=False,
-            message="agent service warming up",
-            agent_name="system",
-            mode="error",
-            confidence=0.0,
-        )
-
-    msg = Msg(
+def _build_msg(request: ChatRequest) -> Msg:
+    return Msg(
         name="user",
         content=request.message,
         role="user",
@@ -49,24 +52,122 @@ async def handle_chat_message(request: ChatRequest) -> ChatResponse:
         },
     )
 
-    try:
-        response_msg = await router.route(msg)
-    except Exception as exc:  # pragma: no cover
-        return ChatResponse(
-            success=False,
-            message=str(exc),
-            agent_name="system",
-            mode="error",
-            confidence=0.0,
-        )
 
+def _to_response(response_msg: Msg) -> ChatResponse:
+    meta = response_msg.metadata or {}
+    confidence = meta.get("confidence", 1.0)
     return ChatResponse(
         success=True,
-        message=response_msg.content,
+        message=response_msg.get_text_content() or "",
         agent_name=response_msg.name,
-        metadata=response_msg.metadata or {},
-        mode=response_msg.metadata.get("mode", "agent_auto"),
-        confidence=response_msg.metadata.get("confidence", 1.0),
+        metadata=meta,
+        mode=str(meta.get("mode", "agent_auto")),
+        confidence=float(confidence) if isinstance(confidence, (int, float, str)) else 1.0,
+    )
+
+
+def _error_response(message: str) -> ChatResponse:
+    return ChatResponse(
+        success=False,
+        message=message,
+        agent_name="system",
+        mode="error",
+        confidence=0.0,
+    )
+
+
+def _request_deadline(timeout_header: str | None) -> Deadline | None:
+    seconds = parse_timeout(timeout_header, settings.request_timeout, settings.request_timeout_max)
+    return Deadline.after(seconds) if seconds is not None else None
+
+
+async def _route_within(router: Any, msg: Msg, deadline: Deadline | None) -> Msg:
+    """Route ``msg``; once ``deadline`` passes the whole orchestration is cancelled."""
+    with deadline_scope(deadline):
+        if deadline is None:
+            response: Msg = await router.route(msg)
+            return response
+        try:
+            response = await asyncio.wait_for(router.route(msg), deadline.remaining())
+            return response
+        except DeadlineExceeded:
+            raise
+        except TimeoutError:
+            if not deadline.expired:
+                raise
+            DEADLINE_EXCEEDED.labels("request").inc()
+            raise DeadlineExceeded("request") from None
+
+
+@router.post("/message", response_model=ChatResponse)
+async def handle_chat_message(
+    request: ChatRequest, x_request_timeout: str | None = Header(default=None)
+) -> ChatResponse:
+    router = agent_manager.get("router")
+    if not router:
+        return _error_response("agent service warming up")
+
+    msg = _build_msg(request)
+    deadline = _request_deadline(x_request_timeout)
+    ws_manager = agent_manager.get("ws_manager")
+
+    try:
+        if ws_manager and settings.stream_deltas:
+
+            async def send_delta(frame: dict[str, Any]) -> None:
+                await ws_manager.send_to_client(request.conversation_id, frame)
+
+            # Partial output goes to the conversation's WebSocket while the reply is generated
+            with stream_to(TokenStream(request.conversation_id, send_delta)):
+                response_msg = await _route_within(router, msg, deadline)
+        else:
+            response_msg = await _route_within(router, msg, deadline)
+    except Exception as exc:  # pragma: no cover
+        return _error_response(str(exc))
+
+    return _to_response(response_msg)
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/message/stream")
+async def stream_chat_message(
+    request: ChatRequest, x_request_timeout: str | None = Header(default=None)
+) -> StreamingResponse:
+    """Server-Sent-Events variant of /message: ``delta`` frames, then one ``done`` event."""
+    frames: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+    deadline = _request_deadline(x_request_timeout)
+
+    async def produce() -> ChatResponse:
+        router = agent_manager.get("router")
+        try:
+            if not router:
+                return _error_response("agent service warming up")
+            with stream_to(TokenStream(request.conversation_id, frames.put)):
+                return _to_response(await _route_within(router, _build_msg(request), deadline))
+        except Exception as exc:
+            return _error_response(str(exc))
+        finally:
+            await frames.put(None)
+
+    async def events() -> AsyncIterator[str]:
+        task = asyncio.ensure_future(produce())
+        try:
+            while (frame := await frames.get()) is not None:
+                yield _sse("delta", frame)
+            response = await task
+            yield _sse("done" if response.success else "error", response.model_dump())
+        finally:
+            # Client went away mid-stream: stop generating
+            if not task.done():
+                task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -97,9 +198,11 @@ async def websocket_endpoint(websocket: WebSocket, conversation_id: str) -> None
                     await cs_agent.interrupt()
 
     except WebSocketDisconnect:
-        ws_manager = agent_manager.get("ws_manager")
+        pass
+    finally:
+        # Also on bad frames or handler errors, so the writer never outlives the socket
         if ws_manager:
-            ws_manager.unregister_client(conversation_id)
+            ws_manager.unregister_client(conversation_id, websocket)
 
 
 @router.get("/status")
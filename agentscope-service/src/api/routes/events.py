@@ -1,11 +1,14 @@
 from datetime import datetime
 from typing import Any, Dict
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.api.state import agent_manager
+from src.config.settings import settings
 from src.events.bridge import NodeEventLedger
+from src.events.dispatcher import EventDispatcher
+from src.tools.tool_cache import tool_cache
 
 router = APIRouter()
 
@@ -21,24 +24,73 @@ class BridgeEventRequest(BaseModel):
     version: int = Field(1, alias="version")
 
     def to_dict(self) -> Dict[str, Any]:
-        return self.model_dump(by_alias=True)
+        # JSON mode so occurredAt survives WebSocket fan-out as a string
+        return self.model_dump(by_alias=True, mode="json")
+
+
+def register_bridge_handlers(
+    dispatcher: EventDispatcher, ledger: NodeEventLedger, ws_manager: Any
+) -> None:
+    """Queued fan-out targets of bridged events: ledger and conversation WebSockets."""
+
+    async def push_to_subscribers(event: dict[str, Any]) -> None:
+        aggregate_id = event.get("aggregateId")
+        if ws_manager and aggregate_id:
+            await ws_manager.send_to_client(aggregate_id, {"type": "domain_event", "event": event})
+
+    dispatcher.subscribe("ledger", ledger.record)
+    dispatcher.subscribe("websocket", push_to_subscribers)
+
+
+def _dispatcher() -> EventDispatcher:
+    dispatcher = agent_manager.get("event_dispatcher")
+    if not isinstance(dispatcher, EventDispatcher):
+        raise HTTPException(status_code=503, detail="event dispatcher not running")
+    return dispatcher
+
+
+async def _accept(dispatcher: EventDispatcher, payload: BridgeEventRequest) -> bool:
+    event = payload.to_dict()
+    # Cheap, and must be done before the ack so no stale profile/VIP result is served afterwards
+    tool_cache.invalidate_for_event(event)
+    # The EventBus never retries a bridged event: wait for room rather than drop it
+    return await dispatcher.put(event, settings.event_enqueue_timeout)
 
 
 @router.post("/bridge")
 async def bridge_event(payload: BridgeEventRequest) -> dict[str, str]:
-    event_data = payload.to_dict()
-    ledger = agent_manager.get("node_event_ledger")
-    if isinstance(ledger, NodeEventLedger):
-        ledger.record(event_data)
-
-    ws_manager = agent_manager.get("ws_manager")
-    if ws_manager and payload.aggregate_id:
-        await ws_manager.send_to_client(
-            payload.aggregate_id,
-            {
-                "type": "domain_event",
-                "event": event_data,
-            },
-        )
-
+    # Ledger and WebSocket fan-out happen after the EventBus is acknowledged
+    if not await _accept(_dispatcher(), payload):
+        raise HTTPException(status_code=503, detail="event queue full")
     return {"status": "accepted"}
+
+
+@router.post("/bridge/batch")
+async def bridge_events(payloads: list[BridgeEventRequest]) -> dict[str, Any]:
+    dispatcher = _dispatcher()
+    accepted = 0
+    for payload in payloads:
+        accepted += await _accept(dispatcher, payload)
+    return {
+        "status": "accepted" if accepted == len(payloads) else "partial",
+        "accepted": accepted,
+        "dropped": len(payloads) - accepted,
+    }
+
+
+@router.get("/recent")
+async def recent_events(
+    aggregate_id: str | None = Query(None, alias="aggregateId"),
+    event_type: str | None = Query(None, alias="type"),
+    after: int | None = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+) -> dict[str, Any]:
+    """Events retained by the ledger; pass ``nextCursor`` back as ``after`` to page forward."""
+    ledger = agent_manager.get("node_event_ledger")
+    if not isinstance(ledger, NodeEventLedger):
+        raise HTTPException(status_code=503, detail="event ledger not available")
+    events = ledger.recent(
+        aggregate_id=aggregate_id, event_type=event_type, after=after, limit=limit
+    )
+    next_cursor = events[-1]["seq"] if events else (after if after is not None else ledger.last_seq)
+    return {"events": events, "nextCursor": next_cursor}
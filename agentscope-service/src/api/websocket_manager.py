@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+WS_CONNECTIONS = Gauge(
+    "agentscope_ws_connections",
+    "Open WebSocket connections across all conversations",
+)
+WS_QUEUE_DEPTH = Gauge(
+    "agentscope_ws_send_queue_depth",
+    "Frames waiting in per-connection send queues, summed over connections",
+)
+WS_DROPPED_FRAMES = Counter(
+    "agentscope_ws_dropped_frames_total",
+    "Outbound frames dropped (queue_full: slow consumer, closed: connection gone)",
+    ["reason"],
+)
+WS_SLOW_DISCONNECTS = Counter(
+    "agentscope_ws_slow_consumer_disconnects_total",
+    "Connections closed because they could not keep up with their send queue",
+)
+
+SLOW_CONSUMER_POLICIES = ("disconnect", "drop_oldest", "drop_newest")
+# "Try again later": the client may reconnect and resync
+_SLOW_CONSUMER_CLOSE_CODE = 1013
+
+
+class _Connection:
+    def __init__(self, conversation_id: str, socket: Any, queue_size: int) -> None:
+        self.conversation_id = conversation_id
+        self.socket = socket
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=queue_size)
+        self.writer: asyncio.Task[None] | None = None
+        self.closed = False
+
+
+class WebSocketManager:
+    """
+    Fan-out of conversation events to every WebSocket subscribed to it.
+
+    Several consoles may watch one conversation. ``send_to_client`` only
+    enqueues; each connection has a bounded queue drained by its own writer
+    task, so a slow browser never blocks the agent that pushes to it. When a
+    queue is full the ``slow_consumer_policy`` decides: ``disconnect`` closes
+    the connection (dropping frames would corrupt delta streams),
+    ``drop_oldest``/``drop_newest`` discard a frame instead. A single send
+    that takes longer than ``send_timeout`` also closes the connection.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 256,
+        slow_consumer_policy: str = "disconnect",
+        send_timeout: float = 10.0,
+    ) -> None:
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(
+                f"slow_consumer_policy must be one of {', '.join(SLOW_CONSUMER_POLICIES)}"
+            )
+        self.queue_size = max(1, queue_size)
+        self.slow_consumer_policy = slow_consumer_policy
+        self.send_timeout = send_timeout
+        self._subscribers: dict[str, dict[int, _Connection]] = {}
+        self._queued = 0
+        self._closing: set[asyncio.Future[None]] = set()
+
+    @property
+    def connection_count(self) -> int:
+        return sum(len(connections) for connections in self._subscribers.values())
+
+    def subscribers(self, conversation_id: str) -> list[Any]:
+        return [conn.socket for conn in self._subscribers.get(conversation_id, {}).values()]
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "connections": self.connection_count,
+            "conversations": len(self._subscribers),
+            "queued_frames": self._queued,
+            "slow_consumer_policy": self.slow_consumer_policy,
+        }
+
+    def register_client(self, conversation_id: str, socket: Any) -> None:
+        connections = self._subscribers.setdefault(conversation_id, {})
+        if id(socket) in connections:
+            return
+        conn = _Connection(conversation_id, socket, self.queue_size)
+        conn.writer = asyncio.ensure_future(self._write(conn))
+        connections[id(socket)] = conn
+        WS_CONNECTIONS.set(self.connection_count)
+
+    def unregister_client(self, conversation_id: str, socket: Any | None = None) -> None:
+        """Remove ``socket`` from the conversation, or every subscriber when it is None."""
+        connections = self._subscribers.get(conversation_id, {})
+        targets = list(connections.values()) if socket is None else [connections.get(id(socket))]
+        for conn in targets:
+            if conn is not None:
+                self._drop(conn)
+
+    async def send_to_client(self, conversation_id: str, payload: dict[str, Any]) -> None:
+        for conn in list(self._subscribers.get(conversation_id, {}).values()):
+            self._enqueue(conn, payload)
+
+    async def close(self) -> None:
+        writers = [
+            conn.writer
+            for connections in self._subscribers.values()
+            for conn in connections.values()
+            if conn.writer is not None
+        ]
+        for conversation_id in list(self._subscribers):
+            self.unregister_client(conversation_id)
+        pending = [*writers, *self._closing]
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _enqueue(self, conn: _Connection, payload: dict[str, Any]) -> None:
+        if conn.queue.full():
+            if self.slow_consumer_policy == "drop_newest":
+                WS_DROPPED_FRAMES.labels("queue_full").inc()
+                return
+            if self.slow_consumer_policy == "drop_oldest":
+                conn.queue.get_nowait()
+                self._count_queued(-1)
+                WS_DROPPED_FRAMES.labels("queue_full").inc()
+            else:
+                WS_DROPPED_FRAMES.labels("queue_full").inc()
+                self._disconnect_slow(conn)
+                return
+        conn.queue.put_nowait(payload)
+        self._count_queued(1)
+
+    async def _write(self, conn: _Connection) -> None:
+        try:
+            while True:
+                frame = await conn.queue.get()
+                self._count_queued(-1)
+                await asyncio.wait_for(conn.socket.send_json(frame), self.send_timeout)
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            self._disconnect_slow(conn)
+        except Exception:
+            # Socket went away; the receive loop unregisters it as well
+            self._drop(conn)
+
+    def _disconnect_slow(self, conn: _Connection) -> None:
+        if conn.closed:
+            return
+        WS_SLOW_DISCONNECTS.inc()
+        self._drop(conn)
+
+        async def close_socket() -> None:
+            with contextlib.suppress(Exception):
+                await conn.socket.close(code=_SLOW_CONSUMER_CLOSE_CODE)
+
+        task = asyncio.ensure_future(close_socket())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _drop(self, conn: _Connection) -> None:
+        if conn.closed:
+            return
+        conn.closed = True
+        connections = self._subscribers.get(conn.conversation_id, {})
+        connections.pop(id(conn.socket), None)
+        if not connections:
+            self._subscribers.pop(conn.conversation_id, None)
+        pending = conn.queue.qsize()
+        if pending:
+            WS_DROPPED_FRAMES.labels("closed").inc(pending)
+            self._count_queued(-pending)
+        if conn.writer is not None and conn.writer is not asyncio.current_task():
+            conn.writer.cancel()
+        WS_CONNECTIONS.set(self.connection_count)
+
+    def _count_queued(self, delta: int) -> None:
+        self._queued += delta
+        WS_QUEUE_DEPTH.set(self._queued)
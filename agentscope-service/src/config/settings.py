@@ -4,6 +4,20 @@ from typing import Any, Dict
 import agentscope
 
 
+def _parse_float_map(raw: str) -> Dict[str, float]:
+    """Parse ``name=value,name=value`` into a dict, skipping malformed items."""
+    result: Dict[str, float] = {}
+    for item in raw.split(","):
+        name, sep, value = item.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            result[name.strip()] = float(value)
+        except ValueError:
+            continue
+    return result
+
+
 class AgentScopeSettings:
     """Wraps the runtime configuration that describes how AgentScope integrates with the node backend."""
 
@@ -21,6 +35,123 @@ class AgentScopeSettings:
         }
         self.backend_event_bridge_path = os.getenv("BACKEND_EVENT_BRIDGE_PATH", "/agentscope/events")
         self.backend_event_bridge_timeout = float(os.getenv("BACKEND_EVENT_BRIDGE_TIMEOUT", "5.0"))
+        # Agent events sent back to Node: bulk endpoint (empty posts events one by one), batching,
+        # retries and an optional append-only spool file that survives restarts and backend outages
+        self.backend_event_bridge_batch_path = os.getenv("BACKEND_EVENT_BRIDGE_BATCH_PATH", "")
+        self.backend_event_queue_size = int(os.getenv("BACKEND_EVENT_QUEUE_SIZE", "1000"))
+        self.backend_event_batch_size = int(os.getenv("BACKEND_EVENT_BATCH_SIZE", "50"))
+        self.backend_event_flush_interval = float(os.getenv("BACKEND_EVENT_FLUSH_INTERVAL", "0.5"))
+        self.backend_event_max_retries = int(os.getenv("BACKEND_EVENT_MAX_RETRIES", "5"))
+        self.backend_event_retry_backoff = float(os.getenv("BACKEND_EVENT_RETRY_BACKOFF", "0.5"))
+        self.backend_event_spool_path = os.getenv("BACKEND_EVENT_SPOOL_PATH", "")
+        # Bridged domain events are queued and fanned out by this many workers (partitioned by aggregateId)
+        self.event_dispatch_workers = int(os.getenv("AGENTSCOPE_EVENT_DISPATCH_WORKERS", "4"))
+        self.event_queue_size = int(os.getenv("AGENTSCOPE_EVENT_QUEUE_SIZE", "10000"))
+        # How long /bridge waits for room in a full queue before the event is dropped (the EventBus does not retry)
+        self.event_enqueue_timeout = float(os.getenv("AGENTSCOPE_EVENT_ENQUEUE_TIMEOUT", "2.0"))
+        self.event_drain_timeout = float(os.getenv("AGENTSCOPE_EVENT_DRAIN_TIMEOUT", "5.0"))
+        # NodeEventLedger retention by count and by age in seconds (0 keeps entries until evicted by count)
+        self.event_ledger_max_entries = int(os.getenv("AGENTSCOPE_EVENT_LEDGER_MAX_ENTRIES", "256"))
+        self.event_ledger_max_age = float(os.getenv("AGENTSCOPE_EVENT_LEDGER_MAX_AGE", "0"))
+        # BackendMCPClient connection pool (HTTP/2 needs the optional 'h2' package)
+        self.mcp_max_connections = int(os.getenv("AGENTSCOPE_MCP_MAX_CONNECTIONS", "100"))
+        self.mcp_max_keepalive_connections = int(os.getenv("AGENTSCOPE_MCP_MAX_KEEPALIVE", "20"))
+        self.mcp_keepalive_expiry = float(os.getenv("AGENTSCOPE_MCP_KEEPALIVE_EXPIRY", "30.0"))
+        self.mcp_http2 = os.getenv("AGENTSCOPE_MCP_HTTP2", "false").lower() == "true"
+        # Default and per-tool timeouts in seconds, e.g. "inspectConversation=60,getCustomerProfile=5"
+        self.mcp_timeout = float(os.getenv("AGENTSCOPE_MCP_TIMEOUT", "30.0"))
+        self.mcp_tool_timeouts = _parse_float_map(
+            os.getenv(
+                "AGENTSCOPE_MCP_TOOL_TIMEOUTS",
+                "inspectConversation=60,getCustomerProfile=5,getConversationHistory=10",
+            )
+        )
+        # Tools routed through a separate connection pool so they cannot block fast ones
+        self.mcp_slow_tools = {
+            name.strip()
+            for name in os.getenv("AGENTSCOPE_MCP_SLOW_TOOLS", "inspectConversation").split(",")
+            if name.strip()
+        }
+        # Per-conversation agent contexts kept per agent type (0 disables pooling)
+        self.agent_pool_size = int(os.getenv("AGENTSCOPE_AGENT_POOL_SIZE", "256"))
+        # PersistentMemory write-behind: flush once per agent call, or earlier by interval/pending count
+        self.memory_write_behind = os.getenv("AGENTSCOPE_MEMORY_WRITE_BEHIND", "true").lower() == "true"
+        self.memory_flush_interval = float(os.getenv("AGENTSCOPE_MEMORY_FLUSH_INTERVAL", "10.0"))
+        self.memory_flush_max_pending = int(os.getenv("AGENTSCOPE_MEMORY_FLUSH_MAX_PENDING", "32"))
+        # Send appended messages as sequenced deltas; compact into a snapshot after N deltas
+        self.memory_delta_enabled = os.getenv("AGENTSCOPE_MEMORY_DELTA", "true").lower() == "true"
+        self.memory_compact_after = int(os.getenv("AGENTSCOPE_MEMORY_COMPACT_AFTER", "50"))
+        # Hydrated memory cache: entries (0 disables), max age, and age after which the backend seq is rechecked
+        self.memory_cache_size = int(os.getenv("AGENTSCOPE_MEMORY_CACHE_SIZE", "1024"))
+        self.memory_cache_ttl = float(os.getenv("AGENTSCOPE_MEMORY_CACHE_TTL", "300.0"))
+        self.memory_cache_revalidate_after = float(os.getenv("AGENTSCOPE_MEMORY_CACHE_REVALIDATE_AFTER", "30.0"))
+        # Read-only MCP tool result cache: per-tool TTL in seconds (tools not listed are not cached)
+        self.mcp_cache_ttls = _parse_float_map(
+            os.getenv(
+                "AGENTSCOPE_MCP_CACHE_TTLS",
+                "getCustomerProfile=60,getSystemStatus=10,searchKnowledge=120",
+            )
+        )
+        self.mcp_cache_max_size = int(os.getenv("AGENTSCOPE_MCP_CACHE_MAX_SIZE", "512"))
+        self.mcp_cache_max_sizes = _parse_float_map(os.getenv("AGENTSCOPE_MCP_CACHE_MAX_SIZES", ""))
+        # Read-only tools whose concurrent identical calls share one in-flight request
+        self.mcp_single_flight_tools = {
+            name.strip()
+            for name in os.getenv(
+                "AGENTSCOPE_MCP_SINGLE_FLIGHT_TOOLS",
+                "getCustomerProfile,analyzeConversation,getSystemStatus,searchKnowledge,"
+                "searchTickets,getConversationHistory,getCustomerHistory",
+            ).split(",")
+            if name.strip()
+        }
+        # Background recordAgentCall writes: queue bound, batching, retries and overflow policy (drop/block)
+        self.audit_async = os.getenv("AGENTSCOPE_AUDIT_ASYNC", "true").lower() == "true"
+        self.audit_queue_size = int(os.getenv("AGENTSCOPE_AUDIT_QUEUE_SIZE", "1000"))
+        self.audit_batch_size = int(os.getenv("AGENTSCOPE_AUDIT_BATCH_SIZE", "20"))
+        self.audit_flush_interval = float(os.getenv("AGENTSCOPE_AUDIT_FLUSH_INTERVAL", "0.2"))
+        self.audit_max_retries = int(os.getenv("AGENTSCOPE_AUDIT_MAX_RETRIES", "3"))
+        self.audit_retry_backoff = float(os.getenv("AGENTSCOPE_AUDIT_RETRY_BACKOFF", "0.5"))
+        self.audit_overflow = os.getenv("AGENTSCOPE_AUDIT_OVERFLOW", "drop").lower()
+        self.audit_drain_timeout = float(os.getenv("AGENTSCOPE_AUDIT_DRAIN_TIMEOUT", "5.0"))
+        # Push partial LLM output as "delta" frames to the conversation's WebSocket
+        self.stream_deltas = os.getenv("AGENTSCOPE_STREAM_DELTAS", "true").lower() == "true"
+        # Per-connection WebSocket send queue, what to do when it is full (disconnect/drop_oldest/drop_newest)
+        # and how long one send may take before the connection is treated as stalled
+        self.ws_send_queue_size = int(os.getenv("AGENTSCOPE_WS_SEND_QUEUE_SIZE", "256"))
+        self.ws_slow_consumer_policy = os.getenv("AGENTSCOPE_WS_SLOW_CONSUMER_POLICY", "disconnect").lower()
+        self.ws_send_timeout = float(os.getenv("AGENTSCOPE_WS_SEND_TIMEOUT", "10.0"))
+        # Request deadline in seconds when the client sends no X-Request-Timeout header (0 = none), and the cap on it
+        self.request_timeout = float(os.getenv("AGENTSCOPE_REQUEST_TIMEOUT", "0"))
+        self.request_timeout_max = float(os.getenv("AGENTSCOPE_REQUEST_TIMEOUT_MAX", "300"))
+        # Compiled prompt cache size and how long cached prompt files are trusted before re-stat()
+        self.prompt_cache_size = int(os.getenv("AGENTSCOPE_PROMPT_CACHE_SIZE", "256"))
+        self.prompt_revalidate_after = float(os.getenv("AGENTSCOPE_PROMPT_REVALIDATE_AFTER", "2.0"))
+        # Watch docs/prompts/agents for changes (auto/inotify/poll) instead of re-stat()ing prompt files
+        self.prompt_watch = os.getenv("AGENTSCOPE_PROMPT_WATCH", "true").lower() == "true"
+        self.prompt_watch_backend = os.getenv("AGENTSCOPE_PROMPT_WATCH_BACKEND", "auto").lower()
+        self.prompt_watch_poll_interval = float(os.getenv("AGENTSCOPE_PROMPT_WATCH_POLL_INTERVAL", "1.0"))
+        # Optional JSON/YAML file extending the routing/sentiment/severity keyword tables
+        self.routing_keywords_file = os.getenv("AGENTSCOPE_ROUTING_KEYWORDS_FILE", "")
+        # Decide the execution mode from explicit metadata/local keywords when remote analysis cannot change it
+        self.routing_fast_path = os.getenv("AGENTSCOPE_ROUTING_FAST_PATH", "true").lower() == "true"
+        # Messages longer than this many characters get routing features extracted off the event loop
+        self.routing_offload_chars = int(os.getenv("AGENTSCOPE_ROUTING_OFFLOAD_CHARS", "4096"))
+        # Start the assistant with the default stage while remote analysis runs; a discarded run may already have called tools
+        self.speculative_assistant = os.getenv("AGENTSCOPE_SPECULATIVE_ASSISTANT", "false").lower() == "true"
+        # Parallel mode answers with whatever agents finished within this many seconds; late ones update the conversation
+        self.parallel_timeout = float(os.getenv("AGENTSCOPE_PARALLEL_TIMEOUT", "20.0"))
+        # Human handoffs: how long input is awaited, open-handoff cap, buffered inputs per conversation
+        # and in total, and whether human_first answers with a pending reply instead of holding the request open
+        self.human_handoff_timeout = float(os.getenv("AGENTSCOPE_HUMAN_HANDOFF_TIMEOUT", "300"))
+        self.human_handoff_max_open = int(os.getenv("AGENTSCOPE_HUMAN_HANDOFF_MAX_OPEN", "1000"))
+        self.human_handoff_buffer = int(os.getenv("AGENTSCOPE_HUMAN_HANDOFF_BUFFER", "16"))
+        self.human_handoff_max_buffered = int(os.getenv("AGENTSCOPE_HUMAN_HANDOFF_MAX_BUFFERED", "1000"))
+        self.human_handoff_async = os.getenv("AGENTSCOPE_HUMAN_HANDOFF_ASYNC", "false").lower() == "true"
+        # Prefetch deadline per source key in seconds, e.g. "knowledge=1.5", with a default for the rest
+        self.prefetch_deadline = float(os.getenv("AGENTSCOPE_PREFETCH_DEADLINE", "2.0"))
+        self.prefetch_deadlines = _parse_float_map(
+            os.getenv("AGENTSCOPE_PREFETCH_DEADLINES", "sentiment=0.5,customer_profile=1.0")
+        )
 
     def initialize_agentscope(self) -> None:
         """Initialize AgentScope runtime with logging and tracing configuration."""
@@ -1,3 +1,4 @@
 from .bridge import AgentEventPublisher, NodeEventLedger
+from .dispatcher import EventDispatcher
 
-__all__ = ["AgentEventPublisher", "NodeEventLedger"]
+__all__ = ["AgentEventPublisher", "NodeEventLedger", "EventDispatcher"]
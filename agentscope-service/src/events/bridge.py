@@ -1,36 +1,298 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+import os
+import random
+import time
+import uuid
 from collections import deque
+from collections.abc import Reversible
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 import httpx
+from pathlib import Path
+from prometheus_client import Counter, Gauge, Histogram
 from urllib.parse import urljoin
 
+PUBLISHED_EVENTS = Counter(
+    "agentscope_event_publisher_events_total",
+    "Agent events delivered to the Node EventBus or parked in the spool (sent/spooled)",
+    ["outcome"],
+)
+PUBLISH_DROPPED = Counter(
+    "agentscope_event_publisher_dropped_total",
+    "Agent events lost by the publisher",
+    ["reason"],
+)
+PUBLISH_RETRIES = Counter(
+    "agentscope_event_publisher_retries_total",
+    "Retried deliveries of an agent event batch to the Node EventBus",
+)
+PUBLISH_QUEUE_DEPTH = Gauge(
+    "agentscope_event_publisher_queue_depth",
+    "Agent events waiting in the publisher queue",
+)
+PUBLISH_SPOOL_DEPTH = Gauge(
+    "agentscope_event_publisher_spool_depth",
+    "Agent events waiting in the on-disk spool",
+)
+PUBLISH_BATCH_SIZE = Histogram(
+    "agentscope_event_publisher_batch_size",
+    "Events per batch delivered to the Node EventBus",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+PUBLISH_LATENCY = Histogram(
+    "agentscope_event_publisher_batch_duration_seconds",
+    "Time to deliver one batch, retries included",
+)
+
+# 4xx other than these mean the backend will never accept the event
+_RETRYABLE_STATUS = {408, 425, 429}
+
+# (sequence, monotonic receive time, entry); index deques share these tuples
+_LedgerRecord = tuple[int, float, Dict[str, Any]]
+
 
 class NodeEventLedger:
-    """In-memory ledger that keeps the latest events arriving from the backend EventBus."""
+    """
+    In-memory ledger that keeps the latest events arriving from the backend EventBus.
 
-    def __init__(self, max_entries: int = 256) -> None:
-        self._events: deque[Dict[str, Any]] = deque(maxlen=max_entries)
+    Every entry gets a monotonically increasing ``seq`` that serves as the
+    pagination cursor. Entries are indexed by ``aggregateId`` and
+    ``eventType`` so a single conversation is read in O(k), and retention is
+    bounded both by ``max_entries`` and, when set, by ``max_age_seconds``.
+    Redelivered events carrying an already retained ``eventId`` are ignored.
+    """
 
-    def record(self, event: Dict[str, Any]) -> None:
-        entry = {**event, "receivedAt": datetime.now(timezone.utc).isoformat()}
-        self._events.append(entry)
+    def __init__(self, max_entries: int = 256, max_age_seconds: float | None = None) -> None:
+        self._max_entries = max(1, max_entries)
+        self._max_age = max_age_seconds if max_age_seconds and max_age_seconds > 0 else None
+        self._events: deque[_LedgerRecord] = deque()
+        self._by_aggregate: Dict[str, deque[_LedgerRecord]] = {}
+        self._by_type: Dict[str, deque[_LedgerRecord]] = {}
+        self._event_ids: set[str] = set()
+        self._seq = 0
 
-    def recent(self) -> list[Dict[str, Any]]:
-        return list(self._events)
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def record(self, event: Dict[str, Any]) -> bool:
+        """Append ``event``; returns False when its ``eventId`` is already retained."""
+        self._expire()
+        event_id = event.get("eventId")
+        if event_id and event_id in self._event_ids:
+            return False
+        self._seq += 1
+        entry = {**event, "seq": self._seq, "receivedAt": datetime.now(timezone.utc).isoformat()}
+        record = (self._seq, time.monotonic(), entry)
+        self._events.append(record)
+        self._index(self._by_aggregate, entry.get("aggregateId")).append(record)
+        self._index(self._by_type, entry.get("eventType")).append(record)
+        if event_id:
+            self._event_ids.add(event_id)
+        while len(self._events) > self._max_entries:
+            self._evict()
+        return True
+
+    def recent(
+        self,
+        aggregate_id: str | None = None,
+        event_type: str | None = None,
+        after: int | None = None,
+        limit: int | None = None,
+    ) -> list[Dict[str, Any]]:
+        """
+        Retained events, oldest first.
+
+        Without ``after`` the newest ``limit`` matches are returned; with it,
+        the first ``limit`` matches whose ``seq`` is greater than the cursor.
+        """
+        self._expire()
+        if aggregate_id is not None:
+            source: Reversible[_LedgerRecord] = self._by_aggregate.get(aggregate_id, ())
+            if event_type is not None:
+                source = [record for record in source if record[2].get("eventType") == event_type]
+        elif event_type is not None:
+            source = self._by_type.get(event_type, ())
+        else:
+            source = self._events
+
+        matches: list[Dict[str, Any]] = []
+        for seq, _, entry in reversed(source):
+            if after is not None and seq <= after:
+                break
+            matches.append(entry)
+            if after is None and limit is not None and len(matches) >= limit:
+                break
+        matches.reverse()
+        if after is not None and limit is not None:
+            matches = matches[:limit]
+        return matches
 
     def clear(self) -> None:
         self._events.clear()
+        self._by_aggregate.clear()
+        self._by_type.clear()
+        self._event_ids.clear()
+
+    @staticmethod
+    def _index(index: Dict[str, deque[_LedgerRecord]], key: Any) -> deque[_LedgerRecord]:
+        return index.setdefault(str(key or ""), deque())
+
+    def _expire(self) -> None:
+        if self._max_age is None:
+            return
+        cutoff = time.monotonic() - self._max_age
+        while self._events and self._events[0][1] < cutoff:
+            self._evict()
+
+    def _evict(self) -> None:
+        # The oldest entry is also the oldest of both of its index deques
+        _, _, entry = self._events.popleft()
+        indexed = (
+            (self._by_aggregate, entry.get("aggregateId")),
+            (self._by_type, entry.get("eventType")),
+        )
+        for index, key in indexed:
+            name = str(key or "")
+            bucket = index.get(name)
+            if bucket:
+                bucket.popleft()
+                if not bucket:
+                    del index[name]
+        event_id = entry.get("eventId")
+        if event_id:
+            self._event_ids.discard(event_id)
+
+
+class _EventSpool:
+    """
+    JSON-lines file holding events the backend could not take yet.
+
+    New events are appended; replayed events are removed from the head only
+    once delivered, by atomically replacing the file with what is left.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Appends and head removals rewrite the same file from worker threads
+        self._lock = asyncio.Lock()
+        self.pending = len(self._read())
+        PUBLISH_SPOOL_DEPTH.set(self.pending)
+
+    async def append(self, events: list[Dict[str, Any]]) -> None:
+        async with self._lock:
+            await asyncio.to_thread(self._append, events)
+            self.pending += len(events)
+        PUBLISH_SPOOL_DEPTH.set(self.pending)
+
+    async def read(self) -> list[Dict[str, Any]]:
+        async with self._lock:
+            return await asyncio.to_thread(self._read)
+
+    async def discard(self, count: int) -> None:
+        """Remove the first ``count`` events, e.g. after they were replayed."""
+        if count <= 0:
+            return
+        async with self._lock:
+            self.pending = await asyncio.to_thread(self._discard, count)
+        PUBLISH_SPOOL_DEPTH.set(self.pending)
+
+    def _append(self, events: list[Dict[str, Any]]) -> None:
+        with self._path.open("a", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+            handle.flush()
+
+    def _discard(self, count: int) -> int:
+        events = self._read()[count:]
+        partial = self._path.with_name(self._path.name + ".tmp")
+        with partial.open("w", encoding="utf-8") as handle:
+            handle.writelines(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(partial, self._path)
+        return len(events)
+
+    def _read(self) -> list[Dict[str, Any]]:
+        if not self._path.exists():
+            return []
+        events = []
+        for line in self._path.read_text(encoding="utf-8").splitlines():
+            # A crash mid-append can leave a truncated last line
+            with contextlib.suppress(json.JSONDecodeError):
+                events.append(json.loads(line))
+        return events
 
 
 class AgentEventPublisher:
-    """Forward AgentScope-side events back into the Node.js EventBus."""
+    """
+    Forward AgentScope-side events back into the Node.js EventBus.
 
-    def __init__(self, base_url: str, path: str, timeout_seconds: float = 5.0) -> None:
+    ``publish_event`` only enqueues into a bounded queue; a worker sends
+    batches of up to ``batch_size`` events, waiting at most
+    ``flush_interval`` for a batch to fill. With ``batch_path`` a batch is
+    one POST of a JSON list, otherwise its events are posted one by one.
+    Failed deliveries are retried with jittered exponential backoff. Events
+    that still cannot be delivered, or do not fit the queue, are appended to
+    the ``spool_path`` file when configured (dropped and counted otherwise)
+    and replayed on start and after the next successful delivery; they stay
+    in the file until delivered. ``close()`` drains the queue within
+    ``drain_timeout`` and spools what is left.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        path: str,
+        timeout_seconds: float = 5.0,
+        batch_path: str | None = None,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 0.5,
+        max_retries: int = 5,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        spool_path: str | None = None,
+        drain_timeout: float = 5.0,
+    ) -> None:
         self._endpoint = urljoin(base_url, path)
+        self._batch_endpoint = urljoin(base_url, batch_path) if batch_path else None
         self._client = httpx.AsyncClient(timeout=timeout_seconds)
+        self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue(maxsize=max_queue)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._max_backoff = max_backoff
+        self._spool = _EventSpool(spool_path) if spool_path else None
+        self._drain_timeout = drain_timeout
+        self._worker: asyncio.Task[None] | None = None
+        # Taken from the queue but not delivered yet; close() spools these on cancel
+        self._undelivered: list[Dict[str, Any]] = []
+        self._closing = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "spooled": self._spool.pending if self._spool else 0,
+            "batch_endpoint": self._batch_endpoint is not None,
+        }
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
 
     async def publish_event(
         self,
@@ -40,19 +302,156 @@ class AgentEventPublisher:
         occurred_at: str | None = None,
         version: int = 1,
         event_id: str | None = None,
-    ) -> None:
+    ) -> bool:
+        """Queue one event; returns False if it was neither queued nor spooled."""
         body: Dict[str, Any] = {
+            # Retries and spool replays resend the same event, so it always carries an id
+            "eventId": event_id or str(uuid.uuid4()),
             "eventType": event_type,
             "aggregateId": aggregate_id,
             "payload": payload or {},
             "occurredAt": occurred_at or datetime.utcnow().isoformat(),
             "version": version,
         }
-        if event_id:
-            body["eventId"] = event_id
-
-        response = await self._client.post(self._endpoint, json=body)
-        response.raise_for_status()
+        if self._closing:
+            return await self._give_up([body], "closed")
+        self.start()
+        try:
+            self._queue.put_nowait(body)
+        except asyncio.QueueFull:
+            return await self._give_up([body], "queue_full")
+        PUBLISH_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
 
     async def close(self) -> None:
+        """Stop accepting events, deliver the backlog within ``drain_timeout`` and spool the rest."""
+        self._closing = True
+        if self._worker is not None:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._queue.join(), self._drain_timeout)
+            self._worker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._worker
+            self._worker = None
+            leftover, self._undelivered = self._undelivered, []
+            while not self._queue.empty():
+                leftover.append(self._queue.get_nowait())
+                self._queue.task_done()
+            if leftover:
+                await self._give_up(leftover, "shutdown")
+            PUBLISH_QUEUE_DEPTH.set(0)
         await self._client.aclose()
+
+    async def _run(self) -> None:
+        if self._spool and self._spool.pending:
+            await self._replay_spool()
+        while True:
+            batch = [await self._queue.get()]
+            await self._fill(batch)
+            PUBLISH_QUEUE_DEPTH.set(self._queue.qsize())
+            delivered = await self._deliver(batch)
+            for _ in range(len(batch)):
+                self._queue.task_done()
+            if delivered and self._spool and self._spool.pending:
+                await self._replay_spool()
+
+    async def _fill(self, batch: list[Dict[str, Any]]) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (0.0 if self._closing else self._flush_interval)
+        while len(batch) < self._batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                return
+
+    async def _replay_spool(self) -> None:
+        assert self._spool is not None
+        events = await self._spool.read()
+        for start in range(0, len(events), self._batch_size):
+            remaining = events[start : start + self._batch_size]
+            taken = len(remaining)
+            try:
+                delivered = await self._deliver(remaining, spooled=True)
+            finally:
+                # Only what left the batch is removed, so a crash or shutdown mid-replay loses nothing
+                await self._spool.discard(taken - len(remaining))
+            if not delivered:
+                # Backend is still unavailable: the rest stays spooled for the next recovery
+                return
+
+    async def _deliver(self, batch: list[Dict[str, Any]], spooled: bool = False) -> bool:
+        """
+        Send ``batch`` with retries; returns False once retries are exhausted.
+
+        Undeliverable events are spooled or dropped, events the backend
+        rejects with a non-retryable 4xx are dropped. A ``spooled`` batch is
+        already in the spool: it shrinks in place to what is still owed and
+        is left for the caller to keep.
+        """
+        PUBLISH_BATCH_SIZE.observe(len(batch))
+        start = time.perf_counter()
+        # Shrinks as events are delivered, so on cancellation it holds exactly what is still owed
+        remaining = batch if spooled else list(batch)
+        if not spooled:
+            self._undelivered = remaining
+        attempts = 0
+        try:
+            while remaining:
+                try:
+                    await self._post(remaining)
+                    continue
+                except httpx.HTTPStatusError as exc:
+                    status = exc.response.status_code
+                    if 400 <= status < 500 and status not in _RETRYABLE_STATUS:
+                        # A bulk request is rejected as a whole, a single post only for its event
+                        rejected = len(remaining) if self._batch_endpoint else 1
+                        del remaining[:rejected]
+                        PUBLISH_DROPPED.labels("rejected").inc(rejected)
+                        print(f"[AgentScope] backend rejected agent event ({status}): {exc}")
+                        continue
+                except httpx.HTTPError:
+                    pass
+                attempts += 1
+                if attempts > self._max_retries:
+                    if not spooled:
+                        await self._give_up(list(remaining), "retries_exhausted")
+                        remaining.clear()
+                    return False
+                PUBLISH_RETRIES.inc()
+                await asyncio.sleep(self._backoff(attempts))
+            return True
+        finally:
+            PUBLISH_LATENCY.observe(time.perf_counter() - start)
+
+    async def _post(self, remaining: list[Dict[str, Any]]) -> None:
+        # Delivered events are removed so a retry only resends what is missing
+        if self._batch_endpoint:
+            response = await self._client.post(self._batch_endpoint, json=remaining)
+            response.raise_for_status()
+            PUBLISHED_EVENTS.labels("sent").inc(len(remaining))
+            remaining.clear()
+            return
+        while remaining:
+            response = await self._client.post(self._endpoint, json=remaining[0])
+            response.raise_for_status()
+            PUBLISHED_EVENTS.labels("sent").inc()
+            remaining.pop(0)
+
+    def _backoff(self, attempts: int) -> float:
+        # Half fixed, half random, so publishers recovering together do not retry in lockstep
+        delay: float = min(self._retry_backoff * 2 ** (attempts - 1), self._max_backoff)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _give_up(self, events: list[Dict[str, Any]], reason: str) -> bool:
+        if self._spool is not None and events:
+            await self._spool.append(events)
+            PUBLISHED_EVENTS.labels("spooled").inc(len(events))
+            return True
+        PUBLISH_DROPPED.labels(reason).inc(len(events))
+        return False
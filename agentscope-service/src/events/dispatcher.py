@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+import time
+import zlib
+from collections import Counter as TypeCounts
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+EVENTS_ENQUEUED = Counter(
+    "agentscope_bridge_events_enqueued_total",
+    "Bridged domain events accepted into the dispatch queue",
+    ["event_type"],
+)
+EVENTS_DROPPED = Counter(
+    "agentscope_bridge_events_dropped_total",
+    "Bridged domain events not dispatched (queue_full/closed/shutdown)",
+    ["event_type", "reason"],
+)
+EVENT_QUEUE_DEPTH = Gauge(
+    "agentscope_bridge_event_queue_depth",
+    "Bridged domain events waiting for a dispatch worker",
+    ["event_type"],
+)
+EVENT_QUEUE_WAIT = Histogram(
+    "agentscope_bridge_event_queue_wait_seconds",
+    "Time a bridged event spent queued before dispatch",
+    ["event_type"],
+)
+EVENT_HANDLER_ERRORS = Counter(
+    "agentscope_bridge_event_handler_errors_total",
+    "Failures of individual event handlers during dispatch",
+    ["handler"],
+)
+
+EventHandler = Callable[[dict[str, Any]], "Awaitable[Any] | Any"]
+
+
+class EventDispatcher:
+    """
+    In-process fan-out of bridged domain events.
+
+    ``publish`` only enqueues, so the Node EventBus is acknowledged without
+    waiting on browsers or caches. Worker tasks hand each event to every
+    subscribed handler in registration order; a failing handler is counted
+    and skipped. Events are partitioned over the workers by ``aggregateId``,
+    which keeps events of one aggregate in order while different aggregates
+    are dispatched concurrently. ``close()`` drains what is queued, bounded
+    by ``drain_timeout``.
+    """
+
+    def __init__(
+        self, workers: int = 4, max_queue: int = 10000, drain_timeout: float = 5.0
+    ) -> None:
+        self._partitions = max(1, workers)
+        # Each partition gets its share of the total capacity
+        per_partition = max(1, max_queue // self._partitions)
+        self._queues: list[asyncio.Queue[tuple[dict[str, Any], float]]] = [
+            asyncio.Queue(maxsize=per_partition) for _ in range(self._partitions)
+        ]
+        self._handlers: list[tuple[str, EventHandler]] = []
+        self._workers: list[asyncio.Task[None]] = []
+        self._drain_timeout = drain_timeout
+        self._closing = False
+        self._depth: TypeCounts[str] = TypeCounts()
+
+    @property
+    def pending(self) -> int:
+        return sum(queue.qsize() for queue in self._queues)
+
+    def subscribe(self, name: str, handler: EventHandler) -> None:
+        self._handlers.append((name, handler))
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "pending": self.pending,
+            "pending_by_type": {event_type: n for event_type, n in self._depth.items() if n},
+            "handlers": [name for name, _ in self._handlers],
+        }
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.ensure_future(self._run(queue)) for queue in self._queues]
+
+    def publish(self, event: dict[str, Any]) -> bool:
+        """Queue one event for dispatch; returns False if it was dropped."""
+        queue = self._queue_for(event)
+        if queue is not None:
+            try:
+                queue.put_nowait((event, time.perf_counter()))
+            except asyncio.QueueFull:
+                return self._dropped(event, "queue_full")
+        return self._accepted(event, queue)
+
+    async def put(self, event: dict[str, Any], timeout: float) -> bool:
+        """Like ``publish``, but wait up to ``timeout`` for room in a full queue."""
+        queue = self._queue_for(event)
+        if queue is not None:
+            try:
+                await asyncio.wait_for(queue.put((event, time.perf_counter())), timeout)
+            except TimeoutError:
+                return self._dropped(event, "queue_full")
+        return self._accepted(event, queue)
+
+    async def close(self) -> None:
+        """Stop accepting events and dispatch the backlog within ``drain_timeout``."""
+        self._closing = True
+        if not self._workers:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(
+                asyncio.gather(*(queue.join() for queue in self._queues)), self._drain_timeout
+            )
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for queue in self._queues:
+            while not queue.empty():
+                event, _ = queue.get_nowait()
+                queue.task_done()
+                event_type = str(event.get("eventType") or "unknown")
+                EVENTS_DROPPED.labels(event_type, "shutdown").inc()
+                self._track(event_type, -1)
+
+    def _queue_for(
+        self, event: dict[str, Any]
+    ) -> asyncio.Queue[tuple[dict[str, Any], float]] | None:
+        if self._closing:
+            return None
+        self.start()
+        return self._queues[self._partition(event)]
+
+    def _accepted(
+        self, event: dict[str, Any], queue: asyncio.Queue[tuple[dict[str, Any], float]] | None
+    ) -> bool:
+        if queue is None:
+            return self._dropped(event, "closed")
+        event_type = str(event.get("eventType") or "unknown")
+        EVENTS_ENQUEUED.labels(event_type).inc()
+        self._track(event_type, 1)
+        return True
+
+    @staticmethod
+    def _dropped(event: dict[str, Any], reason: str) -> bool:
+        EVENTS_DROPPED.labels(str(event.get("eventType") or "unknown"), reason).inc()
+        return False
+
+    def _partition(self, event: dict[str, Any]) -> int:
+        if self._partitions == 1:
+            return 0
+        key = str(event.get("aggregateId") or "").encode()
+        return zlib.crc32(key) % self._partitions
+
+    async def _run(self, queue: asyncio.Queue[tuple[dict[str, Any], float]]) -> None:
+        while True:
+            event, enqueued_at = await queue.get()
+            event_type = str(event.get("eventType") or "unknown")
+            self._track(event_type, -1)
+            EVENT_QUEUE_WAIT.labels(event_type).observe(time.perf_counter() - enqueued_at)
+            try:
+                await self._dispatch(event)
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, event: dict[str, Any]) -> None:
+        for name, handler in self._handlers:
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as exc:
+                EVENT_HANDLER_ERRORS.labels(name).inc()
+                print(f"[AgentScope] event handler {name} failed: {exc}")
+
+    def _track(self, event_type: str, delta: int) -> None:
+        self._depth[event_type] += delta
+        EVENT_QUEUE_DEPTH.labels(event_type).set(self._depth[event_type])
@@ -0,0 +1,27 @@
+from .keyword_matcher import (
+    DEFAULT_KEYWORD_TABLES,
+    KeywordHits,
+    KeywordMatcher,
+    load_keyword_tables,
+    routing_keywords,
+)
+from .routing_features import (
+    RoutingFeatures,
+    complexity_score,
+    extract_routing_features,
+    extract_routing_features_async,
+    scenario_of,
+)
+
+__all__ = [
+    "DEFAULT_KEYWORD_TABLES",
+    "KeywordHits",
+    "KeywordMatcher",
+    "RoutingFeatures",
+    "complexity_score",
+    "extract_routing_features",
+    "extract_routing_features_async",
+    "load_keyword_tables",
+    "routing_keywords",
+    "scenario_of",
+]
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import json
+import re
+import threading
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from src.config.settings import settings
+
+# Keyword tables behind the routing, sentiment and severity heuristics.
+# Category names are the public contract; a config file may extend them.
+DEFAULT_KEYWORD_TABLES: dict[str, list[str]] = {
+    "fault": [
+        "报错",
+        "错误",
+        "异常",
+        "崩溃",
+        "无法",
+        "失败",
+        "500",
+        "404",
+        "403",
+        "宕机",
+        "卡顿",
+        "白屏",
+    ],
+    "complaint": [
+        "投诉",
+        "不满意",
+        "差评",
+        "要求退款",
+        "退款",
+        "质量差",
+        "服务差",
+        "太差",
+        "服务太差",
+        "欺骗",
+    ],
+    "requirement": ["需要", "希望", "想要", "能不能", "可以吗"],
+    "complex": ["为什么", "怎么办", "如何", "能否", "可以吗"],
+    "negative": ["烂", "差", "垃圾", "投诉", "退款", "不满意", "太差", "欺骗", "生气", "愤怒"],
+    "positive": ["谢谢", "很好", "满意", "赞", "表扬", "不错"],
+    "severity_p0": ["宕机", "崩溃", "所有用户", "完全不可用", "无法访问"],
+    "severity_p1": ["核心功能", "无法", "失败", "500", "错误"],
+    "severity_p2": ["异常", "问题", "不正常"],
+}
+
+# Up to this many keywords, per-keyword C-level ``in`` checks beat the Python
+# automaton walk on texts of at least _NAIVE_MIN_CHARS (benchmarks/README.md).
+_NAIVE_MAX_KEYWORDS = 100
+_NAIVE_MIN_CHARS = 200
+
+
+class KeywordHits(dict[str, set[str]]):
+    """Matched keywords per category for one text."""
+
+    def has(self, category: str) -> bool:
+        return category in self
+
+    def count(self, category: str) -> int:
+        """Number of distinct keywords of ``category`` found in the text."""
+        return len(self.get(category, ()))
+
+
+class _DeferredHits(KeywordHits):
+    """
+    Hits of a long text, searched per category only when a call site asks.
+
+    ``has`` stops at the first keyword found and ``count`` searches one
+    category, which is what the call sites did inline before the matcher
+    existed. Any other dict access first searches every category.
+    """
+
+    def __init__(self, tables: Mapping[str, tuple[str, ...]], lowered: str) -> None:
+        self._tables = tables
+        self._lowered = lowered
+        self._searched: set[str] = set()
+
+    def has(self, category: str) -> bool:
+        lowered = self._lowered
+        return any(keyword in lowered for keyword in self._tables.get(category, ()))
+
+    def count(self, category: str) -> int:
+        self._search(category)
+        return len(dict.get(self, category, ()))
+
+    def _search(self, category: str) -> None:
+        if category in self._searched:
+            return
+        lowered = self._lowered
+        found = {keyword for keyword in self._tables.get(category, ()) if keyword in lowered}
+        if found:
+            dict.__setitem__(self, category, found)
+        # Marked only once stored: cached hits can be read from another thread meanwhile
+        self._searched.add(category)
+
+    def _complete(self) -> None:
+        if len(self._searched) < len(self._tables):
+            for category in self._tables:
+                self._search(category)
+
+    def __contains__(self, key: object) -> bool:
+        self._complete()
+        return super().__contains__(key)
+
+    def __getitem__(self, key: str) -> set[str]:
+        self._complete()
+        return super().__getitem__(key)
+
+    def __iter__(self) -> Iterator[str]:
+        self._complete()
+        return super().__iter__()
+
+    def __len__(self) -> int:
+        self._complete()
+        return super().__len__()
+
+    def __eq__(self, other: object) -> bool:
+        self._complete()
+        return super().__eq__(other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    def __repr__(self) -> str:
+        self._complete()
+        return super().__repr__()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._complete()
+        return super().get(key, default)
+
+    def keys(self) -> Any:
+        self._complete()
+        return super().keys()
+
+    def values(self) -> Any:
+        self._complete()
+        return super().values()
+
+    def items(self) -> Any:
+        self._complete()
+        return super().items()
+
+
+class KeywordMatcher:
+    """
+    Aho–Corasick automaton over categorized keyword tables.
+
+    The automaton is compiled once into a full transition table, so ``scan``
+    walks the text a single time no matter how many keywords or categories
+    there are, and reports every category hit at once. Matching is
+    case-insensitive. Characters that occur in no keyword always reset the
+    automaton, so only runs of keyword characters (found with one C-level
+    regex pass) are walked in Python. With small tables, long texts are
+    checked per keyword on demand instead, which is cheaper there. The last
+    ``cache_size`` results are memoized because one message is classified by
+    several call sites; treat returned hits as read-only.
+    """
+
+    def __init__(self, tables: Mapping[str, Iterable[str]], cache_size: int = 256) -> None:
+        self.tables = {
+            category: tuple(dict.fromkeys(k.lower() for k in keywords if k))
+            for category, keywords in tables.items()
+        }
+        goto: list[dict[str, int]] = [{}]
+        outputs: list[list[tuple[str, str]]] = [[]]
+        for category, keywords in self.tables.items():
+            for keyword in keywords:
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    state = nxt
+                outputs[state].append((category, keyword))
+
+        # Breadth-first: resolve failure links into direct transitions and
+        # inherit the matches of each state's longest proper suffix.
+        delta: list[dict[str, int]] = [dict(edges) for edges in goto]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state].extend(outputs[fail[state]])
+            for ch, fallback in delta[fail[state]].items():
+                delta[state].setdefault(ch, fallback)
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                queue.append(nxt)
+        self._delta = delta
+        self._outputs: list[tuple[tuple[str, str], ...]] = [tuple(out) for out in outputs]
+        alphabet = "".join(sorted({ch for edges in goto for ch in edges}))
+        self._runs = re.compile(f"[{re.escape(alphabet)}]+") if alphabet else None
+        keyword_count = sum(len(keywords) for keywords in self.tables.values())
+        self._naive_min_chars = _NAIVE_MIN_CHARS if keyword_count <= _NAIVE_MAX_KEYWORDS else None
+        self._cache_size = cache_size
+        self._cache: OrderedDict[str, KeywordHits] = OrderedDict()
+        # Long texts are scanned from worker threads (extract_routing_features_async) too
+        self._cache_lock = threading.Lock()
+
+    def scan(self, text: str | None) -> KeywordHits:
+        if not text or self._runs is None:
+            return KeywordHits()
+        with self._cache_lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+        hits = self._scan(text)
+        if self._cache_size > 0:
+            with self._cache_lock:
+                self._cache[text] = hits
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return hits
+
+    def _scan(self, text: str) -> KeywordHits:
+        assert self._runs is not None
+        if self._naive_min_chars is not None and len(text) >= self._naive_min_chars:
+            return _DeferredHits(self.tables, text.lower())
+        hits = KeywordHits()
+        delta = self._delta
+        outputs = self._outputs
+        for run in self._runs.findall(text.lower()):
+            state = 0
+            for ch in run:
+                state = delta[state].get(ch, 0)
+                if outputs[state]:
+                    for category, keyword in outputs[state]:
+                        found = hits.get(category)
+                        if found is None:
+                            hits[category] = {keyword}
+                        else:
+                            found.add(keyword)
+        return hits
+
+
+def load_keyword_tables(path: str | None = None) -> dict[str, list[str]]:
+    """
+    Default keyword tables, extended by an optional JSON or YAML file.
+
+    The file maps category names to keyword lists; its keywords are added to
+    the built-in ones of the same category.
+    """
+    tables = {category: list(keywords) for category, keywords in DEFAULT_KEYWORD_TABLES.items()}
+    if not path:
+        return tables
+    raw = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".json"):
+        data = json.loads(raw)
+    else:
+        from src.prompts.agent_prompt import _parse_simple_yaml
+
+        data = _parse_simple_yaml(raw)
+    if not isinstance(data, dict):
+        raise ValueError(f"keyword table file {path} must map categories to keyword lists")
+    for category, keywords in data.items():
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        if not isinstance(keywords, list):
+            raise ValueError(f"keywords for {category!r} in {path} must be a list")
+        merged = tables.setdefault(str(category), [])
+        merged.extend(str(k) for k in keywords if str(k) not in merged)
+    return tables
+
+
+routing_keywords = KeywordMatcher(load_keyword_tables(settings.routing_keywords_file))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+from prometheus_client import Counter
+
+from src.heuristics.keyword_matcher import KeywordHits, KeywordMatcher, routing_keywords
+
+ROUTING_FEATURE_EXTRACTIONS = Counter(
+    "agentscope_routing_feature_extractions_total",
+    "Routing feature extractions by where they ran (inline/executor)",
+    ["mode"],
+)
+
+
+@dataclass(frozen=True)
+class RoutingFeatures:
+    """Message-only routing signals; everything that needs no backend call."""
+
+    complexity: float
+    scenario: str
+    has_requirement: bool
+    hits: KeywordHits
+
+
+def complexity_score(content: str, hits: KeywordHits) -> float:
+    """Length, question count and "complex" keyword density, capped at 1.0."""
+    words = len(content.split())
+    base_complexity = min(1.0, words / 240)
+    question_count = content.count("?") + content.count("？")
+    question_factor = min(0.3, question_count * 0.1)
+    keyword_factor = min(0.2, hits.count("complex") * 0.1)
+    return min(1.0, base_complexity + question_factor + keyword_factor)
+
+
+def scenario_of(hits: KeywordHits) -> str:
+    if hits.has("fault"):
+        return "fault"
+    if hits.has("complaint"):
+        return "complaint"
+    return "consultation"
+
+
+def extract_routing_features(
+    content: str | None, matcher: KeywordMatcher = routing_keywords
+) -> RoutingFeatures:
+    """Complexity, scenario and requirement flag from one keyword scan."""
+    content = content or ""
+    hits = matcher.scan(content)
+    return RoutingFeatures(
+        complexity=complexity_score(content, hits),
+        scenario=scenario_of(hits),
+        has_requirement=hits.has("requirement"),
+        hits=hits,
+    )
+
+
+async def extract_routing_features_async(
+    content: str | None, offload_threshold: int, matcher: KeywordMatcher = routing_keywords
+) -> RoutingFeatures:
+    """
+    Run ``extract_routing_features`` inline, or in the default executor when
+    ``content`` is longer than ``offload_threshold`` characters.
+
+    For ordinary messages the work takes microseconds, far less than the
+    thread handoff, so it only leaves the event loop for very large inputs.
+    A threshold of 0 or less always runs inline.
+    """
+    if offload_threshold <= 0 or len(content or "") <= offload_threshold:
+        ROUTING_FEATURE_EXTRACTIONS.labels("inline").inc()
+        return extract_routing_features(content, matcher)
+    ROUTING_FEATURE_EXTRACTIONS.labels("executor").inc()
+    return await asyncio.to_thread(extract_routing_features, content, matcher)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from agentscope.message import Msg
+from prometheus_client import Counter, Gauge
+
+from src.config.settings import settings
+
+MEMORY_CACHE_REQUESTS = Counter(
+    "agentscope_memory_cache_requests_total",
+    "Hydrated memory cache lookups (hit/revalidated/stale/miss)",
+    ["result"],
+)
+MEMORY_CACHE_SIZE = Gauge(
+    "agentscope_memory_cache_entries",
+    "Hydrated memories currently held in the cache",
+)
+
+
+@dataclass
+class CachedMemory:
+    """Memory state known to match what the backend has stored."""
+
+    messages: list[Msg]
+    seq: int
+    deltas_since_snapshot: int
+    stored_at: float
+    verified_at: float
+
+
+class HydratedMemoryCache:
+    """
+    Bounded LRU/TTL cache of hydrated memories keyed by (conversationId, agent_name).
+
+    Entries younger than ``revalidate_after`` seconds are served without
+    contacting the backend; older ones (up to ``ttl``) must be confirmed by
+    a cheap version check before reuse.
+    """
+
+    def __init__(
+        self, max_size: int = 1024, ttl: float = 300.0, revalidate_after: float = 30.0
+    ) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        self._revalidate_after = revalidate_after
+        self._entries: OrderedDict[tuple[str, str], CachedMemory] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_size > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, conversation_id: str, agent_name: str) -> CachedMemory | None:
+        key = (conversation_id, agent_name)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.stored_at > self._ttl:
+            self.invalidate(conversation_id, agent_name)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def needs_revalidation(self, entry: CachedMemory) -> bool:
+        return time.monotonic() - entry.verified_at > self._revalidate_after
+
+    def put(
+        self,
+        conversation_id: str,
+        agent_name: str,
+        messages: list[Msg],
+        seq: int,
+        deltas_since_snapshot: int = 0,
+    ) -> None:
+        if not self.enabled:
+            return
+        key = (conversation_id, agent_name)
+        now = time.monotonic()
+        self._entries[key] = CachedMemory(
+            messages=list(messages),
+            seq=seq,
+            deltas_since_snapshot=deltas_since_snapshot,
+            stored_at=now,
+            verified_at=now,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+        MEMORY_CACHE_SIZE.set(len(self._entries))
+
+    def invalidate(self, conversation_id: str, agent_name: str | None = None) -> None:
+        """Drop one agent's memory, or every agent's memory for the conversation."""
+        if agent_name is not None:
+            self._entries.pop((conversation_id, agent_name), None)
+        else:
+            for key in [k for k in self._entries if k[0] == conversation_id]:
+                del self._entries[key]
+        MEMORY_CACHE_SIZE.set(len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        MEMORY_CACHE_SIZE.set(0)
+
+
+memory_cache = HydratedMemoryCache(
+    max_size=settings.memory_cache_size,
+    ttl=settings.memory_cache_ttl,
+    revalidate_after=settings.memory_cache_revalidate_after,
+)
@@ -1,47 +1,211 @@
 from __future__ import annotations
 
+import json
+import time
+import weakref
+from collections.abc import Awaitable
 from typing import Any
 
 from agentscope.message import Msg
 from agentscope.memory import MemoryBase
+from prometheus_client import Counter, Histogram
 
-from src.tools.persistence import PersistenceClient
+from src.config.settings import settings
+from src.memory.memory_cache import MEMORY_CACHE_REQUESTS, HydratedMemoryCache, memory_cache
+from src.tools.persistence import MemoryDeltaUnsupportedError, PersistenceClient
+
+MEMORY_FLUSHES = Counter(
+    "agentscope_memory_flushes_total",
+    "Memory flushes issued by PersistentMemory (kind: snapshot/delta)",
+    ["agent", "kind", "status"],
+)
+MEMORY_FLUSH_BYTES = Counter(
+    "agentscope_memory_flush_bytes_total",
+    "Serialized bytes of PersistentMemory delta flushes (snapshots are not re-encoded to measure them)",
+    ["agent", "kind"],
+)
+MEMORY_FLUSH_LATENCY = Histogram(
+    "agentscope_memory_flush_duration_seconds",
+    "Latency of PersistentMemory flushes",
+    ["agent"],
+)
+
+# Write-behind memories holding unflushed state, drained on shutdown.
+_dirty_memories: weakref.WeakSet[PersistentMemory] = weakref.WeakSet()
+
+
+async def flush_pending_memories() -> int:
+    """Flush every write-behind memory that still holds dirty state."""
+    flushed = 0
+    for memory in list(_dirty_memories):
+        try:
+            await memory.flush()
+            flushed += 1
+        except Exception:
+            continue
+    return flushed
+
+
+async def flush_agent_memory(memory: Any) -> None:
+    """Flush an agent's write-behind memory at the end of a call, even a failed one."""
+    if not isinstance(memory, PersistentMemory):
+        return
+    try:
+        await memory.flush()
+    except Exception as exc:
+        print(f"[AgentScope] memory flush failed for {memory._agent_name}: {exc}")
 
 
 class PersistentMemory(MemoryBase):
-    """Persist memory via Node MCP tools while keeping an in-process cache."""
+    """
+    Persist memory via Node MCP tools while keeping an in-process cache.
+
+    By default every mutation is flushed immediately. In write-behind mode
+    mutations only mark the memory dirty; state is flushed when ``flush()``
+    is called (end of the agent call), when ``max_pending`` mutations have
+    accumulated, or when ``flush_interval`` seconds have passed since the
+    last flush.
+
+    In delta mode append-only changes are sent as sequenced records through
+    ``recordAgentMemoryDelta`` instead of the whole content list. The stored
+    format is a snapshot plus deltas::
+
+        {"memory": {"content": [...], "seq": S},
+         "deltas": [{"seq": S + 1, "msg": {...}}, ...]}
+
+    ``hydrate()`` replays deltas newer than the snapshot. Deletes, clears and
+    more than ``compact_after`` deltas since the last snapshot trigger a
+    compaction, i.e. a full ``recordAgentMemory`` snapshot.
+
+    With a ``cache``, hydrated and flushed state is remembered in-process so
+    the next turn of a warm conversation can skip ``getAgentMemory``.
+    """
 
     def __init__(
         self,
         persistence: PersistenceClient,
         conversation_id: str | None,
         agent_name: str,
+        write_behind: bool = False,
+        flush_interval: float | None = None,
+        max_pending: int | None = None,
+        delta: bool = False,
+        compact_after: int = 50,
+        cache: HydratedMemoryCache | None = None,
     ) -> None:
         super().__init__()
         self._persistence = persistence
         self._conversation_id = conversation_id
         self._agent_name = agent_name
         self._content: list[Msg] = []
+        self._write_behind = write_behind
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self._delta = delta
+        self._compact_after = compact_after
+        # Sequence number of the last persisted record and how much of
+        # _content the backend already has.
+        self._seq = 0
+        self._persisted_len = 0
+        self._deltas_since_snapshot = 0
+        self._needs_snapshot = False
+        self._cache = cache
+
+    @classmethod
+    def from_settings(
+        cls,
+        persistence: PersistenceClient,
+        conversation_id: str | None,
+        agent_name: str,
+    ) -> PersistentMemory:
+        """Build a memory configured from the service settings."""
+        return cls(
+            persistence,
+            conversation_id,
+            agent_name,
+            write_behind=settings.memory_write_behind,
+            flush_interval=settings.memory_flush_interval,
+            max_pending=settings.memory_flush_max_pending,
+            delta=settings.memory_delta_enabled,
+            compact_after=settings.memory_compact_after,
+            cache=memory_cache if memory_cache.enabled else None,
+        )
+
+    @property
+    def dirty(self) -> bool:
+        return self._pending > 0
 
     async def hydrate(self) -> None:
-        if not self._conversation_id:
+        conversation_id = self._conversation_id
+        if not conversation_id:
+            return
+        if self._cache is not None and await self._hydrate_from_cache(conversation_id):
             return
         payload = await self._persistence.load_agent_memory(
-            conversation_id=self._conversation_id,
+            conversation_id=conversation_id,
             agent_name=self._agent_name,
         )
         if not payload:
+            self._remember(conversation_id)
             return
-        content = payload.get('memory', {}).get('content', [])
-        self._content = []
-        for data in content:
+        self.load_state_dict(payload.get('memory') or {})
+        deltas = [
+            d for d in payload.get('deltas') or []
+            if isinstance(d, dict) and isinstance(d.get('seq'), int) and d['seq'] > self._seq
+        ]
+        for delta in sorted(deltas, key=lambda d: d['seq']):
+            data = delta.get('msg')
             if isinstance(data, dict):
                 data.pop('type', None)
                 self._content.append(Msg.from_dict(data))
+            self._seq = delta['seq']
+        self._persisted_len = len(self._content)
+        self._deltas_since_snapshot = len(deltas)
+        self._remember(conversation_id)
+
+    async def _hydrate_from_cache(self, conversation_id: str) -> bool:
+        assert self._cache is not None
+        entry = self._cache.get(conversation_id, self._agent_name)
+        if entry is None:
+            MEMORY_CACHE_REQUESTS.labels("miss").inc()
+            return False
+        result = "hit"
+        if self._cache.needs_revalidation(entry):
+            seq = await self._persistence.load_agent_memory_version(
+                conversation_id=conversation_id,
+                agent_name=self._agent_name,
+            )
+            if seq != entry.seq:
+                self._cache.invalidate(conversation_id, self._agent_name)
+                MEMORY_CACHE_REQUESTS.labels("stale").inc()
+                return False
+            entry.verified_at = time.monotonic()
+            result = "revalidated"
+        self._content = list(entry.messages)
+        self._seq = entry.seq
+        self._persisted_len = len(self._content)
+        self._deltas_since_snapshot = entry.deltas_since_snapshot
+        self._needs_snapshot = False
+        MEMORY_CACHE_REQUESTS.labels(result).inc()
+        return True
+
+    def _remember(self, conversation_id: str) -> None:
+        """Cache the current state; only call when it matches the backend."""
+        if self._cache is not None:
+            self._cache.put(
+                conversation_id,
+                self._agent_name,
+                self._content,
+                self._seq,
+                self._deltas_since_snapshot,
+            )
 
     def state_dict(self) -> dict:
         return {
             'content': [msg.to_dict() for msg in self._content],
+            'seq': self._seq,
         }
 
     def load_state_dict(self, state_dict: dict, strict: bool = True) -> None:
@@ -50,6 +214,11 @@ class PersistentMemory(MemoryBase):
             if isinstance(data, dict):
                 data.pop('type', None)
                 self._content.append(Msg.from_dict(data))
+        seq = state_dict.get('seq')
+        self._seq = seq if isinstance(seq, int) else 0
+        self._persisted_len = len(self._content)
+        self._deltas_since_snapshot = 0
+        self._needs_snapshot = False
 
     async def size(self) -> int:
         return len(self._content)
@@ -68,7 +237,8 @@ class PersistentMemory(MemoryBase):
         self._content = [
             _ for idx, _ in enumerate(self._content) if idx not in index
         ]
-        await self._flush()
+        self._needs_snapshot = True
+        await self._mark_dirty()
 
     async def add(self, memories: Any, allow_duplicates: bool = False) -> None:
         if memories is None:
@@ -88,20 +258,117 @@ class PersistentMemory(MemoryBase):
             existing_ids = [_.id for _ in self._content]
             memories = [_ for _ in memories if _.id not in existing_ids]
         self._content.extend(memories)
-        await self._flush()
+        await self._mark_dirty()
 
     async def get_memory(self) -> list[Msg]:
         return self._content
 
     async def clear(self) -> None:
         self._content = []
+        self._needs_snapshot = True
+        await self._mark_dirty()
+
+    async def compact(self) -> None:
+        """Replace the stored snapshot and deltas with a single fresh snapshot."""
+        self._needs_snapshot = True
+        self._pending += 1
         await self._flush()
 
+    async def flush(self) -> None:
+        """Persist coalesced state if anything changed since the last flush."""
+        if self.dirty:
+            await self._flush()
+
+    async def _mark_dirty(self) -> None:
+        self._pending += 1
+        if not self._write_behind:
+            await self._flush()
+            return
+        _dirty_memories.add(self)
+        over_size = self._max_pending is not None and self._pending >= self._max_pending
+        overdue = (
+            self._flush_interval is not None
+            and time.monotonic() - self._last_flush >= self._flush_interval
+        )
+        if over_size or overdue:
+            await self._flush()
+
     async def _flush(self) -> None:
-        if not self._conversation_id:
+        conversation_id = self._conversation_id
+        if not conversation_id:
+            self._pending = 0
+            _dirty_memories.discard(self)
             return
-        await self._persistence.record_agent_memory(
-            conversation_id=self._conversation_id,
-            agent_name=self._agent_name,
-            memory=self.state_dict(),
+        flushed_pending = self._pending
+        appended = self._content[self._persisted_len:]
+        use_delta = (
+            self._delta
+            and self._persistence.supports_memory_delta
+            and not self._needs_snapshot
+            and self._deltas_since_snapshot + len(appended) <= self._compact_after
         )
+        try:
+            if use_delta and appended:
+                try:
+                    await self._flush_delta(conversation_id, appended)
+                except MemoryDeltaUnsupportedError:
+                    await self._flush_snapshot(conversation_id)
+            elif not use_delta:
+                await self._flush_snapshot(conversation_id)
+        except Exception:
+            # The backend state is unknown now; force the next hydrate to reload it
+            if self._cache is not None:
+                self._cache.invalidate(conversation_id, self._agent_name)
+            raise
+        # Mutations made while the flush was in flight stay pending
+        self._pending = max(0, self._pending - flushed_pending)
+        self._last_flush = time.monotonic()
+        if not self.dirty:
+            _dirty_memories.discard(self)
+            self._remember(conversation_id)
+
+    async def _flush_snapshot(self, conversation_id: str) -> None:
+        self._seq += 1
+        memory = self.state_dict()
+        await self._send("snapshot", None, self._persistence.record_agent_memory(
+            conversation_id=conversation_id,
+            agent_name=self._agent_name,
+            memory=memory,
+        ))
+        self._persisted_len = len(self._content)
+        self._deltas_since_snapshot = 0
+        self._needs_snapshot = False
+
+    async def _flush_delta(self, conversation_id: str, appended: list[Msg]) -> None:
+        entries = [
+            {'seq': self._seq + offset, 'msg': msg.to_dict()}
+            for offset, msg in enumerate(appended, start=1)
+        ]
+        await self._send("delta", entries, self._persistence.record_agent_memory_delta(
+            conversation_id=conversation_id,
+            agent_name=self._agent_name,
+            base_seq=self._seq,
+            entries=entries,
+        ))
+        self._seq += len(entries)
+        self._persisted_len += len(entries)
+        self._deltas_since_snapshot += len(entries)
+
+    async def _send(self, kind: str, body: Any | None, request: Awaitable[None]) -> None:
+        start = time.perf_counter()
+        try:
+            await request
+        except MemoryDeltaUnsupportedError:
+            raise
+        except Exception:
+            MEMORY_FLUSHES.labels(self._agent_name, kind, "error").inc()
+            raise
+        finally:
+            MEMORY_FLUSH_LATENCY.labels(self._agent_name).observe(time.perf_counter() - start)
+        MEMORY_FLUSHES.labels(self._agent_name, kind, "success").inc()
+        if body is not None:
+            # Only small delta bodies are measured; encoding a whole snapshot again
+            # would repeat the O(n) work deltas exist to avoid
+            MEMORY_FLUSH_BYTES.labels(self._agent_name, kind).inc(
+                len(json.dumps(body, ensure_ascii=False, default=str).encode("utf-8"))
+            )
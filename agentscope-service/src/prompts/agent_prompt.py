@@ -1,9 +1,39 @@
 from __future__ import annotations
 
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from types import MappingProxyType
+from typing import Any
 
+from prometheus_client import Counter, Gauge, Histogram
 
+from src.config.settings import settings
+
+PROMPT_CACHE_REQUESTS = Counter(
+    "agentscope_compiled_prompt_requests_total",
+    "Compiled system prompt lookups (hit/revalidated/stale/miss)",
+    ["agent", "result"],
+)
+STAGE_CONFIG_SECONDS = Histogram(
+    "agentscope_stage_config_load_seconds",
+    "Time spent reading (load) and parsing/validating (parse) the orchestrator stage config",
+    ["phase"],
+)
+STAGE_CONFIG_VERSION = Gauge(
+    "agentscope_stage_config_version",
+    "Version of the orchestrator stage config currently in effect",
+)
+STAGE_CONFIG_ERRORS = Counter(
+    "agentscope_stage_config_errors_total",
+    "Stage config entries rejected by validation and replaced by defaults",
+)
+
+
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
     # agentscope-service/src/prompts/agent_prompt.py -> After-sales/
     return Path(__file__).resolve().parents[3]
@@ -51,9 +81,7 @@ def load_agent_stage_prompts(agent_name: str, stages: Iterable[str]) -> list[str
     return prompts
 
 
-def build_agent_prompt(base_prompt: str, agent_name: str, metadata: dict | None) -> str:
-    if not metadata:
-        return base_prompt
+def _prompt_stages(metadata: dict) -> tuple[str, ...]:
     stages: list[str] = []
     stage = metadata.get("prompt_stage")
     if stage:
@@ -61,15 +89,312 @@ def build_agent_prompt(base_prompt: str, agent_name: str, metadata: dict | None)
     extra_stages = metadata.get("prompt_stages")
     if isinstance(extra_stages, list):
         stages.extend([str(s) for s in extra_stages if s])
+    return tuple(s.strip() for s in stages if s.strip())
+
+
+def _mtime(path: Path) -> float | None:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return None
+
+
+@dataclass
+class _CompiledPrompt:
+    text: str
+    paths: tuple[Path, ...]
+    signature: tuple[float | None, ...]
+    checked_at: float
+
+
+class CompiledPromptCache:
+    """
+    LRU of assembled system prompts keyed by (agent, base prompt, ordered stages).
+
+    Stage files are only re-stat'ed once an entry is older than
+    ``revalidate_after`` seconds, so most calls are a dictionary lookup.
+    With ``revalidate_after=None`` entries stay valid until ``invalidate``.
+    """
+
+    def __init__(self, max_size: int = 256, revalidate_after: float | None = 2.0) -> None:
+        self._max_size = max_size
+        self.revalidate_after = revalidate_after
+        self._entries: OrderedDict[tuple[str, str, str, tuple[str, ...]], _CompiledPrompt] = (
+            OrderedDict()
+        )
 
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def build(self, base_prompt: str, agent_name: str, stages: tuple[str, ...]) -> str:
+        root = _agents_prompt_root()
+        key = (str(root), agent_name, base_prompt, stages)
+        entry = self._entries.get(key)
+        result = "miss"
+        if entry is not None:
+            result = "hit"
+            now = time.monotonic()
+            if self.revalidate_after is not None and now - entry.checked_at >= self.revalidate_after:
+                if tuple(_mtime(path) for path in entry.paths) == entry.signature:
+                    entry.checked_at = now
+                    result = "revalidated"
+                else:
+                    entry = None
+                    result = "stale"
+        if entry is None:
+            entry = self._compile(root, base_prompt, agent_name, stages)
+            self._entries[key] = entry
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        self._entries.move_to_end(key)
+        PROMPT_CACHE_REQUESTS.labels(agent_name, result).inc()
+        return entry.text
+
+    def invalidate(self, agent_name: str | None = None) -> None:
+        """Drop compiled prompts of one agent, or all of them."""
+        if agent_name is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k[1] == agent_name]:
+            del self._entries[key]
+
+    @staticmethod
+    def _compile(
+        root: Path, base_prompt: str, agent_name: str, stages: tuple[str, ...]
+    ) -> _CompiledPrompt:
+        paths = tuple(root / agent_name / f"{stage}.md" for stage in stages)
+        # Stat before reading so a concurrent edit is caught on the next revalidation
+        signature = tuple(_mtime(path) for path in paths)
+        stage_prompts = load_agent_stage_prompts(agent_name, stages)
+        text = base_prompt
+        if stage_prompts:
+            text = f"{base_prompt}\n\n【场景提示词】\n" + "\n\n".join(stage_prompts)
+        return _CompiledPrompt(text, paths, signature, time.monotonic())
+
+
+compiled_prompts = CompiledPromptCache(
+    max_size=settings.prompt_cache_size,
+    revalidate_after=settings.prompt_revalidate_after,
+)
+
+
+def build_agent_prompt(base_prompt: str, agent_name: str, metadata: dict | None) -> str:
+    if not metadata:
+        return base_prompt
+    stages = _prompt_stages(metadata)
     if not stages:
         return base_prompt
+    return compiled_prompts.build(base_prompt, agent_name, stages)
+
+
+DEFAULT_STAGE_CONFIG: dict[str, Any] = {
+    "assistant": {
+        "default": "reply",
+        "complaint": "handoff",
+        "high_risk": "risk_alert",
+        "fault": "fault_reply",
+        "vip": "vip_reply",
+        "clarify": "clarify",
+    },
+    "engineer": {
+        "parallel": ["diagnosis", "severity", "escalation", "report_summary"],
+    },
+    "inspector": {
+        "quality": ["quality_report", "follow_up", "report_summary"],
+    },
+}
+
+
+@dataclass(frozen=True)
+class StageConfig:
+    """
+    Validated orchestrator stage config.
+
+    ``version`` increases whenever a reload changes the effective config.
+    Invalid entries are replaced by ``DEFAULT_STAGE_CONFIG`` and listed in
+    ``errors``.
+    """
+
+    version: int
+    assistant: Mapping[str, str]
+    engineer_parallel: tuple[str, ...]
+    inspector_quality: tuple[str, ...]
+    raw: Mapping[str, Any]
+    source: str
+    load_seconds: float
+    parse_seconds: float
+    errors: tuple[str, ...] = ()
+
+    def assistant_stage(self, key: str) -> str:
+        return self.assistant.get(key) or DEFAULT_STAGE_CONFIG["assistant"][key]
+
+    def _effective(self) -> tuple:
+        return (tuple(sorted(self.assistant.items())), self.engineer_parallel, self.inspector_quality)
+
+
+def _stage_list(section: Any, name: str, key: str, errors: list[str]) -> tuple[str, ...]:
+    fallback = tuple(DEFAULT_STAGE_CONFIG[name][key])
+    if section is None:
+        return fallback
+    if not isinstance(section, dict):
+        errors.append(f"{name}: expected a mapping")
+        return fallback
+    stages = section.get(key)
+    if stages is None:
+        return fallback
+    if not isinstance(stages, list) or not stages:
+        errors.append(f"{name}.{key}: expected a non-empty list")
+        return fallback
+    if not all(isinstance(stage, str) and stage.strip() for stage in stages):
+        errors.append(f"{name}.{key}: stages must be non-empty strings")
+        return fallback
+    return tuple(stage.strip() for stage in stages)
+
+
+def validate_stage_config(data: Any) -> tuple[dict[str, Any], list[str]]:
+    """Normalize parsed stage config against the schema of ``DEFAULT_STAGE_CONFIG``."""
+    errors: list[str] = []
+    if not isinstance(data, dict):
+        errors.append("stage config: expected a mapping")
+        data = {}
+
+    assistant = dict(DEFAULT_STAGE_CONFIG["assistant"])
+    section = data.get("assistant")
+    if isinstance(section, dict):
+        for key, stage in section.items():
+            if isinstance(stage, str) and stage.strip():
+                assistant[str(key)] = stage.strip()
+            else:
+                errors.append(f"assistant.{key}: expected a stage name")
+    elif section is not None:
+        errors.append("assistant: expected a mapping")
+
+    return {
+        "assistant": assistant,
+        "engineer": {
+            "parallel": list(_stage_list(data.get("engineer"), "engineer", "parallel", errors)),
+        },
+        "inspector": {
+            "quality": list(_stage_list(data.get("inspector"), "inspector", "quality", errors)),
+        },
+    }, errors
+
+
+def _read_stage_config_sources(base: Path) -> list[tuple[str, str]]:
+    sources: list[tuple[str, str]] = []
+    for kind, filename in (("yaml", "stage_config.yaml"), ("markdown", "stage_config.md")):
+        path = base / filename
+        if path.exists():
+            sources.append((kind, path.read_text(encoding="utf-8")))
+    return sources
+
+
+def _parse_stage_config_source(kind: str, raw: str) -> dict | None:
+    if kind == "yaml":
+        return _parse_simple_yaml(raw)
+    text = _extract_prompt(raw)
+    if not text:
+        return None
+    try:
+        import json
+        data = json.loads(text)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else None
+
+
+@dataclass
+class _StageConfigEntry:
+    base: str
+    config: StageConfig
+    signature: tuple[float | None, ...]
+    checked_at: float
+
+
+class StageConfigCache:
+    """
+    Validated orchestrator stage config, re-read only when its files change.
+
+    Uses the same ``revalidate_after`` rules as ``CompiledPromptCache``, so
+    every ``route()`` shares one parsed ``StageConfig`` until the file moves on.
+    """
+
+    def __init__(self, revalidate_after: float | None = 2.0) -> None:
+        self.revalidate_after = revalidate_after
+        self._entry: _StageConfigEntry | None = None
+        self._version = 0
+        self._last: StageConfig | None = None
+
+    def get(self) -> StageConfig:
+        base = _agents_prompt_root() / "orchestrator"
+        entry = self._entry
+        now = time.monotonic()
+        if entry is not None and entry.base == str(base):
+            if self.revalidate_after is None or now - entry.checked_at < self.revalidate_after:
+                return entry.config
+            if self._signature(base) == entry.signature:
+                entry.checked_at = now
+                return entry.config
+        signature = self._signature(base)
+        config = self._load(base)
+        self._entry = _StageConfigEntry(str(base), config, signature, now)
+        return config
+
+    def load(self) -> dict:
+        return dict(self.get().raw)
+
+    def invalidate(self) -> None:
+        self._entry = None
+
+    def _load(self, base: Path) -> StageConfig:
+        started = time.perf_counter()
+        sources = _read_stage_config_sources(base)
+        loaded = time.perf_counter()
+        kind, data = "default", {}
+        for source_kind, raw in sources:
+            candidate = _parse_stage_config_source(source_kind, raw)
+            if candidate is not None:
+                kind, data = source_kind, candidate
+                break
+        normalized, errors = validate_stage_config(data)
+        parsed = time.perf_counter()
+        STAGE_CONFIG_SECONDS.labels("load").observe(loaded - started)
+        STAGE_CONFIG_SECONDS.labels("parse").observe(parsed - loaded)
+        if errors:
+            STAGE_CONFIG_ERRORS.inc(len(errors))
+            print(f"[AgentScope] Invalid stage config entries replaced by defaults: {'; '.join(errors)}")
+
+        config = StageConfig(
+            version=self._version,
+            assistant=MappingProxyType(normalized["assistant"]),
+            engineer_parallel=tuple(normalized["engineer"]["parallel"]),
+            inspector_quality=tuple(normalized["inspector"]["quality"]),
+            raw=MappingProxyType(data),
+            source=kind,
+            load_seconds=loaded - started,
+            parse_seconds=parsed - loaded,
+            errors=tuple(errors),
+        )
+        if self._last is None or self._last._effective() != config._effective():
+            self._version += 1
+            config = replace(config, version=self._version)
+            STAGE_CONFIG_VERSION.set(self._version)
+        else:
+            config = replace(config, version=self._last.version)
+        self._last = config
+        return config
+
+    @staticmethod
+    def _signature(base: Path) -> tuple[float | None, ...]:
+        return (_mtime(base / "stage_config.yaml"), _mtime(base / "stage_config.md"))
+
+
+stage_configs = StageConfigCache(revalidate_after=settings.prompt_revalidate_after)
 
-    stage_prompts = load_agent_stage_prompts(agent_name, stages)
-    if not stage_prompts:
-        return base_prompt
 
-    return f"{base_prompt}\n\n【场景提示词】\n" + "\n\n".join(stage_prompts)
+def load_stage_config() -> StageConfig:
+    """Current validated stage config; cheap enough to call per request."""
+    return stage_configs.get()
 
 
 def load_agent_stage_config() -> dict:
@@ -77,25 +402,9 @@ def load_agent_stage_config() -> dict:
     Load orchestrator stage config from YAML or Markdown.
     YAML path: docs/prompts/agents/orchestrator/stage_config.yaml
     Markdown fallback: docs/prompts/agents/orchestrator/stage_config.md (```prompt block)
+    Returns the parsed file as-is; prefer ``load_stage_config`` for validated values.
     """
-    base = _agents_prompt_root() / "orchestrator"
-    yaml_path = base / "stage_config.yaml"
-    if yaml_path.exists():
-        raw = yaml_path.read_text(encoding="utf-8")
-        parsed = _parse_simple_yaml(raw)
-        if isinstance(parsed, dict):
-            return parsed
-
-    md_raw = load_agent_stage_prompt("orchestrator", "stage_config")
-    if md_raw:
-        try:
-            import json
-            data = json.loads(md_raw)
-            if isinstance(data, dict):
-                return data
-        except Exception:
-            return {}
-    return {}
+    return stage_configs.load()
 
 
 def _parse_simple_yaml(raw: str) -> dict | None:
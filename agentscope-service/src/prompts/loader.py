@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Tuple
 
+from src.config.settings import settings
 
+
+@lru_cache(maxsize=1)
 def _repo_root() -> Path:
     # agentscope-service/src/prompts/loader.py -> After-sales/
     return Path(__file__).resolve().parents[3]
@@ -37,22 +42,50 @@ def load_prompt(filename: str, fallback: Optional[str] = None) -> str:
 
 
 class PromptRegistry:
-    def __init__(self) -> None:
-        self._cache: Dict[str, Tuple[float, str]] = {}
+    """
+    Cache of base prompts with mtime-based hot reload.
+
+    A cached prompt is trusted without touching the filesystem for
+    ``revalidate_after`` seconds after its last check (``None``: until
+    ``invalidate``).
+    """
+
+    def __init__(self, revalidate_after: Optional[float] = 0.0) -> None:
+        self.revalidate_after = revalidate_after
+        # path -> (mtime or None when missing, text, last checked)
+        self._cache: Dict[str, Tuple[Optional[float], str, float]] = {}
 
     def get(self, filename: str, fallback: Optional[str] = None) -> str:
         prompt_path = _prompt_root() / filename
-        if not prompt_path.exists():
-            return fallback or ""
+        key = str(prompt_path)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached and (
+            self.revalidate_after is None or now - cached[2] < self.revalidate_after
+        ):
+            return cached[1] if cached[0] is not None else fallback or ""
 
-        mtime = prompt_path.stat().st_mtime
-        cached = self._cache.get(filename)
+        try:
+            mtime: Optional[float] = prompt_path.stat().st_mtime
+        except OSError:
+            mtime = None
+        if mtime is None:
+            self._cache[key] = (None, "", now)
+            return fallback or ""
         if cached and cached[0] == mtime:
+            self._cache[key] = (mtime, cached[1], now)
             return cached[1]
 
         text = load_prompt(filename, fallback)
-        self._cache[filename] = (mtime, text)
+        self._cache[key] = (mtime, text, now)
         return text
 
+    def invalidate(self, filename: Optional[str] = None) -> None:
+        """Forget one prompt (by filename relative to docs/prompts), or all of them."""
+        if filename is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(str(_prompt_root() / filename), None)
+
 
-prompt_registry = PromptRegistry()
+prompt_registry = PromptRegistry(revalidate_after=settings.prompt_revalidate_after)
@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+import time
+from collections.abc import Iterable
+from pathlib import Path
+
+from prometheus_client import Counter, Gauge
+
+from src.prompts.agent_prompt import _agents_prompt_root, compiled_prompts, stage_configs
+from src.prompts.loader import _prompt_root, prompt_registry
+
+PROMPT_RELOADS = Counter(
+    "agentscope_prompt_reloads_total",
+    "Prompt file changes picked up by the prompt watcher",
+    ["backend"],
+)
+PROMPT_LAST_RELOAD = Gauge(
+    "agentscope_prompt_last_reload_timestamp_seconds",
+    "Unix time of the last prompt reload triggered by the prompt watcher",
+)
+
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None
+    return libc
+
+
+class _Inotify:
+    """Recursive directory watch on top of the raw inotify syscalls."""
+
+    def __init__(self, libc: ctypes.CDLL, root: Path) -> None:
+        self._libc = libc
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: dict[int, Path] = {}
+        try:
+            self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def add_tree(self, root: Path) -> None:
+        for dirpath, _dirnames, _filenames in os.walk(root):
+            self._add(Path(dirpath))
+
+    def _add(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self._dirs[wd] = path
+
+    def read(self) -> tuple[set[Path], bool]:
+        """Drain pending events; returns changed paths and whether the queue overflowed."""
+        changed: set[Path] = set()
+        overflow = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0")
+                offset += length
+                if mask & _IN_Q_OVERFLOW:
+                    overflow = True
+                    continue
+                directory = self._dirs.get(wd)
+                if mask & _IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                if directory is None:
+                    continue
+                path = directory / os.fsdecode(name) if name else directory
+                changed.add(path)
+                if mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    with contextlib.suppress(OSError):
+                        self.add_tree(path)
+        return changed, overflow
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def _snapshot(root: Path) -> dict[Path, float]:
+    mtimes: dict[Path, float] = {}
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = Path(dirpath) / filename
+            with contextlib.suppress(OSError):
+                mtimes[path] = path.stat().st_mtime
+    return mtimes
+
+
+class PromptWatcher:
+    """
+    Push prompt file changes under ``docs/prompts/agents`` into the prompt caches.
+
+    Uses inotify on Linux and falls back to polling mtimes every
+    ``poll_interval`` seconds elsewhere (or with ``backend="poll"``). While
+    running, ``prompt_registry``, ``compiled_prompts`` and ``stage_configs``
+    stop re-stat'ing files on their own (``revalidate_after=None``), so
+    steady-state prompt lookups touch no filesystem at all.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        backend: str = "auto",
+        poll_interval: float = 1.0,
+        debounce: float = 0.05,
+    ) -> None:
+        self._root = root
+        self._requested_backend = backend
+        self._poll_interval = poll_interval
+        self._debounce = debounce
+        self.backend: str | None = None
+        self.reload_count = 0
+        self.last_reload_at: float | None = None
+        self._task: asyncio.Task[None] | None = None
+        self._inotify: _Inotify | None = None
+        self._saved_revalidate: tuple[float | None, float | None, float | None] | None = None
+
+    @property
+    def root(self) -> Path:
+        return self._root or _agents_prompt_root()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> dict[str, object]:
+        return {
+            "backend": self.backend if self.running else None,
+            "reloads": self.reload_count,
+            "lastReloadAt": self.last_reload_at,
+        }
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._task = None
+        root = self.root
+        if not root.is_dir():
+            print(f"[AgentScope] Prompt watcher disabled: {root} does not exist")
+            return
+        if self._requested_backend in ("auto", "inotify"):
+            libc = _load_libc()
+            if libc is not None:
+                try:
+                    self._inotify = _Inotify(libc, root)
+                except OSError as exc:
+                    print(f"[AgentScope] inotify unavailable, polling prompts instead: {exc}")
+            if self._inotify is not None:
+                self.backend = "inotify"
+                self._task = asyncio.ensure_future(self._run_inotify(self._inotify))
+        if self._task is None:
+            self.backend = "poll"
+            snapshot = await asyncio.to_thread(_snapshot, root)
+            self._task = asyncio.ensure_future(self._run_poll(root, snapshot))
+        self._suspend_revalidation()
+        # Anything read before the watch was in place may already be stale
+        self.invalidate_all()
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._restore_revalidation()
+
+    def reload(self, paths: Iterable[Path]) -> None:
+        """Invalidate every cached prompt derived from ``paths``."""
+        prompt_root = _prompt_root()
+        agents_root = self.root
+        everything = False
+        for path in paths:
+            try:
+                relative = path.relative_to(agents_root)
+            except ValueError:
+                continue
+            if not relative.parts:
+                everything = True
+                break
+            with contextlib.suppress(ValueError):
+                prompt_registry.invalidate(path.relative_to(prompt_root).as_posix())
+            agent_name = relative.parts[0]
+            if len(relative.parts) == 1:
+                # The agent directory itself was created, moved or removed
+                prompt_registry.invalidate()
+            compiled_prompts.invalidate(agent_name)
+            if agent_name == "orchestrator":
+                stage_configs.invalidate()
+        if everything:
+            self.invalidate_all()
+        self.reload_count += 1
+        self.last_reload_at = time.time()
+        PROMPT_RELOADS.labels(self.backend or "manual").inc()
+        PROMPT_LAST_RELOAD.set(self.last_reload_at)
+
+    @staticmethod
+    def invalidate_all() -> None:
+        prompt_registry.invalidate()
+        compiled_prompts.invalidate()
+        stage_configs.invalidate()
+
+    async def _run_inotify(self, inotify: _Inotify) -> None:
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        loop.add_reader(inotify.fd, ready.set)
+        try:
+            while True:
+                await ready.wait()
+                # Editors write in several steps; let them finish before reloading
+                await asyncio.sleep(self._debounce)
+                ready.clear()
+                changed, overflow = inotify.read()
+                if overflow:
+                    self.invalidate_all()
+                    changed.add(self.root)
+                if changed:
+                    self.reload(changed)
+        finally:
+            loop.remove_reader(inotify.fd)
+
+    async def _run_poll(self, root: Path, snapshot: dict[Path, float]) -> None:
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            current = await asyncio.to_thread(_snapshot, root)
+            changed = {
+                path
+                for path in current.keys() | snapshot.keys()
+                if current.get(path) != snapshot.get(path)
+            }
+            snapshot = current
+            if changed:
+                self.reload(changed)
+
+    def _suspend_revalidation(self) -> None:
+        if self._saved_revalidate is None:
+            self._saved_revalidate = (
+                prompt_registry.revalidate_after,
+                compiled_prompts.revalidate_after,
+                stage_configs.revalidate_after,
+            )
+        prompt_registry.revalidate_after = None
+        compiled_prompts.revalidate_after = None
+        stage_configs.revalidate_after = None
+
+    def _restore_revalidation(self) -> None:
+        if self._saved_revalidate is None:
+            return
+        (
+            prompt_registry.revalidate_after,
+            compiled_prompts.revalidate_after,
+            stage_configs.revalidate_after,
+        ) = self._saved_revalidate
+        self._saved_revalidate = None
@@ -18,19 +18,32 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any
+from collections.abc import Coroutine, Mapping
+from typing import Any, TypeVar
 import time
 
 from agentscope.message import Msg
 from agentscope.pipeline import MsgHub
+from prometheus_client import Counter
 
 from src.agents.assistant_agent import AssistantAgent
 from src.agents.engineer_agent import EngineerAgent
+from src.agents.handoff import HandoffCapacityError
 from src.agents.human_agent_adapter import HumanAgentAdapter
-from src.tools.mcp_tools import BackendMCPClient
+from src.agents.streaming import HeldStream, detachable_stream, with_stream
+from src.config.settings import settings
+from src.heuristics import (
+    complexity_score,
+    extract_routing_features_async,
+    routing_keywords,
+    scenario_of,
+)
+from src.tools.deadline import budget, check_deadline, detached_context
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
 from src.tools.persistence import PersistenceClient
 from src.prompts.loader import prompt_registry
-from src.prompts.agent_prompt import load_agent_stage_config
+from src.prompts.agent_prompt import StageConfig, load_stage_config
+from src.router.speculation import SpeculativeReply
 
 
 ORCHESTRATOR_AGENT_PROMPT = prompt_registry.get(
@@ -67,22 +80,21 @@ JSON格式：
 """,
 )
 
-_DEFAULT_STAGE_CONFIG: dict[str, Any] = {
-    "assistant": {
-        "default": "reply",
-        "complaint": "handoff",
-        "high_risk": "risk_alert",
-        "fault": "fault_reply",
-        "vip": "vip_reply",
-        "clarify": "clarify",
-    },
-    "engineer": {
-        "parallel": ["diagnosis", "severity", "escalation", "report_summary"],
-    },
-    "inspector": {
-        "quality": ["quality_report", "follow_up", "report_summary"],
-    },
-}
+ROUTING_DECISIONS = Counter(
+    "agentscope_routing_decisions_total",
+    "Execution mode decisions by the tier that made them (explicit/local/remote)",
+    ["tier", "mode"],
+)
+
+PARALLEL_AGENT_RESULTS = Counter(
+    "agentscope_parallel_agent_results_total",
+    "Parallel-mode agent outcomes at the aggregation deadline (ok/error/late)",
+    ["agent", "outcome"],
+)
+
+_REQUESTABLE_MODES = ("agent_auto", "agent_supervised", "human_first")
+
+_T = TypeVar("_T")
 
 
 class OrchestratorAgent:
@@ -114,6 +126,8 @@ class OrchestratorAgent:
         self.mcp_client = mcp_client
         self.persistence = persistence
         self.ws_manager = ws_manager
+        # 仍在后台运行的迟到Agent（并行模式部分结果返回后）
+        self._background: set[asyncio.Future[None]] = set()
 
     async def route(self, user_msg: Msg) -> Msg:
         """
@@ -124,17 +138,32 @@ class OrchestratorAgent:
         2. 选择执行模式（Simple/Chain/Team/Supervised）
         3. 执行并返回结果
         """
-        # Step 1: 请求分析
-        analysis = await self._analyze_request(user_msg)
+        # Step 1-2: 分层决策（本地特征足以决定时跳过远程分析）
+        local = await self._local_analysis(user_msg)
+        speculation = self._speculate(user_msg, local)
+        try:
+            analysis, mode = await self._decide(user_msg, local)
+            if speculation is not None and mode != "simple":
+                # 其他模式会再次调用Assistant或等待人工，投机执行不能与之并行
+                speculation.discard()
+                speculation = None
+            return await self._run_mode(user_msg, analysis, mode, speculation)
+        finally:
+            if speculation is not None:
+                speculation.discard()
+
+    async def _run_mode(
+        self,
+        user_msg: Msg,
+        analysis: dict[str, Any],
+        mode: str,
+        speculation: SpeculativeReply | None = None,
+    ) -> Msg:
+        # 调用方已放弃（超过请求截止时间）时不再启动执行
+        check_deadline("execute")
         metadata = user_msg.metadata or {}
-        requested_mode = metadata.get("mode")
         async_review = bool(metadata.get("async_review"))
 
-        # Step 2: 执行模式决策
-        mode = self._decide_execution_mode(analysis)
-        if requested_mode in ["agent_auto", "agent_supervised", "human_first"]:
-            mode = requested_mode
-
         start = time.time()
         try:
             # Step 3: 根据模式执行
@@ -146,7 +175,7 @@ class OrchestratorAgent:
             elif mode == "agent_supervised":
                 response = await self._agent_supervised_mode(user_msg, analysis, async_review)
             else:  # simple
-                response = await self._execute_simple(user_msg, analysis)
+                response = await self._execute_simple(user_msg, analysis, speculation)
             if self.persistence:
                 await self.persistence.record_agent_call(
                     conversation_id=user_msg.metadata.get("conversationId") if user_msg.metadata else None,
@@ -175,6 +204,67 @@ class OrchestratorAgent:
                 )
             raise
 
+    async def _decide(
+        self, msg: Msg, local: dict[str, Any] | None = None
+    ) -> tuple[dict[str, Any], str]:
+        """
+        分层决策执行模式
+
+        - explicit: 请求已指定 metadata.mode，且结果不依赖远程信号
+        - local: 本地关键词特征已足够（投诉 → human_first，远程信号只可能同样得出human_first）
+        - remote: 其余情况补充情感分析与客户画像后再按规则决策
+        """
+        metadata = msg.metadata or {}
+        requested_mode = metadata.get("mode")
+        if local is None:
+            local = await self._local_analysis(msg)
+
+        fast = self._decide_locally(local, metadata) if settings.routing_fast_path else None
+        if fast is not None:
+            mode, tier = fast
+            analysis = {**local, "sentiment": {}, "customer": {}, "risk_level": "unknown"}
+        else:
+            analysis = {**local, **await self._remote_analysis(msg)}
+            mode = self._decide_execution_mode(analysis)
+            if requested_mode in _REQUESTABLE_MODES:
+                mode = requested_mode
+            tier = "remote"
+
+        analysis["decision_tier"] = tier
+        ROUTING_DECISIONS.labels(tier, mode).inc()
+        return analysis, mode
+
+    def _decide_locally(
+        self, local: dict[str, Any], metadata: dict[str, Any]
+    ) -> tuple[str, str] | None:
+        """远程信号（高风险/负面情绪/VIP）只会把结果推向human_first或改变Assistant阶段"""
+        requested_mode = metadata.get("mode")
+        if requested_mode in _REQUESTABLE_MODES:
+            # human_first不经过Assistant；显式prompt_stage时阶段也不再取决于远程信号
+            if requested_mode == "human_first" or metadata.get("prompt_stage"):
+                return requested_mode, "explicit"
+            return None
+        if local["scenario"] == "complaint":
+            return "human_first", "local"
+        return None
+
+    def _speculate(self, msg: Msg, local: dict[str, Any]) -> SpeculativeReply | None:
+        """
+        投机执行：本地特征显示为简单咨询时，远程分析期间先用默认阶段启动Assistant
+
+        远程信号若改变了模式或阶段，投机结果连同其流式输出一并丢弃；
+        但已发生的工具调用无法撤回，因此默认关闭。
+        """
+        if not settings.speculative_assistant:
+            return None
+        if (msg.metadata or {}).get("mode"):
+            return None
+        if local["scenario"] != "consultation" or local["complexity"] >= 0.4:
+            return None
+        stage = self._decide_assistant_stage(msg, local)
+        clone = self._clone_msg_with_stage(msg, stage)
+        return SpeculativeReply(stage, lambda: self.assistant_agent(clone))
+
     async def _analyze_request(self, msg: Msg) -> dict[str, Any]:
         """
         全面分析请求
@@ -188,45 +278,46 @@ class OrchestratorAgent:
             "risk_level": "low/medium/high"
         }
         """
-        # 并行执行多个分析任务
-        sentiment_task = self._analyze_sentiment(msg)
-        customer_task = self._get_customer_info(msg)
-        complexity_task = asyncio.to_thread(self._analyze_complexity, msg)
-
-        sentiment, customer, complexity = await asyncio.gather(
-            sentiment_task,
-            customer_task,
-            complexity_task,
-            return_exceptions=True,
-        )
+        local, remote = await asyncio.gather(self._local_analysis(msg), self._remote_analysis(msg))
+        return {**local, **remote}
 
-        # 处理异常结果
-        if isinstance(sentiment, Exception):
-            sentiment = {"overallSentiment": "neutral", "riskLevel": "low", "score": 0.7}
-        if isinstance(customer, Exception):
-            customer = {}
-        if isinstance(complexity, Exception):
-            complexity = 0.5
-
-        # 简单启发式判断是否包含需求
-        has_requirement = any(
-            keyword in msg.content for keyword in ["需要", "希望", "想要", "能不能", "可以吗"]
-        )
+    async def _local_analysis(self, msg: Msg) -> dict[str, Any]:
+        """复杂度/场景/需求特征就地一次提取，仅超长消息才交给线程池"""
+        try:
+            features = await extract_routing_features_async(
+                msg.get_text_content(), settings.routing_offload_chars
+            )
+        except Exception:
+            return {"complexity": 0.5, "has_requirement": False, "scenario": "consultation"}
+        return {
+            "complexity": features.complexity,
+            "has_requirement": features.has_requirement,
+            "scenario": features.scenario,
+        }
 
-        # 场景识别
-        scenario = self._identify_scenario(msg, {
-            "complexity": complexity,
-            "sentiment": sentiment,
-            "has_requirement": has_requirement
-        })
+    async def _remote_analysis(self, msg: Msg) -> dict[str, Any]:
+        """情感分析与客户画像合并为一次批量MCP请求"""
+        calls = [self._sentiment_call(msg)]
+        customer_call = self._customer_call(msg)
+        if customer_call:
+            calls.append(customer_call)
+
+        sentiment: Any = {"overallSentiment": "neutral", "riskLevel": "low", "score": 0.7}
+        customer: Any = {}
+        try:
+            results = await self.mcp_client.call_tools_batch(calls)
+        except Exception:
+            results = None
+        if results is not None:
+            if results[0].ok:
+                sentiment = results[0].result
+            if customer_call and results[1].ok:
+                customer = results[1].result
 
         return {
-            "complexity": complexity,
             "sentiment": sentiment,
             "customer": customer,
-            "has_requirement": has_requirement,
             "risk_level": sentiment.get("riskLevel", "low"),
-            "scenario": scenario,
         }
 
     def _identify_scenario(self, msg: Msg, analysis: dict[str, Any]) -> str:
@@ -243,30 +334,7 @@ class OrchestratorAgent:
             - "fault": 故障诊断
             - "complaint": 投诉
         """
-        content = msg.content.lower()
-
-        # 故障关键词
-        fault_keywords = [
-            "报错", "错误", "异常", "崩溃", "无法", "失败",
-            "500", "404", "403", "宕机", "卡顿", "白屏"
-        ]
-
-        # 投诉关键词
-        complaint_keywords = [
-            "投诉", "不满意", "差评", "要求退款", "退款",
-            "质量差", "服务差", "太差", "服务太差", "欺骗"
-        ]
-
-        # 检查故障场景
-        if any(kw in content for kw in fault_keywords):
-            return "fault"
-
-        # 检查投诉场景
-        if any(kw in content for kw in complaint_keywords):
-            return "complaint"
-
-        # 默认：常规咨询
-        return "consultation"
+        return scenario_of(routing_keywords.scan(msg.get_text_content()))
 
     def _decide_execution_mode(self, analysis: dict[str, Any]) -> str:
         """
@@ -312,14 +380,21 @@ class OrchestratorAgent:
         # Rule 7: 其他 → Supervised模式
         return "agent_supervised"
 
-    async def _execute_simple(self, msg: Msg, analysis: dict[str, Any]) -> Msg:
+    async def _execute_simple(
+        self, msg: Msg, analysis: dict[str, Any], speculation: SpeculativeReply | None = None
+    ) -> Msg:
         """
         Simple模式：单Agent直接处理
 
         适用场景：简单咨询、常见问题
         """
         stage = self._decide_assistant_stage(msg, analysis)
-        response = await self.assistant_agent(self._clone_msg_with_stage(msg, stage))
+        if speculation is not None and speculation.stage == stage:
+            response = await speculation.take()
+        else:
+            if speculation is not None:
+                speculation.discard()
+            response = await self.assistant_agent(self._clone_msg_with_stage(msg, stage))
         response.metadata = {
             **(response.metadata or {}),
             "mode": "agent_auto",
@@ -337,54 +412,108 @@ class OrchestratorAgent:
         3. EngineerAgent: 故障诊断 + 知识检索
         4. 聚合两个Agent的结果
         """
-        # 并行执行两个Agent
+        # 并行执行两个Agent，截止时间到达时只取已完成的结果；
+        # 迟到的Agent会在请求结束后继续运行，因此不继承请求截止时间
+        streams = {name: detachable_stream() for name in ("AssistantAgent", "EngineerAgent")}
+        tasks = {
+            "AssistantAgent": self._spawn_detached(
+                self.assistant_agent(self._clone_msg_with_stage(msg, self._decide_assistant_stage(msg, analysis))),
+                streams["AssistantAgent"],
+            ),
+            "EngineerAgent": self._spawn_detached(
+                self.engineer_agent(self._clone_msg_with_stage(msg, "diagnosis", self._engineer_parallel_stages())),
+                streams["EngineerAgent"],
+            ),
+        }
         try:
-            assistant_result, engineer_result = await asyncio.wait_for(
-                asyncio.gather(
-                    self.assistant_agent(self._clone_msg_with_stage(msg, self._decide_assistant_stage(msg, analysis))),
-                    self.engineer_agent(self._clone_msg_with_stage(msg, "diagnosis", self._engineer_parallel_stages())),
-                    return_exceptions=True,
-                ),
-                timeout=20.0  # 20秒超时
-            )
-        except asyncio.TimeoutError:
-            # 超时降级：返回降级回复
-            return Msg(
-                name="Orchestrator",
-                content="抱歉，系统处理超时，已转人工客服处理。",
-                role="assistant",
-                metadata={
-                    **msg.metadata,
-                    "execution_mode": "parallel_timeout",
-                    "confidence": 0.0
-                }
-            )
+            await asyncio.wait(tasks.values(), timeout=budget(settings.parallel_timeout))
+        except asyncio.CancelledError:
+            for task in tasks.values():
+                task.cancel()
+            raise
 
         # 检查结果是否有效
-        agent_results = {}
-        if assistant_result and not isinstance(assistant_result, Exception):
-            agent_results["AssistantAgent"] = assistant_result
-        if engineer_result and not isinstance(engineer_result, Exception):
-            agent_results["EngineerAgent"] = engineer_result
+        agent_results = self._collect_results(tasks)
+        late: list[Any] = [name for name, task in tasks.items() if not task.done()]
+        for name in late:
+            PARALLEL_AGENT_RESULTS.labels(name, "late").inc()
+            # 请求的流式输出即将关闭，迟到Agent的结果改由agent_update推送
+            late_stream = streams[name]
+            if late_stream is not None:
+                late_stream.discard()
+        if late:
+            # 迟到的Agent继续在后台执行，完成后把更新推送到会话
+            self._finish_late(msg, tasks, agent_results)
 
         # 如果没有有效结果，降级处理
         if not agent_results:
             return Msg(
                 name="Orchestrator",
-                content="抱歉，系统暂时无法处理您的问题，已转人工客服处理。",
+                content=(
+                    "抱歉，系统处理超时，已转人工客服处理。"
+                    if late
+                    else "抱歉，系统暂时无法处理您的问题，已转人工客服处理。"
+                ),
                 role="assistant",
                 metadata={
                     **msg.metadata,
-                    "execution_mode": "parallel_failed",
+                    "execution_mode": "parallel_timeout" if late else "parallel_failed",
+                    "pending_agents": late,
                     "confidence": 0.0
                 }
             )
 
-        # 聚合结果
+        # 聚合已完成的结果
         aggregated_result = await self._aggregate_results(agent_results, msg)
-
+        if late:
+            aggregated_result.metadata = {
+                **(aggregated_result.metadata or {}),
+                "execution_mode": "parallel_partial",
+                "pending_agents": late,
+            }
         return aggregated_result
 
+    @staticmethod
+    def _spawn_detached(
+        coro: Coroutine[Any, Any, _T], stream: HeldStream | None = None
+    ) -> asyncio.Future[_T]:
+        """可在请求结束后继续运行的任务：不受请求截止时间约束，只写入可切断的stream"""
+        context = with_stream(detached_context(), stream)
+        return context.run(asyncio.ensure_future, coro)
+
+    @staticmethod
+    def _collect_results(tasks: Mapping[str, asyncio.Future[Msg]]) -> dict[str, Msg]:
+        results = {}
+        for name, task in tasks.items():
+            if not task.done():
+                continue
+            if task.cancelled() or task.exception() is not None or not task.result():
+                PARALLEL_AGENT_RESULTS.labels(name, "error").inc()
+                continue
+            PARALLEL_AGENT_RESULTS.labels(name, "ok").inc()
+            results[name] = task.result()
+        return results
+
+    def _finish_late(
+        self, msg: Msg, tasks: Mapping[str, asyncio.Future[Msg]], early_results: dict[str, Msg]
+    ) -> None:
+        pending = {name: task for name, task in tasks.items() if not task.done()}
+
+        async def finish() -> None:
+            await asyncio.wait(pending.values())
+            late_results = self._collect_results(pending)
+            if not late_results:
+                return
+            updated = await self._aggregate_results({**early_results, **late_results}, msg)
+            updated.metadata = {**(updated.metadata or {}), "execution_mode": "parallel_late"}
+            await self._send_late_result_to_frontend(msg, updated, list(late_results))
+
+        task = self._spawn_detached(finish())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        # 后台任务的异常只能在这里消化，不能影响已返回的回复
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
     async def _aggregate_results(
         self,
         agent_results: dict[str, Msg],
@@ -565,16 +694,23 @@ class OrchestratorAgent:
         3. 人工处理
         """
         # 搜索相关知识作为建议
-        suggestions = []
-        try:
-            suggestions = await self.mcp_client.call_tool(
-                "searchKnowledge",
-                query=msg.content,
-                filters={"category": "faq"},
-                mode="semantic",
-            )
-        except Exception:
-            suggestions = []
+        async def search_knowledge() -> Any:
+            try:
+                return await self.mcp_client.call_tool(
+                    "searchKnowledge",
+                    query=msg.content,
+                    filters={"category": "faq"},
+                    mode="semantic",
+                )
+            except Exception:
+                return []
+
+        if analysis and analysis.get("decision_tier") in ("local", "explicit"):
+            # 快速路径跳过了远程分析：决策不再依赖它，但人工仍需要客户画像与风险等级
+            suggestions, remote = await asyncio.gather(search_knowledge(), self._remote_analysis(msg))
+            analysis = {**analysis, **remote}
+        else:
+            suggestions = await search_knowledge()
 
         # 如果有分析结果，也作为上下文提供
         context = {}
@@ -601,6 +737,9 @@ class OrchestratorAgent:
                 },
             )
 
+        if settings.human_handoff_async:
+            return await self._human_first_pending(msg)
+
         # 人工处理
         response = await self.human_agent(msg)
         response.metadata = {
@@ -610,70 +749,110 @@ class OrchestratorAgent:
         }
         return response
 
+    async def _human_first_pending(self, msg: Msg) -> Msg:
+        """
+        异步人工处理：不占用请求等待人工
+
+        立即返回pending回复，人工输入到达（或超时）后再推送到会话
+        """
+
+        async def resume(handoff_id: str, item: dict[str, Any] | None) -> None:
+            await self._send_human_response_to_frontend(msg, handoff_id, item)
+
+        metadata: dict[str, Any] = {
+            **(msg.metadata or {}),
+            "mode": "human_first",
+            "needs_review": True,
+        }
+        try:
+            handoff_id = await self.human_agent.request_async(
+                msg, resume, ttl=settings.human_handoff_timeout
+            )
+        except HandoffCapacityError:
+            metadata["execution_mode"] = "human_first_queue_full"
+            return Msg(
+                name="Orchestrator",
+                content="当前人工客服繁忙，稍后由客服跟进。",
+                role="assistant",
+                metadata=metadata,
+            )
+        metadata["execution_mode"] = "human_first_pending"
+        metadata["handoff_id"] = handoff_id
+        return Msg(
+            name="Orchestrator",
+            content="已转人工处理，客服回复后将在会话中推送。",
+            role="assistant",
+            metadata=metadata,
+        )
+
     def _clone_msg_with_stage(self, msg: Msg, stage: str, stages: list[str] | None = None) -> Msg:
         metadata = {**(msg.metadata or {})}
         metadata.setdefault("prompt_stage", stage)
         if stages:
             metadata.setdefault("prompt_stages", stages)
-        return Msg(
+        clone = Msg(
             name=msg.name,
             content=msg.content,
             role=msg.role,
             metadata=metadata,
         )
+        # 保留原消息id，避免被丢弃的投机执行在记忆中留下重复消息
+        clone.id = msg.id
+        return clone
 
     def _decide_assistant_stage(self, msg: Msg, analysis: dict[str, Any]) -> str:
-        cfg = self._load_stage_config().get("assistant", _DEFAULT_STAGE_CONFIG["assistant"])
+        cfg = self._load_stage_config()
         if analysis.get("risk_level") == "high":
-            return cfg.get("high_risk", "risk_alert")
+            return cfg.assistant_stage("high_risk")
         if analysis.get("customer", {}).get("vip") or analysis.get("customer", {}).get("isVIP"):
-            return cfg.get("vip", "vip_reply")
+            return cfg.assistant_stage("vip")
         if analysis.get("scenario") == "complaint":
-            return cfg.get("complaint", "handoff")
+            return cfg.assistant_stage("complaint")
         if analysis.get("scenario") == "fault":
-            return cfg.get("fault", "fault_reply")
+            return cfg.assistant_stage("fault")
         if analysis.get("has_requirement") and analysis.get("complexity", 0.0) >= 0.6:
-            return cfg.get("clarify", "clarify")
-        return cfg.get("default", "reply")
+            return cfg.assistant_stage("clarify")
+        return cfg.assistant_stage("default")
 
     def _engineer_parallel_stages(self) -> list[str]:
-        cfg = self._load_stage_config().get("engineer", _DEFAULT_STAGE_CONFIG["engineer"])
-        stages = cfg.get("parallel", ["diagnosis", "severity", "escalation", "report_summary"])
-        return stages if isinstance(stages, list) and stages else ["diagnosis"]
+        return list(self._load_stage_config().engineer_parallel)
 
     def _inspector_quality_stages(self) -> list[str]:
-        cfg = self._load_stage_config().get("inspector", _DEFAULT_STAGE_CONFIG["inspector"])
-        stages = cfg.get("quality", ["quality_report", "follow_up", "report_summary"])
-        return stages if isinstance(stages, list) and stages else ["quality_report"]
+        return list(self._load_stage_config().inspector_quality)
 
-    def _load_stage_config(self) -> dict[str, Any]:
-        data = load_agent_stage_config()
-        return data if isinstance(data, dict) and data else _DEFAULT_STAGE_CONFIG
+    def _load_stage_config(self) -> StageConfig:
+        return load_stage_config()
 
     # ========== 辅助方法 ==========
 
+    def _sentiment_call(self, user_msg: Msg) -> ToolCall:
+        return ToolCall("analyzeConversation", {
+            "conversationId": user_msg.metadata.get("conversationId", user_msg.id),
+            "context": "quality",
+            "includeHistory": True,
+        })
+
+    def _customer_call(self, user_msg: Msg) -> ToolCall | None:
+        customer_id = user_msg.metadata.get("customerId")
+        if not customer_id:
+            return None
+        return ToolCall("getCustomerProfile", {"customerId": customer_id})
+
     async def _analyze_sentiment(self, user_msg: Msg) -> dict[str, Any]:
         """情感分析"""
+        call = self._sentiment_call(user_msg)
         try:
-            return await self.mcp_client.call_tool(
-                "analyzeConversation",
-                conversationId=user_msg.metadata.get("conversationId", user_msg.id),
-                context="quality",
-                includeHistory=True,
-            )
+            return await self.mcp_client.call_tool(call.name, **call.arguments)
         except Exception:
             return {"overallSentiment": "neutral", "riskLevel": "low", "score": 0.7}
 
     async def _get_customer_info(self, user_msg: Msg) -> dict[str, Any]:
         """获取客户画像"""
-        customer_id = user_msg.metadata.get("customerId")
-        if not customer_id:
+        call = self._customer_call(user_msg)
+        if call is None:
             return {}
         try:
-            return await self.mcp_client.call_tool(
-                "getCustomerProfile",
-                customerId=customer_id,
-            )
+            return await self.mcp_client.call_tool(call.name, **call.arguments)
         except Exception:
             return {}
 
@@ -687,21 +866,7 @@ class OrchestratorAgent:
         - 关键词密度
         """
         content = user_msg.content
-        words = len(content.split())
-
-        # 基础复杂度（基于长度）
-        base_complexity = min(1.0, words / 240)
-
-        # 问题数量（多问题提升复杂度）
-        question_count = content.count("?") + content.count("？")
-        question_factor = min(0.3, question_count * 0.1)
-
-        # 复杂关键词
-        complex_keywords = ["为什么", "怎么办", "如何", "能否", "可以吗"]
-        complex_keyword_count = sum(1 for kw in complex_keywords if kw in content)
-        keyword_factor = min(0.2, complex_keyword_count * 0.1)
-
-        return min(1.0, base_complexity + question_factor + keyword_factor)
+        return complexity_score(content, routing_keywords.scan(content))
 
     async def _send_suggestions_to_frontend(
         self, msg: Msg, suggestions: Any, context: dict[str, Any] | None = None
@@ -740,6 +905,43 @@ class OrchestratorAgent:
             },
         )
 
+    async def _send_late_result_to_frontend(
+        self, msg: Msg, updated: Msg, agents: list[str]
+    ) -> None:
+        """推送迟到Agent完成后的聚合结果到前端"""
+        conversation_id = (msg.metadata or {}).get("conversationId", "default")
+        if not self.ws_manager:
+            return
+
+        await self.ws_manager.send_to_client(
+            conversation_id,
+            {
+                "type": "agent_update",
+                "agents": agents,
+                "content": updated.content,
+                "metadata": updated.metadata,
+            },
+        )
+
+    async def _send_human_response_to_frontend(
+        self, msg: Msg, handoff_id: str, item: dict[str, Any] | None
+    ) -> None:
+        """推送异步人工回复（None表示等待超时）到前端"""
+        conversation_id = (msg.metadata or {}).get("conversationId", "default")
+        if not self.ws_manager:
+            return
+
+        await self.ws_manager.send_to_client(
+            conversation_id,
+            {
+                "type": "human_response",
+                "handoff_id": handoff_id,
+                "timed_out": item is None,
+                "content": item.get("content", "") if item else "[超时] 正在分配其他客服",
+                "metadata": (item or {}).get("metadata", {}),
+            },
+        )
+
     @staticmethod
     def _extract_confidence_from_content(msg: Msg) -> float | None:
         try:
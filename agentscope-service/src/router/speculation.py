@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from agentscope.message import Msg
+from prometheus_client import Counter
+
+from src.agents.streaming import hold_current_stream, stream_to
+
+SPECULATION_RESULTS = Counter(
+    "agentscope_speculative_assistant_total",
+    "Speculative assistant runs by outcome (hit: reply used, miss: cancelled)",
+    ["result"],
+)
+
+
+class SpeculativeReply:
+    """
+    An assistant reply started before the routing decision is final.
+
+    Streamed output is held back until ``take()`` keeps the run; ``discard()``
+    cancels it and drops whatever it printed.
+    """
+
+    def __init__(self, stage: str, run: Callable[[], Awaitable[Msg]]) -> None:
+        self.stage = stage
+        self._stream = hold_current_stream()
+        if self._stream is not None:
+            with stream_to(self._stream):
+                self._task = asyncio.ensure_future(run())
+        else:
+            self._task = asyncio.ensure_future(run())
+        self._settled = False
+
+    async def take(self) -> Msg:
+        self._settled = True
+        SPECULATION_RESULTS.labels("hit").inc()
+        if self._stream is not None:
+            await self._stream.release()
+        return await self._task
+
+    def discard(self) -> None:
+        if self._settled:
+            return
+        self._settled = True
+        SPECULATION_RESULTS.labels("miss").inc()
+        if self._stream is not None:
+            self._stream.discard()
+        self._task.cancel()
+        # The cancelled run unwinds on its own; just keep its outcome from being reported as unhandled
+        self._task.add_done_callback(lambda task: task.cancelled() or task.exception())
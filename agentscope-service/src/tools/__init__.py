@@ -1,4 +1,11 @@
 from .custom_tools import health_ping
-from .mcp_tools import BackendMCPClient, MCPToolkitBundle, setup_toolkit
+from .mcp_tools import BackendMCPClient, MCPToolkitBundle, ToolCall, ToolResult, setup_toolkit
 
-__all__ = ["BackendMCPClient", "MCPToolkitBundle", "setup_toolkit", "health_ping"]
+__all__ = [
+    "BackendMCPClient",
+    "MCPToolkitBundle",
+    "setup_toolkit",
+    "health_ping",
+    "ToolCall",
+    "ToolResult",
+]
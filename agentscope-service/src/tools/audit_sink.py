@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
+
+AUDIT_RECORDS = Counter(
+    "agentscope_audit_records_total",
+    "recordAgentCall payloads handled by the audit sink (sent/retried)",
+    ["result"],
+)
+AUDIT_DROPPED = Counter(
+    "agentscope_audit_dropped_total",
+    "recordAgentCall payloads dropped by the audit sink",
+    ["reason"],
+)
+AUDIT_QUEUE_DEPTH = Gauge(
+    "agentscope_audit_queue_depth",
+    "recordAgentCall payloads waiting in the audit sink queue",
+)
+AUDIT_BATCH_LATENCY = Histogram(
+    "agentscope_audit_batch_duration_seconds",
+    "Latency of one audit sink batch write",
+)
+
+
+@dataclass
+class _AuditRecord:
+    arguments: dict[str, Any]
+    attempts: int = 0
+
+
+class AuditSink:
+    """
+    Background writer for ``recordAgentCall`` so replies never wait on audit writes.
+
+    Records go into a bounded queue and a worker sends them in batches of up
+    to ``batch_size`` through ``call_tools_batch``. Failed records are
+    retried with exponential backoff up to ``max_retries`` times. When the
+    queue is full, ``overflow="drop"`` drops the record (counted) and
+    ``overflow="block"`` makes the caller wait for room. ``close()`` drains
+    what is queued, bounded by ``drain_timeout``.
+    """
+
+    def __init__(
+        self,
+        backend: BackendMCPClient,
+        max_queue: int = 1000,
+        batch_size: int = 20,
+        flush_interval: float = 0.2,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_backoff: float = 10.0,
+        overflow: str = "drop",
+        drain_timeout: float = 5.0,
+    ) -> None:
+        self._backend = backend
+        self._queue: asyncio.Queue[_AuditRecord] = asyncio.Queue(maxsize=max_queue)
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._max_backoff = max_backoff
+        self._block = overflow == "block"
+        self._drain_timeout = drain_timeout
+        self._worker: asyncio.Task[None] | None = None
+        self._closing = False
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def submit(self, arguments: dict[str, Any]) -> bool:
+        """Queue one ``recordAgentCall`` payload; returns False if it was dropped."""
+        if self._closing:
+            AUDIT_DROPPED.labels("closed").inc()
+            return False
+        self.start()
+        record = _AuditRecord(arguments)
+        if self._block:
+            await self._queue.put(record)
+        else:
+            try:
+                self._queue.put_nowait(record)
+            except asyncio.QueueFull:
+                AUDIT_DROPPED.labels("queue_full").inc()
+                return False
+        AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+        return True
+
+    async def close(self) -> None:
+        """Stop accepting records and flush the backlog within ``drain_timeout``."""
+        self._closing = True
+        if self._worker is None:
+            return
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._queue.join(), self._drain_timeout)
+        self._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._worker
+        self._worker = None
+        while not self._queue.empty():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            AUDIT_DROPPED.labels("shutdown").inc()
+        AUDIT_QUEUE_DEPTH.set(0)
+
+    async def _run(self) -> None:
+        retry: list[_AuditRecord] = []
+        while True:
+            batch = retry
+            if not batch:
+                batch = [await self._queue.get()]
+            await self._fill(batch)
+            AUDIT_QUEUE_DEPTH.set(self._queue.qsize())
+            retry = await self._send(batch)
+            if retry:
+                attempts = max(record.attempts for record in retry)
+                await asyncio.sleep(
+                    min(self._retry_backoff * 2 ** (attempts - 1), self._max_backoff)
+                )
+
+    async def _fill(self, batch: list[_AuditRecord]) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (0.0 if self._closing else self._flush_interval)
+        while len(batch) < self._batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except TimeoutError:
+                return
+
+    async def _send(self, batch: list[_AuditRecord]) -> list[_AuditRecord]:
+        start = time.perf_counter()
+        try:
+            results = await self._backend.call_tools_batch(
+                [ToolCall("recordAgentCall", record.arguments) for record in batch]
+            )
+            failed = {id(record) for record, result in zip(batch, results) if not result.ok}
+        except Exception:
+            failed = {id(record) for record in batch}
+        AUDIT_BATCH_LATENCY.observe(time.perf_counter() - start)
+
+        retry: list[_AuditRecord] = []
+        for record in batch:
+            if id(record) not in failed:
+                AUDIT_RECORDS.labels("sent").inc()
+                self._queue.task_done()
+                continue
+            record.attempts += 1
+            if record.attempts > self._max_retries:
+                AUDIT_DROPPED.labels("retries_exhausted").inc()
+                self._queue.task_done()
+            else:
+                AUDIT_RECORDS.labels("retried").inc()
+                retry.append(record)
+        return retry
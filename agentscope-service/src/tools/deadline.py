@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Iterator
+from contextlib import contextmanager
+from contextvars import Context, ContextVar, copy_context
+from typing import TypeVar
+
+from prometheus_client import Counter
+
+DEADLINE_EXCEEDED = Counter(
+    "agentscope_deadline_exceeded_total",
+    "Work abandoned because the request deadline had passed, by stage",
+    ["stage"],
+)
+
+_T = TypeVar("_T")
+
+_current_deadline: ContextVar[Deadline | None] = ContextVar("agentscope_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out before ``stage`` could start."""
+
+    def __init__(self, stage: str) -> None:
+        super().__init__(f"request deadline exceeded ({stage})")
+        self.stage = stage
+
+
+class Deadline:
+    """Absolute point in (monotonic) time by which a request must be answered."""
+
+    def __init__(self, expires_at: float) -> None:
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+def parse_timeout(value: str | None, default: float = 0.0, maximum: float = 0.0) -> float | None:
+    """
+    Seconds from a client timeout header, falling back to ``default``.
+
+    Non-positive or malformed values mean "no deadline" unless a default is
+    set; ``maximum`` (when positive) caps what a client may ask for.
+    """
+    seconds = default
+    if value:
+        try:
+            seconds = float(value)
+        except ValueError:
+            seconds = default
+    if seconds <= 0:
+        return None
+    if maximum > 0:
+        seconds = min(seconds, maximum)
+    return seconds
+
+
+def current_deadline() -> Deadline | None:
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[Deadline | None]:
+    """Make ``deadline`` visible to everything awaited inside this block (and its tasks)."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def detached_context(deadline: Deadline | None = None) -> Context:
+    """A copy of the current context for work that may outlive the request, under its own ``deadline``."""
+    context = copy_context()
+    context.run(_current_deadline.set, deadline)
+    return context
+
+
+def budget(timeout: float) -> float:
+    """``timeout`` shrunk to what is left of the current deadline, if any."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return timeout
+    return min(timeout, deadline.remaining())
+
+
+def check_deadline(stage: str) -> None:
+    """Raise ``DeadlineExceeded`` instead of starting ``stage`` once the caller has given up."""
+    deadline = _current_deadline.get()
+    if deadline is not None and deadline.expired:
+        DEADLINE_EXCEEDED.labels(stage).inc()
+        raise DeadlineExceeded(stage)
+
+
+async def within_deadline(awaitable: Awaitable[_T], stage: str) -> _T:
+    """Await ``awaitable`` for at most what is left of the current deadline."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, deadline.remaining())
+    except TimeoutError:
+        DEADLINE_EXCEEDED.labels(stage).inc()
+        raise DeadlineExceeded(stage) from None
@@ -1,29 +1,217 @@
+import asyncio
+import copy
+import importlib.util
 import os
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 import httpx
 from agentscope.mcp import HttpStatelessClient
 from agentscope.tool import Toolkit
+from prometheus_client import Counter, Gauge, Histogram
 
 from src.config.settings import settings
+from src.tools.deadline import (
+    DeadlineExceeded,
+    budget,
+    check_deadline,
+    detached_context,
+    within_deadline,
+)
+from src.tools.tool_cache import SIDE_EFFECT_TOOLS, ToolResultCache, canonical_key, tool_cache
+
+MCP_POOL_IN_FLIGHT = Gauge(
+    "agentscope_mcp_pool_in_flight_requests",
+    "Backend MCP requests currently holding a pooled connection",
+    ["lane"],
+)
+MCP_POOL_MAX_CONNECTIONS = Gauge(
+    "agentscope_mcp_pool_max_connections",
+    "Configured connection limit of each backend MCP pool",
+    ["lane"],
+)
+MCP_POOL_UTILIZATION = Gauge(
+    "agentscope_mcp_pool_utilization_ratio",
+    "In-flight requests divided by the pool connection limit",
+    ["lane"],
+)
+
+MCP_BATCH_SIZE = Histogram(
+    "agentscope_mcp_batch_calls",
+    "Tool calls carried by one call_tools_batch request",
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16),
+)
+MCP_SINGLE_FLIGHT = Counter(
+    "agentscope_mcp_single_flight_total",
+    "Single-flight tool calls by role (leader: sent to the backend, coalesced: shared a leader)",
+    ["tool", "role"],
+)
+
+# Status codes meaning the backend does not accept JSON-RPC batch bodies
+_BATCH_UNSUPPORTED_STATUS = {400, 404, 405, 415, 422}
+
+
+@dataclass
+class ToolCall:
+    """One ``tools/call`` invocation inside a batch."""
+
+    name: str
+    arguments: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ToolResult:
+    """Outcome of one batched call; ``error`` is set when that call failed."""
+
+    name: str
+    result: Any = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Future[dict[str, Any]]
+    waiters: int = 0
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
 
 
 class BackendMCPClient:
-    """Lightweight HTTP client to call the Node.js MCP server directly."""
+    """
+    Lightweight HTTP client to call the Node.js MCP server directly.
+
+    Tools listed in ``slow_tools`` get their own connection pool so a burst
+    of long calls (e.g. ``inspectConversation``) cannot starve fast lookups.
+    Timeouts come from ``tool_timeouts`` with ``timeout`` as the default,
+    shortened to the remaining request deadline.
+    With a ``cache``, results of read-only tools are served from it.
+    Concurrent identical calls to ``single_flight_tools`` share one request.
+    """
+
+    # Flipped off the first time the backend answers a batch with a non-list body
+    supports_batch = True
 
-    def __init__(self, url: str, headers: dict[str, str] | None = None) -> None:
+    def __init__(
+        self,
+        url: str,
+        headers: dict[str, str] | None = None,
+        limits: httpx.Limits | None = None,
+        http2: bool = False,
+        timeout: float = 30.0,
+        tool_timeouts: dict[str, float] | None = None,
+        slow_tools: set[str] | None = None,
+        cache: ToolResultCache | None = None,
+        single_flight_tools: set[str] | None = None,
+    ) -> None:
         self.url = url
         self.headers = headers or {}
+        self.limits = limits or httpx.Limits()
+        self.http2 = http2
+        self.timeout = timeout
+        self.tool_timeouts = tool_timeouts or {}
+        self.slow_tools = slow_tools or set()
+        self.cache = cache
+        self.single_flight_tools = (single_flight_tools or set()) - SIDE_EFFECT_TOOLS
+        self._flights: dict[tuple[str, str], _Flight] = {}
         self._client: httpx.AsyncClient | None = None
+        self._slow_client: httpx.AsyncClient | None = None
+        self._in_flight = {"default": 0, "slow": 0}
+
+    def _lane(self, name: str) -> str:
+        return "slow" if name in self.slow_tools else "default"
+
+    def timeout_for(self, name: str) -> float:
+        return self.tool_timeouts.get(name, self.timeout)
 
-    async def _client_instance(self) -> httpx.AsyncClient:
+    def _build_client(self, lane: str) -> httpx.AsyncClient:
+        http2 = self.http2
+        if http2 and not _http2_available():
+            print("[AgentScope] HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        if self.limits.max_connections is not None:
+            MCP_POOL_MAX_CONNECTIONS.labels(lane).set(self.limits.max_connections)
+        return httpx.AsyncClient(limits=self.limits, http2=http2, timeout=self.timeout)
+
+    async def _client_instance(self, lane: str = "default") -> httpx.AsyncClient:
+        if lane == "slow":
+            if self._slow_client is None:
+                self._slow_client = self._build_client(lane)
+            return self._slow_client
         if self._client is None:
-            self._client = httpx.AsyncClient()
+            self._client = self._build_client(lane)
         return self._client
 
+    async def _post(self, lane: str, payload: Any, timeout: float) -> Any:
+        client = await self._client_instance(lane)
+        self._track(lane, 1)
+        try:
+            resp = await client.post(self.url, json=payload, headers=self.headers, timeout=timeout)
+        finally:
+            self._track(lane, -1)
+        resp.raise_for_status()
+        return resp.json()
+
+    def _track(self, lane: str, delta: int) -> None:
+        self._in_flight[lane] += delta
+        MCP_POOL_IN_FLIGHT.labels(lane).set(self._in_flight[lane])
+        if self.limits.max_connections:
+            MCP_POOL_UTILIZATION.labels(lane).set(
+                self._in_flight[lane] / self.limits.max_connections
+            )
+
     async def call_tool(self, name: str, **arguments: Any) -> dict[str, Any]:
-        client = await self._client_instance()
+        if self.cache is not None and self.cache.cacheable(name):
+            found, cached = self.cache.get(name, arguments)
+            result: dict[str, Any] = cached
+            if found:
+                return result
+            result = await self._coalesced_call(name, arguments)
+            self.cache.put(name, arguments, result)
+            return result
+        return await self._coalesced_call(name, arguments)
+
+    async def _coalesced_call(self, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        if name not in self.single_flight_tools:
+            return await self._call_tool(name, arguments)
+        check_deadline("mcp")
+        key = (name, canonical_key(arguments))
+        flight = self._flights.get(key)
+        leader = flight is None
+        if flight is None:
+            # The shared request is bounded by the tool timeout only; every caller
+            # applies its own deadline while waiting for it
+            flight = _Flight(
+                detached_context().run(asyncio.ensure_future, self._call_tool(name, arguments))
+            )
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._end_flight(key, flight))
+        MCP_SINGLE_FLIGHT.labels(name, "leader" if leader else "coalesced").inc()
+        flight.waiters += 1
+        try:
+            result = await within_deadline(asyncio.shield(flight.task), "mcp")
+        except (asyncio.CancelledError, DeadlineExceeded):
+            # Abandon the request once nobody is waiting for it any more
+            if flight.waiters == 1 and not flight.task.done():
+                self._end_flight(key, flight)
+                flight.task.cancel()
+            raise
+        finally:
+            flight.waiters -= 1
+        # Followers get their own copy so callers cannot mutate each other's result
+        return result if leader else copy.deepcopy(result)
+
+    def _end_flight(self, key: tuple[str, str], flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    async def _call_tool(self, name: str, arguments: dict[str, Any]) -> dict[str, Any]:
         payload = {
             "method": "tools/call",
             "params": {
@@ -31,29 +219,114 @@ class BackendMCPClient:
                 "arguments": arguments,
             },
         }
-        resp = await client.post(self.url, json=payload, headers=self.headers, timeout=30.0)
-        resp.raise_for_status()
-        data = resp.json()
+        check_deadline("mcp")
+        data = await self._post(self._lane(name), payload, budget(self.timeout_for(name)))
         if "error" in data:
             raise RuntimeError(data["error"])
         return data.get("result", {})
 
-    async def list_tools(self) -> list[dict[str, Any]]:
-        client = await self._client_instance()
-        resp = await client.post(
-            self.url,
-            json={"method": "tools/list"},
-            headers=self.headers,
-            timeout=30.0,
+    async def call_tools_batch(self, calls: Sequence[ToolCall]) -> list[ToolResult]:
+        """
+        Send several ``tools/call`` invocations as one JSON-RPC batch request.
+
+        Results are returned in the order of ``calls``. A failing call only
+        sets ``error`` on its own result; a transport failure sets it on all
+        of them. Nothing is raised. Backends without batch support are
+        served by concurrent single calls instead.
+        """
+        if not calls:
+            return []
+        if self.cache is not None:
+            return await self._call_tools_batch_cached(calls)
+        return await self._send_batch(calls)
+
+    async def _call_tools_batch_cached(self, calls: Sequence[ToolCall]) -> list[ToolResult]:
+        assert self.cache is not None
+        results: list[ToolResult | None] = []
+        missing: list[int] = []
+        for index, call in enumerate(calls):
+            if self.cache.cacheable(call.name):
+                found, cached = self.cache.get(call.name, call.arguments)
+                if found:
+                    results.append(ToolResult(call.name, result=cached))
+                    continue
+            results.append(None)
+            missing.append(index)
+        if missing:
+            fetched = await self._send_batch([calls[index] for index in missing])
+            for index, item in zip(missing, fetched):
+                if item.ok:
+                    self.cache.put(item.name, calls[index].arguments, item.result)
+                results[index] = item
+        return [item for item in results if item is not None]
+
+    async def _send_batch(self, calls: Sequence[ToolCall]) -> list[ToolResult]:
+        if not calls:
+            return []
+        MCP_BATCH_SIZE.observe(len(calls))
+        if not self.supports_batch or len(calls) == 1:
+            return await self._call_individually(calls)
+        payload = [
+            {
+                "jsonrpc": "2.0",
+                "id": index,
+                "method": "tools/call",
+                "params": {"name": call.name, "arguments": call.arguments},
+            }
+            for index, call in enumerate(calls)
+        ]
+        lane = "slow" if any(self._lane(call.name) == "slow" for call in calls) else "default"
+        timeout = max(self.timeout_for(call.name) for call in calls)
+        try:
+            check_deadline("mcp")
+            data = await self._post(lane, payload, budget(timeout))
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code not in _BATCH_UNSUPPORTED_STATUS:
+                return [ToolResult(call.name, error=str(exc)) for call in calls]
+            data = None
+        except Exception as exc:
+            return [ToolResult(call.name, error=str(exc)) for call in calls]
+        if not isinstance(data, list):
+            self.supports_batch = False
+            return await self._call_individually(calls)
+
+        responses = {item.get("id"): item for item in data if isinstance(item, dict)}
+        results: list[ToolResult] = []
+        for index, call in enumerate(calls):
+            item = responses.get(index)
+            if item is None:
+                results.append(ToolResult(call.name, error="missing from batch response"))
+            elif "error" in item:
+                error = item["error"]
+                message = error.get("message") if isinstance(error, dict) else None
+                results.append(ToolResult(call.name, error=str(message or error)))
+            else:
+                results.append(ToolResult(call.name, result=item.get("result", {})))
+        return results
+
+    async def _call_individually(self, calls: Sequence[ToolCall]) -> list[ToolResult]:
+        outcomes = await asyncio.gather(
+            *(self._coalesced_call(call.name, call.arguments) for call in calls),
+            return_exceptions=True,
         )
-        resp.raise_for_status()
-        data = resp.json()
+        return [
+            ToolResult(call.name, error=str(outcome))
+            if isinstance(outcome, BaseException)
+            else ToolResult(call.name, result=outcome)
+            for call, outcome in zip(calls, outcomes)
+        ]
+
+    async def list_tools(self) -> list[dict[str, Any]]:
+        data = await self._post("default", {"method": "tools/list"}, self.timeout)
         return data.get("tools", [])
 
     async def close(self) -> None:
         if self._client:
             await self._client.aclose()
             self._client = None
+        if self._slow_client:
+            await self._slow_client.aclose()
+            self._slow_client = None
 
 
 @dataclass
@@ -85,6 +358,17 @@ async def setup_toolkit() -> MCPToolkitBundle:
     backend_client = BackendMCPClient(
         f"{settings.node_backend_url}/mcp",
         headers={"Authorization": f"Bearer {settings.mcp_api_key}"} if settings.mcp_api_key else None,
+        limits=httpx.Limits(
+            max_connections=settings.mcp_max_connections,
+            max_keepalive_connections=settings.mcp_max_keepalive_connections,
+            keepalive_expiry=settings.mcp_keepalive_expiry,
+        ),
+        http2=settings.mcp_http2,
+        timeout=settings.mcp_timeout,
+        tool_timeouts=settings.mcp_tool_timeouts,
+        slow_tools=settings.mcp_slow_tools,
+        cache=tool_cache if tool_cache.enabled else None,
+        single_flight_tools=settings.mcp_single_flight_tools,
     )
 
     return MCPToolkitBundle(toolkit=toolkit, backend_client=backend_client)
@@ -2,14 +2,28 @@ from __future__ import annotations
 
 from typing import Any
 
+import httpx
+
+from src.tools.audit_sink import AuditSink
 from src.tools.mcp_tools import BackendMCPClient
 
 
+class MemoryDeltaUnsupportedError(RuntimeError):
+    """Raised when the backend does not expose the incremental memory tool."""
+
+
 class PersistenceClient:
     """Write persistence records back to the Node backend via MCP tools."""
 
-    def __init__(self, backend_client: BackendMCPClient) -> None:
+    def __init__(
+        self,
+        backend_client: BackendMCPClient,
+        audit_sink: AuditSink | None = None,
+    ) -> None:
         self._backend = backend_client
+        self._audit_sink = audit_sink
+        self.supports_memory_delta = True
+        self.supports_memory_version = True
 
     async def record_agent_call(
         self,
@@ -25,19 +39,23 @@ class PersistenceClient:
         error_message: str | None = None,
         metadata: dict[str, Any] | None = None,
     ) -> None:
-        await self._backend.call_tool(
-            "recordAgentCall",
-            conversationId=conversation_id,
-            agentName=agent_name,
-            agentRole=agent_role,
-            mode=mode,
-            status=status,
-            durationMs=duration_ms,
-            input=input_payload or {},
-            output=output_payload or {},
-            errorMessage=error_message,
-            metadata=metadata or {},
-        )
+        arguments = {
+            "conversationId": conversation_id,
+            "agentName": agent_name,
+            "agentRole": agent_role,
+            "mode": mode,
+            "status": status,
+            "durationMs": duration_ms,
+            "input": input_payload or {},
+            "output": output_payload or {},
+            "errorMessage": error_message,
+            "metadata": metadata or {},
+        }
+        if self._audit_sink is not None:
+            # Returns once queued; the sink batches and retries the write
+            await self._audit_sink.submit(arguments)
+            return
+        await self._backend.call_tool("recordAgentCall", **arguments)
 
     async def record_agent_memory(
         self,
@@ -53,6 +71,38 @@ class PersistenceClient:
             memory=memory,
         )
 
+    async def record_agent_memory_delta(
+        self,
+        *,
+        conversation_id: str,
+        agent_name: str,
+        base_seq: int,
+        entries: list[dict[str, Any]],
+    ) -> None:
+        """
+        Append sequenced memory records on top of the stored snapshot.
+
+        Each entry is ``{"seq": int, "msg": dict}``; ``base_seq`` is the last
+        sequence number the caller knows to be persisted. Raises
+        MemoryDeltaUnsupportedError (and remembers it) when the backend does
+        not know the tool, so callers can fall back to full snapshots.
+        """
+        if not self.supports_memory_delta:
+            raise MemoryDeltaUnsupportedError("recordAgentMemoryDelta is not available")
+        try:
+            await self._backend.call_tool(
+                "recordAgentMemoryDelta",
+                conversationId=conversation_id,
+                agentName=agent_name,
+                baseSeq=base_seq,
+                entries=entries,
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                self.supports_memory_delta = False
+                raise MemoryDeltaUnsupportedError(str(exc)) from exc
+            raise
+
     async def load_agent_memory(
         self,
         *,
@@ -64,3 +114,26 @@ class PersistenceClient:
             conversationId=conversation_id,
             agentName=agent_name,
         )
+
+    async def load_agent_memory_version(
+        self,
+        *,
+        conversation_id: str,
+        agent_name: str,
+    ) -> int | None:
+        """Return the latest stored memory seq, or None when the backend cannot tell."""
+        if not self.supports_memory_version:
+            return None
+        try:
+            result = await self._backend.call_tool(
+                "getAgentMemoryVersion",
+                conversationId=conversation_id,
+                agentName=agent_name,
+            )
+        except httpx.HTTPStatusError as exc:
+            if exc.response.status_code == 404:
+                self.supports_memory_version = False
+                return None
+            raise
+        seq = result.get("seq") if isinstance(result, dict) else None
+        return seq if isinstance(seq, int) else None
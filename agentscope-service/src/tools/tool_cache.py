@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+from src.config.settings import settings
+
+TOOL_CACHE_REQUESTS = Counter(
+    "agentscope_mcp_cache_requests_total",
+    "MCP tool result cache lookups (hit/miss)",
+    ["tool", "result"],
+)
+TOOL_CACHE_INVALIDATIONS = Counter(
+    "agentscope_mcp_cache_invalidations_total",
+    "Cached MCP tool results dropped because of a bridged domain event",
+    ["event_type"],
+)
+TOOL_CACHE_SIZE = Gauge(
+    "agentscope_mcp_cache_entries",
+    "MCP tool results currently held in the cache",
+    ["tool"],
+)
+
+# Tools that change backend state; never cached even if configured.
+SIDE_EFFECT_TOOLS = frozenset(
+    {
+        "createTask",
+        "recordAgentCall",
+        "recordAgentMemory",
+        "recordAgentMemoryDelta",
+        "saveQualityReport",
+        "createSurvey",
+    }
+)
+
+# Domain event type -> cached tools it makes stale. With an argument name
+# only entries whose argument equals the event's aggregate are dropped;
+# with None every entry of that tool is dropped.
+EVENT_INVALIDATIONS: dict[str, list[tuple[str, str | None]]] = {
+    "ProfileRefreshed": [("getCustomerProfile", "customerId")],
+    "CustomerMarkedAsVIP": [("getCustomerProfile", "customerId")],
+    "RiskLevelChanged": [("getCustomerProfile", "customerId")],
+    "InteractionAdded": [("getCustomerProfile", "customerId")],
+    "ServiceRecordAdded": [("getCustomerProfile", "customerId")],
+    "CommitmentProgressUpdated": [("getCustomerProfile", "customerId")],
+    "KnowledgeItemCreated": [("searchKnowledge", None)],
+    "KnowledgeItemUpdated": [("searchKnowledge", None)],
+    "KnowledgeItemDeleted": [("searchKnowledge", None)],
+    "ProblemCreated": [("getSystemStatus", None)],
+    "ProblemResolved": [("getSystemStatus", None)],
+    "ProblemReopened": [("getSystemStatus", None)],
+    "ProblemStatusChanged": [("getSystemStatus", None)],
+}
+
+
+def canonical_key(arguments: dict[str, Any]) -> str:
+    """Hash arguments independently of key order."""
+    encoded = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    arguments: dict[str, Any]
+    expires_at: float
+
+
+class ToolResultCache:
+    """
+    Per-tool LRU/TTL cache of read-only MCP tool results.
+
+    Only tools with a TTL in ``ttls`` are cached. Entries are keyed on a
+    canonical hash of the call arguments and are dropped when a matching
+    domain event arrives through the event bridge.
+    """
+
+    def __init__(
+        self,
+        ttls: dict[str, float] | None = None,
+        max_sizes: dict[str, int] | None = None,
+        default_max_size: int = 512,
+    ) -> None:
+        self._ttls = {
+            name: ttl
+            for name, ttl in (ttls or {}).items()
+            if ttl > 0 and name not in SIDE_EFFECT_TOOLS
+        }
+        self._max_sizes = max_sizes or {}
+        self._default_max_size = default_max_size
+        self._entries: dict[str, OrderedDict[str, _CacheEntry]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._ttls)
+
+    def cacheable(self, name: str) -> bool:
+        return name in self._ttls
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def get(self, name: str, arguments: dict[str, Any]) -> tuple[bool, Any]:
+        """Return ``(found, value)``; a cached value may legitimately be falsy."""
+        entries = self._entries.get(name)
+        key = canonical_key(arguments)
+        entry = entries.get(key) if entries else None
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._drop(name, key)
+            entry = None
+        if entry is None:
+            TOOL_CACHE_REQUESTS.labels(name, "miss").inc()
+            return False, None
+        assert entries is not None
+        entries.move_to_end(key)
+        TOOL_CACHE_REQUESTS.labels(name, "hit").inc()
+        return True, copy.deepcopy(entry.value)
+
+    def put(self, name: str, arguments: dict[str, Any], value: Any) -> None:
+        if not self.cacheable(name):
+            return
+        entries = self._entries.setdefault(name, OrderedDict())
+        key = canonical_key(arguments)
+        entries[key] = _CacheEntry(
+            value=copy.deepcopy(value),
+            arguments=dict(arguments),
+            expires_at=time.monotonic() + self._ttls[name],
+        )
+        entries.move_to_end(key)
+        max_size = self._max_sizes.get(name, self._default_max_size)
+        while len(entries) > max_size:
+            entries.popitem(last=False)
+        TOOL_CACHE_SIZE.labels(name).set(len(entries))
+
+    def invalidate(self, name: str, argument: str | None = None, value: Any = None) -> int:
+        """Drop every entry of ``name``, or only those whose ``argument`` equals ``value``."""
+        entries = self._entries.get(name)
+        if not entries:
+            return 0
+        if argument is None:
+            dropped = len(entries)
+            entries.clear()
+        else:
+            keys = [k for k, e in entries.items() if e.arguments.get(argument) == value]
+            for key in keys:
+                del entries[key]
+            dropped = len(keys)
+        TOOL_CACHE_SIZE.labels(name).set(len(entries))
+        return dropped
+
+    def invalidate_for_event(self, event: dict[str, Any]) -> int:
+        """Apply ``EVENT_INVALIDATIONS`` to a bridged domain event."""
+        event_type = event.get("eventType")
+        rules = EVENT_INVALIDATIONS.get(event_type or "")
+        if not rules:
+            return 0
+        payload = event.get("payload") or {}
+        dropped = 0
+        for name, argument in rules:
+            if argument is None:
+                dropped += self.invalidate(name)
+            else:
+                scope = payload.get(argument) or event.get("aggregateId")
+                dropped += self.invalidate(name, argument, scope)
+        if dropped:
+            TOOL_CACHE_INVALIDATIONS.labels(event_type).inc(dropped)
+        return dropped
+
+    def clear(self) -> None:
+        for name in self._entries:
+            TOOL_CACHE_SIZE.labels(name).set(0)
+        self._entries.clear()
+
+    def _drop(self, name: str, key: str) -> None:
+        entries = self._entries[name]
+        entries.pop(key, None)
+        TOOL_CACHE_SIZE.labels(name).set(len(entries))
+
+
+tool_cache = ToolResultCache(
+    ttls=settings.mcp_cache_ttls,
+    max_sizes={name: int(size) for name, size in settings.mcp_cache_max_sizes.items()},
+    default_max_size=settings.mcp_cache_max_size,
+)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from agentscope.formatter import OpenAIChatFormatter
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+from agentscope.model import OpenAIChatModel
+from agentscope.tool import Toolkit
+
+from src.agents.agent_pool import AgentPool
+from src.agents.assistant_agent import AssistantAgent
+from src.tools.mcp_tools import BackendMCPClient
+
+
+@pytest.fixture
+def template() -> AssistantAgent:
+    return AssistantAgent(
+        name="AssistantAgent",
+        sys_prompt="template prompt",
+        model=MagicMock(spec=OpenAIChatModel),
+        formatter=MagicMock(spec=OpenAIChatFormatter),
+        toolkit=Toolkit(),
+        mcp_client=MagicMock(spec=BackendMCPClient),
+        memory=InMemoryMemory(),
+        max_iters=3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_checkout_reuses_context_per_conversation(template: AssistantAgent) -> None:
+    pool = AgentPool(template, max_size=4)
+
+    async with pool.checkout("c1") as first:
+        pass
+    async with pool.checkout("c1") as again:
+        pass
+    async with pool.checkout("c2") as other:
+        pass
+
+    assert first is again
+    assert first is not other
+    assert first is not template
+    assert first.model is template.model
+    assert first.memory is not template.memory
+    assert first.max_iters == 3
+    assert len(pool) == 2
+
+
+@pytest.mark.asyncio
+async def test_checkout_without_conversation_is_ephemeral(template: AssistantAgent) -> None:
+    pool = AgentPool(template)
+
+    async with pool.checkout(None) as first:
+        pass
+    async with pool.checkout(None) as second:
+        pass
+
+    assert first is not second
+    assert len(pool) == 0
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_skips_busy_entries(template: AssistantAgent) -> None:
+    pool = AgentPool(template, max_size=1)
+
+    async with pool.checkout("busy"):
+        async with pool.checkout("idle"):
+            pass
+        # "busy" is still checked out, so the idle entry is the one evicted
+        assert "busy" in pool
+        assert "idle" not in pool
+
+    async with pool.checkout("next"):
+        pass
+    assert "busy" not in pool
+    assert "next" in pool
+
+
+@pytest.mark.asyncio
+async def test_same_conversation_calls_are_serialized(template: AssistantAgent) -> None:
+    pool = AgentPool(template)
+    active = 0
+    peak = 0
+
+    async def worker() -> None:
+        nonlocal active, peak
+        async with pool.checkout("c1"):
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(worker(), worker(), worker())
+
+    assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_discard_drops_idle_context(template: AssistantAgent) -> None:
+    pool = AgentPool(template)
+    async with pool.checkout("c1"):
+        pass
+
+    pool.discard("c1")
+
+    assert "c1" not in pool
+
+
+@pytest.mark.asyncio
+async def test_pooled_call_leaves_template_untouched(
+    template: AssistantAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    seen: list[tuple[int, str]] = []
+
+    async def fake_reply(self: AssistantAgent, msg: Msg) -> Msg:
+        seen.append((id(self), self._sys_prompt))
+        return Msg(name=self.name, content="ok", role="assistant")
+
+    monkeypatch.setattr(AssistantAgent, "reply", fake_reply)
+    monkeypatch.setattr(
+        "src.agents.assistant_agent.build_agent_prompt",
+        lambda base, _agent, metadata: f"{base}|{metadata.get('conversationId')}",
+    )
+    template.pool = AgentPool(template)
+
+    results = await asyncio.gather(
+        template(Msg(name="user", content="a", role="user", metadata={"conversationId": "c1"})),
+        template(Msg(name="user", content="b", role="user", metadata={"conversationId": "c2"})),
+    )
+
+    assert [r.content for r in results] == ["ok", "ok"]
+    assert template._sys_prompt == "template prompt"
+    assert {prompt.rsplit("|", 1)[1] for _, prompt in seen} == {"c1", "c2"}
+    assert id(template) not in {agent_id for agent_id, _ in seen}
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 import pytest
@@ -29,3 +30,63 @@ def test_build_agent_prompt_no_stage_returns_base(tmp_path: Path, monkeypatch: p
     base_prompt = "BASE"
     result = agent_prompt.build_agent_prompt(base_prompt, "assistant", {})
     assert result == base_prompt
+
+
+def _stage_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    prompts_dir = tmp_path / "docs" / "prompts" / "agents" / "engineer"
+    prompts_dir.mkdir(parents=True, exist_ok=True)
+    monkeypatch.setattr(agent_prompt, "_repo_root", lambda: tmp_path)
+    return prompts_dir
+
+
+def test_compiled_prompt_is_reused_without_reading_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    prompts_dir = _stage_dir(tmp_path, monkeypatch)
+    (prompts_dir / "diagnosis.md").write_text("DIAG", encoding="utf-8")
+    (prompts_dir / "severity.md").write_text("SEV", encoding="utf-8")
+    cache = agent_prompt.CompiledPromptCache(revalidate_after=None)
+    reads = []
+    original = agent_prompt.load_agent_stage_prompts
+    monkeypatch.setattr(
+        agent_prompt,
+        "load_agent_stage_prompts",
+        lambda agent, stages: reads.append(stages) or original(agent, stages),
+    )
+
+    first = cache.build("BASE", "engineer", ("diagnosis", "severity"))
+    second = cache.build("BASE", "engineer", ("diagnosis", "severity"))
+    reordered = cache.build("BASE", "engineer", ("severity", "diagnosis"))
+
+    assert first == second == "BASE\n\n【场景提示词】\nDIAG\n\nSEV"
+    assert reordered.endswith("SEV\n\nDIAG")
+    assert len(reads) == 2
+
+
+def test_compiled_prompt_rebuilds_when_stage_file_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    prompts_dir = _stage_dir(tmp_path, monkeypatch)
+    stage_file = prompts_dir / "diagnosis.md"
+    stage_file.write_text("OLD", encoding="utf-8")
+    cache = agent_prompt.CompiledPromptCache(revalidate_after=0.0)
+
+    assert cache.build("BASE", "engineer", ("diagnosis",)).endswith("OLD")
+    stage_file.write_text("NEW", encoding="utf-8")
+    stat = stage_file.stat()
+    os.utime(stage_file, (stat.st_atime, stat.st_mtime + 5))
+
+    assert cache.build("BASE", "engineer", ("diagnosis",)).endswith("NEW")
+
+
+def test_compiled_prompt_invalidate_by_agent(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _stage_dir(tmp_path, monkeypatch)
+    cache = agent_prompt.CompiledPromptCache(revalidate_after=None)
+    cache.build("BASE", "engineer", ("diagnosis",))
+    cache.build("BASE", "assistant", ("reply",))
+
+    cache.invalidate("engineer")
+
+    assert len(cache) == 1
@@ -16,7 +16,7 @@ async def test_base_agent_create_with_prompt(monkeypatch: pytest.MonkeyPatch) ->
     fake_model = MagicMock()
     fake_formatter = MagicMock()
 
-    monkeypatch.setattr("src.agents.base_agent.OpenAIChatModel", lambda **_: fake_model)
+    monkeypatch.setattr("src.agents.base_agent.DeadlineChatModel", lambda **_: fake_model)
     monkeypatch.setattr("src.agents.base_agent.OpenAIChatFormatter", lambda: fake_formatter)
 
     agent = await BaseReActAgent.create_with_prompt(Toolkit(), "hello", max_iters=2)
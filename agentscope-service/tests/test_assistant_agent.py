@@ -15,7 +15,8 @@ from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
 from src.agents.assistant_agent import AssistantAgent
-from src.tools.mcp_tools import BackendMCPClient
+from src.tools.deadline import DeadlineExceeded
+from src.tools.mcp_tools import BackendMCPClient, ToolResult
 
 
 @pytest.fixture
@@ -300,11 +301,11 @@ class TestPrefetchContext:
             metadata={"customerId": "cust-123"},
         )
 
-        # 模拟MCP调用（客户画像+知识库）
-        mock_mcp_client.call_tool.side_effect = [
-            {"name": "张三"},  # customer_profile
-            [{"title": "知识1"}],  # knowledge
-        ]
+        # 模拟批量MCP调用（知识库+客户画像）
+        mock_mcp_client.call_tools_batch = AsyncMock(return_value=[
+            ToolResult("searchKnowledge", result=[{"title": "知识1"}]),
+            ToolResult("getCustomerProfile", result={"name": "张三"}),
+        ])
 
         with patch.object(
             assistant_agent, "analyze_sentiment", return_value={"sentiment": "neutral"}
@@ -314,6 +315,7 @@ class TestPrefetchContext:
         # 验证metadata被更新
         assert "prefetch" in msg.metadata
         assert "sentiment" in msg.metadata["prefetch"]
+        assert msg.metadata["prefetch"]["customer_profile"] == {"name": "张三"}
 
     async def test_prefetch_handles_errors_gracefully(
         self,
@@ -329,7 +331,10 @@ class TestPrefetchContext:
         )
 
         # 所有调用都失败
-        mock_mcp_client.call_tool.side_effect = Exception("调用失败")
+        mock_mcp_client.call_tools_batch = AsyncMock(return_value=[
+            ToolResult("searchKnowledge", error="调用失败"),
+            ToolResult("getCustomerProfile", error="调用失败"),
+        ])
 
         with patch.object(
             assistant_agent, "analyze_sentiment", side_effect=Exception("失败")
@@ -382,3 +387,50 @@ class TestInjectPrefetchContext:
 
         assert "truncated" in result
         assert len(result) < len(base_prompt) + 3000
+
+
+class TestMemoryFlushOnFailure:
+    """测试调用失败时仍持久化记忆"""
+
+    @pytest.mark.parametrize("error", [RuntimeError("模型不可用"), DeadlineExceeded("llm")])
+    async def test_model_error_still_flushes_memory(
+        self,
+        mock_model: OpenAIChatModel,
+        mock_formatter: OpenAIChatFormatter,
+        mock_toolkit: Toolkit,
+        mock_mcp_client: BackendMCPClient,
+        error: Exception,
+    ) -> None:
+        persistence = MagicMock()
+        persistence.supports_memory_delta = True
+        persistence.load_agent_memory = AsyncMock(return_value=None)
+        persistence.record_agent_memory = AsyncMock()
+        persistence.record_agent_memory_delta = AsyncMock()
+        persistence.record_agent_call = AsyncMock()
+        mock_model.side_effect = error
+        mock_toolkit.get_agent_skill_prompt.return_value = ""
+        mock_toolkit.get_json_schemas.return_value = []
+        mock_formatter.format = AsyncMock(return_value=[])
+        agent = AssistantAgent(
+            name="TestAssistant",
+            sys_prompt="Test prompt",
+            model=mock_model,
+            formatter=mock_formatter,
+            toolkit=mock_toolkit,
+            mcp_client=mock_mcp_client,
+            persistence=persistence,
+        )
+        msg = Msg(
+            name="user",
+            content="你好",
+            role="user",
+            metadata={"conversationId": f"conv-flush-{type(error).__name__}"},
+        )
+
+        with pytest.raises(type(error)):
+            await agent(msg)
+
+        saved = persistence.record_agent_memory.await_count
+        saved += persistence.record_agent_memory_delta.await_count
+        assert saved == 1
+        assert not agent.memory.dirty
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.tools.audit_sink import AuditSink
+from src.tools.mcp_tools import BackendMCPClient, ToolCall, ToolResult
+from src.tools.persistence import PersistenceClient
+
+
+def _backend(*outcomes: list[bool]) -> MagicMock:
+    """Backend whose successive batches succeed/fail per call as listed."""
+    remaining = list(outcomes)
+
+    async def call_tools_batch(calls: list[ToolCall]) -> list[ToolResult]:
+        flags = remaining.pop(0) if remaining else [True] * len(calls)
+        return [
+            ToolResult(call.name, result={}) if ok else ToolResult(call.name, error="down")
+            for call, ok in zip(calls, flags)
+        ]
+
+    backend = MagicMock(spec=BackendMCPClient)
+    backend.call_tools_batch = AsyncMock(side_effect=call_tools_batch)
+    return backend
+
+
+def _sent(backend: MagicMock) -> list[list[Any]]:
+    return [
+        [call.arguments["n"] for call in c.args[0]]
+        for c in backend.call_tools_batch.await_args_list
+    ]
+
+
+@pytest.mark.asyncio
+async def test_records_are_batched_and_drained_on_close() -> None:
+    backend = _backend()
+    sink = AuditSink(backend, batch_size=10, flush_interval=0.05)
+
+    for n in range(3):
+        assert await sink.submit({"n": n})
+    backend.call_tools_batch.assert_not_awaited()
+    await sink.close()
+
+    assert _sent(backend) == [[0, 1, 2]]
+    assert sink.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_records_are_retried_alone() -> None:
+    backend = _backend([True, False])
+    sink = AuditSink(backend, flush_interval=0.0, retry_backoff=0.0)
+
+    await sink.submit({"n": 1})
+    await sink.submit({"n": 2})
+    await sink.close()
+
+    assert _sent(backend) == [[1, 2], [2]]
+
+
+@pytest.mark.asyncio
+async def test_records_are_dropped_after_max_retries() -> None:
+    backend = _backend([False], [False], [False])
+    sink = AuditSink(backend, flush_interval=0.0, max_retries=2, retry_backoff=0.0)
+
+    await sink.submit({"n": 1})
+    await sink.close()
+
+    assert _sent(backend) == [[1], [1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_instead_of_blocking() -> None:
+    sink = AuditSink(_backend(), max_queue=1)
+
+    assert await sink.submit({"n": 1})
+    assert not await sink.submit({"n": 2})
+    await sink.close()
+    assert not await sink.submit({"n": 3})
+
+
+@pytest.mark.asyncio
+async def test_record_agent_call_goes_through_sink() -> None:
+    backend = _backend()
+    backend.call_tool = AsyncMock()
+    sink = AuditSink(backend, flush_interval=0.0)
+    persistence = PersistenceClient(backend, audit_sink=sink)
+
+    await persistence.record_agent_call(
+        conversation_id="c1",
+        agent_name="AssistantAgent",
+        agent_role="assistant",
+        mode="reply",
+        status="success",
+        duration_ms=12,
+    )
+    backend.call_tool.assert_not_awaited()
+    await sink.close()
+
+    call = backend.call_tools_batch.await_args.args[0][0]
+    assert call.name == "recordAgentCall"
+    assert call.arguments["conversationId"] == "c1"
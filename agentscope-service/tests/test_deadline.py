@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from agentscope.message import Msg
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import chat as chat_router
+from src.api.state import agent_manager
+from src.tools.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    budget,
+    check_deadline,
+    deadline_scope,
+    parse_timeout,
+)
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
+
+
+def test_parse_timeout_defaults_and_caps() -> None:
+    assert parse_timeout(None) is None
+    assert parse_timeout("abc", default=5.0) == 5.0
+    assert parse_timeout("0") is None
+    assert parse_timeout("120", maximum=30.0) == 30.0
+
+
+@pytest.mark.asyncio
+async def test_budget_shrinks_timeouts_inside_scope() -> None:
+    async def in_task() -> float:
+        return budget(30.0)
+
+    assert budget(30.0) == 30.0
+    with deadline_scope(Deadline.after(2.0)):
+        # Visible in tasks started inside the scope too
+        shrunk = await asyncio.ensure_future(in_task())
+        assert 0 < shrunk <= 2.0
+        assert budget(1.0) == 1.0
+    with deadline_scope(Deadline.after(-1)), pytest.raises(DeadlineExceeded):
+        check_deadline("mcp")
+
+
+@pytest.mark.asyncio
+async def test_mcp_calls_use_remaining_budget_and_stop_once_expired(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = BackendMCPClient("http://localhost", timeout=30.0)
+    mock_http = MagicMock()
+    mock_http.post = AsyncMock(
+        return_value=MagicMock(
+            json=lambda: {"result": {"ok": True}},
+            raise_for_status=lambda: None,
+        )
+    )
+    monkeypatch.setattr(client, "_client_instance", AsyncMock(return_value=mock_http))
+
+    with deadline_scope(Deadline.after(5.0)):
+        await client.call_tool("ping")
+    assert mock_http.post.await_args.kwargs["timeout"] <= 5.0
+
+    mock_http.post.reset_mock()
+    with deadline_scope(Deadline.after(-1)):
+        with pytest.raises(DeadlineExceeded):
+            await client.call_tool("ping")
+        results = await client.call_tools_batch([ToolCall("a", {}), ToolCall("b", {})])
+    assert all(not item.ok for item in results)
+    mock_http.post.assert_not_awaited()
+
+
+class _SlowRouter:
+    def __init__(self) -> None:
+        self.cancelled = False
+
+    async def route(self, msg: Msg) -> Msg:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return msg
+
+
+@pytest.fixture
+def slow_router() -> Any:
+    agent_manager["router"] = _SlowRouter()
+    yield agent_manager["router"]
+    agent_manager.pop("router", None)
+
+
+def test_message_endpoint_cancels_routing_at_client_deadline(slow_router: _SlowRouter) -> None:
+    app = FastAPI()
+    app.include_router(chat_router.router, prefix="/api/chat")
+    client = TestClient(app)
+
+    response = client.post(
+        "/api/chat/message",
+        json={"conversation_id": "c1", "message": "hi", "customer_id": "u1"},
+        headers={"X-Request-Timeout": "0.05"},
+    )
+
+    body = response.json()
+    assert body["success"] is False
+    assert "deadline exceeded" in body["message"]
+    assert slow_router.cancelled
@@ -9,7 +9,7 @@ from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
 from src.agents.engineer_agent import EngineerAgent
-from src.tools.mcp_tools import BackendMCPClient
+from src.tools.mcp_tools import BackendMCPClient, ToolResult
 
 
 @pytest.fixture
@@ -115,12 +115,20 @@ async def test_prefetch_context_updates_metadata(
     engineer_agent: EngineerAgent,
     mock_mcp_client: BackendMCPClient,
 ) -> None:
-    mock_mcp_client.call_tool.return_value = {"ok": True}
+    mock_mcp_client.call_tools_batch = AsyncMock(
+        return_value=[
+            ToolResult("getSystemStatus", result={"ok": True}),
+            ToolResult("searchKnowledge", error="boom"),
+            ToolResult("searchTickets", result=[]),
+        ]
+    )
     msg = MagicMock()
     msg.content = "问题"
     msg.metadata = {}
     await engineer_agent._prefetch_context(msg)
-    assert "prefetch" in msg.metadata
+    assert msg.metadata["prefetch"] == {"system_status": {"ok": True}, "similar_tickets": []}
+    calls = mock_mcp_client.call_tools_batch.await_args.args[0]
+    assert [c.name for c in calls] == ["getSystemStatus", "searchKnowledge", "searchTickets"]
 
 
 def test_inject_prefetch_context() -> None:
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api.routes import events as events_router
+from src.api.state import agent_manager
+from src.events.bridge import NodeEventLedger
+from src.events.dispatcher import EventDispatcher
+
+
+def _event(aggregate_id: str, seq: int, event_type: str = "ConversationUpdated") -> dict[str, Any]:
+    return {"eventType": event_type, "aggregateId": aggregate_id, "payload": {"seq": seq}}
+
+
+@pytest.mark.asyncio
+async def test_events_of_one_aggregate_keep_order_and_bad_handlers_are_skipped() -> None:
+    dispatcher = EventDispatcher(workers=3)
+    seen: list[tuple[str, int]] = []
+
+    def broken(event: dict[str, Any]) -> None:
+        raise RuntimeError("boom")
+
+    async def record(event: dict[str, Any]) -> None:
+        await asyncio.sleep(0)
+        seen.append((event["aggregateId"], event["payload"]["seq"]))
+
+    dispatcher.subscribe("broken", broken)
+    dispatcher.subscribe("record", record)
+    for seq in range(3):
+        for aggregate_id in ("c1", "c2", "c3"):
+            assert dispatcher.publish(_event(aggregate_id, seq))
+    await dispatcher.close()
+
+    for aggregate_id in ("c1", "c2", "c3"):
+        assert [seq for agg, seq in seen if agg == aggregate_id] == [0, 1, 2]
+    assert dispatcher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_instead_of_blocking() -> None:
+    dispatcher = EventDispatcher(workers=1, max_queue=2)
+    gate = asyncio.Event()
+    dispatcher.subscribe("slow", lambda event: gate.wait())
+
+    results = [dispatcher.publish(_event("c1", seq)) for seq in range(3)]
+
+    assert results == [True, True, False]
+    assert dispatcher.status()["pending_by_type"] == {"ConversationUpdated": 2}
+    gate.set()
+    await dispatcher.close()
+    assert dispatcher.publish(_event("c1", 9)) is False
+
+
+@pytest.mark.asyncio
+async def test_put_waits_for_room_before_dropping() -> None:
+    dispatcher = EventDispatcher(workers=1, max_queue=1)
+    gate = asyncio.Event()
+    dispatcher.subscribe("slow", lambda event: gate.wait())
+    assert dispatcher.publish(_event("c1", 0))
+    await asyncio.sleep(0)
+    assert dispatcher.publish(_event("c1", 1))
+
+    assert await dispatcher.put(_event("c1", 2), timeout=0.01) is False
+    waiting = asyncio.ensure_future(dispatcher.put(_event("c1", 3), timeout=1))
+    await asyncio.sleep(0)
+    gate.set()
+    assert await waiting is True
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_bridge_endpoints_enqueue_and_fan_out() -> None:
+    dispatcher = EventDispatcher(workers=2)
+    ledger = NodeEventLedger()
+    pushed: list[tuple[str, dict[str, Any]]] = []
+
+    class _Manager:
+        async def send_to_client(self, conversation_id: str, payload: dict[str, Any]) -> None:
+            pushed.append((conversation_id, payload))
+
+    events_router.register_bridge_handlers(dispatcher, ledger, _Manager())
+    agent_manager["event_dispatcher"] = dispatcher
+    app = FastAPI()
+    app.include_router(events_router.router, prefix="/api/events")
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            single = await client.post(
+                "/api/events/bridge",
+                json={**_event("c1", 0), "occurredAt": "2026-01-01T00:00:00Z"},
+            )
+            batch = await client.post(
+                "/api/events/bridge/batch", json=[_event("c1", 1), _event("c2", 0)]
+            )
+        await dispatcher.close()
+    finally:
+        agent_manager.pop("event_dispatcher", None)
+
+    assert single.json() == {"status": "accepted"}
+    assert batch.json() == {"status": "accepted", "accepted": 2, "dropped": 0}
+    assert [
+        entry["payload"]["seq"] for entry in ledger.recent() if entry["aggregateId"] == "c1"
+    ] == [0, 1]
+    assert [conversation_id for conversation_id, _ in pushed].count("c1") == 2
+    assert pushed[0][1]["event"]["occurredAt"].startswith("2026-01-01T00:00:00")
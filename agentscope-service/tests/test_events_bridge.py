@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import json
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
+from fastapi import FastAPI
 
+from src.api.routes import events as events_router
+from src.api.state import agent_manager
 from src.events.bridge import NodeEventLedger, AgentEventPublisher
 
 
@@ -17,6 +24,68 @@ def test_event_ledger_record_and_clear() -> None:
     assert ledger.recent() == []
 
 
+def test_event_ledger_indexes_dedupes_and_pages(monkeypatch: pytest.MonkeyPatch) -> None:
+    ledger = NodeEventLedger(max_entries=4, max_age_seconds=60)
+    for event_id, event_type, aggregate_id in [
+        ("e1", "Chat", "c1"),
+        ("e2", "Task", "t1"),
+        ("e3", "Chat", "c2"),
+        ("e4", "Chat", "c1"),
+    ]:
+        assert ledger.record(
+            {"eventId": event_id, "eventType": event_type, "aggregateId": aggregate_id}
+        )
+    assert ledger.record({"eventId": "e4", "eventType": "Chat", "aggregateId": "c1"}) is False
+
+    assert [e["eventId"] for e in ledger.recent(aggregate_id="c1")] == ["e1", "e4"]
+    assert [e["eventId"] for e in ledger.recent(event_type="Chat", limit=2)] == ["e3", "e4"]
+    assert [e["eventId"] for e in ledger.recent(after=1, limit=2)] == ["e2", "e3"]
+    assert ledger.recent(aggregate_id="c1", event_type="Task") == []
+
+    # Count eviction drops e1 from every index and forgets its eventId
+    ledger.record({"eventId": "e5", "eventType": "Task", "aggregateId": "c1"})
+    assert [e["eventId"] for e in ledger.recent(aggregate_id="c1")] == ["e4", "e5"]
+    assert ledger.record({"eventId": "e1", "eventType": "Chat", "aggregateId": "c1"})
+
+    clock = [0.0]
+    monkeypatch.setattr("src.events.bridge.time.monotonic", lambda: clock[0])
+    aged = NodeEventLedger(max_age_seconds=10)
+    aged.record({"eventType": "Chat", "aggregateId": "c1"})
+    clock[0] = 11.0
+    aged.record({"eventType": "Chat", "aggregateId": "c1"})
+    assert [e["seq"] for e in aged.recent(aggregate_id="c1")] == [2]
+
+
+@pytest.mark.asyncio
+async def test_recent_events_endpoint_filters_and_returns_cursor() -> None:
+    ledger = NodeEventLedger()
+    for seq in range(3):
+        ledger.record({"eventType": "Chat", "aggregateId": "c1", "payload": {"n": seq}})
+    ledger.record({"eventType": "Task", "aggregateId": "t1"})
+    agent_manager["node_event_ledger"] = ledger
+    app = FastAPI()
+    app.include_router(events_router.router, prefix="/api/events")
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            first = (
+                await client.get(
+                    "/api/events/recent", params={"aggregateId": "c1", "after": 0, "limit": 2}
+                )
+            ).json()
+            cursor = {"aggregateId": "c1", "after": first["nextCursor"]}
+            rest = (await client.get("/api/events/recent", params=cursor)).json()
+            by_type = (await client.get("/api/events/recent", params={"type": "Task"})).json()
+    finally:
+        agent_manager.pop("node_event_ledger", None)
+
+    assert [e["payload"]["n"] for e in first["events"]] == [0, 1]
+    assert [e["payload"]["n"] for e in rest["events"]] == [2]
+    assert [e["aggregateId"] for e in by_type["events"]] == ["t1"]
+    assert by_type["nextCursor"] == 4
+
+
 @pytest.mark.asyncio
 async def test_agent_event_publisher(monkeypatch: pytest.MonkeyPatch) -> None:
     mock_client = MagicMock()
@@ -30,3 +99,141 @@ async def test_agent_event_publisher(monkeypatch: pytest.MonkeyPatch) -> None:
 
     mock_client.post.assert_awaited()
     mock_client.aclose.assert_awaited()
+
+
+def _client(monkeypatch: pytest.MonkeyPatch, *outcomes: Exception | None) -> MagicMock:
+    """Fake httpx client whose posts fail with the given errors in turn, then succeed."""
+    client = MagicMock()
+    client.aclose = AsyncMock()
+    client.sent = []
+    pending = list(outcomes)
+
+    async def post(url: str, json: object) -> MagicMock:
+        client.sent.append((url, copy.deepcopy(json)))
+        error = pending.pop(0) if pending else None
+        if error is not None:
+            raise error
+        return MagicMock(raise_for_status=lambda: None)
+
+    client.post = AsyncMock(side_effect=post)
+    monkeypatch.setattr("src.events.bridge.httpx.AsyncClient", lambda timeout: client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_publisher_batches_and_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _client(monkeypatch, httpx.ConnectError("down"))
+    publisher = AgentEventPublisher(
+        "http://localhost",
+        "/events",
+        batch_path="/events/batch",
+        retry_backoff=0,
+        flush_interval=0.05,
+    )
+
+    for index in range(3):
+        assert await publisher.publish_event("Test", f"agg-{index}")
+    await publisher.close()
+
+    assert [url for url, _ in client.sent] == ["http://localhost/events/batch"] * 2
+    sent = client.sent[-1][1]
+    assert [event["aggregateId"] for event in sent] == ["agg-0", "agg-1", "agg-2"]
+    assert len({event["eventId"] for event in sent}) == 3
+
+
+@pytest.mark.asyncio
+async def test_publisher_spools_during_outage_and_replays(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    spool = tmp_path / "events.jsonl"
+    _client(monkeypatch, *[httpx.ConnectError("down")] * 2)
+    down = AgentEventPublisher("http://localhost", "/events", max_retries=0, spool_path=str(spool))
+    await down.publish_event("Test", "agg-1")
+    await down.publish_event("Test", "agg-2")
+    await down.close()
+    assert len(spool.read_text().splitlines()) == 2
+
+    client = _client(monkeypatch)
+    recovered = AgentEventPublisher("http://localhost", "/events", spool_path=str(spool))
+    assert recovered.status()["spooled"] == 2
+    recovered.start()
+    await asyncio.sleep(0.01)
+    await recovered.close()
+
+    assert [event["aggregateId"] for _, event in client.sent] == ["agg-1", "agg-2"]
+    assert spool.read_text() == ""
+
+
+def _rejected(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://localhost/events")
+    return httpx.HTTPStatusError(
+        "rejected", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+@pytest.mark.asyncio
+async def test_publisher_drops_only_the_rejected_event(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _client(monkeypatch, None, _rejected(400))
+    publisher = AgentEventPublisher(
+        "http://localhost", "/events", retry_backoff=0, flush_interval=0.05
+    )
+
+    for aggregate_id in ("agg-1", "", "agg-3"):
+        await publisher.publish_event("Test", aggregate_id)
+    await publisher.close()
+
+    assert [event["aggregateId"] for _, event in client.sent] == ["agg-1", "", "agg-3"]
+
+
+@pytest.mark.asyncio
+async def test_publisher_close_spools_only_undelivered_events(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    spool = tmp_path / "events.jsonl"
+    client = _client(monkeypatch, None, httpx.ConnectError("down"))
+    publisher = AgentEventPublisher(
+        "http://localhost",
+        "/events",
+        retry_backoff=60,
+        flush_interval=0.05,
+        spool_path=str(spool),
+        drain_timeout=0.05,
+    )
+
+    for aggregate_id in ("agg-1", "agg-2", "agg-3"):
+        await publisher.publish_event("Test", aggregate_id)
+    await publisher.close()
+
+    assert [event["aggregateId"] for _, event in client.sent] == ["agg-1", "agg-2"]
+    spooled = [json.loads(line)["aggregateId"] for line in spool.read_text().splitlines()]
+    assert spooled == ["agg-2", "agg-3"]
+
+
+@pytest.mark.asyncio
+async def test_spool_keeps_events_until_replay_delivers_them(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    spool = tmp_path / "events.jsonl"
+    spool.write_text(
+        "".join(
+            json.dumps({"eventId": f"e-{i}", "aggregateId": f"agg-{i}"}) + "\n" for i in (1, 2, 3)
+        )
+    )
+    client = _client(monkeypatch, None, httpx.ConnectError("down"))
+    publisher = AgentEventPublisher(
+        "http://localhost", "/events", batch_size=1, retry_backoff=60, spool_path=str(spool)
+    )
+
+    publisher.start()
+    for _ in range(100):
+        if len(client.sent) == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    # The process could die here, stuck retrying agg-2: nothing undelivered may be gone yet
+    remaining_lines = spool.read_text().splitlines()
+    assert [json.loads(line)["aggregateId"] for line in remaining_lines] == ["agg-2", "agg-3"]
+    assert publisher.status()["spooled"] == 2
+    await publisher.close()
+    # Shutdown mid-replay neither loses nor duplicates them
+    assert spool.read_text().splitlines() == remaining_lines
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from agentscope.message import Msg
+from prometheus_client import REGISTRY
+
+from src.agents.handoff import HandoffCapacityError, HandoffQueue
+from src.agents.human_agent_adapter import HumanAgentAdapter
+
+
+@pytest.mark.asyncio
+async def test_input_before_wait_is_buffered_not_lost() -> None:
+    queue = HandoffQueue()
+
+    assert queue.deliver("c1", {"content": "早到的回复"}) == "buffered"
+    assert queue.status()["buffered_inputs"] == 1
+
+    assert await queue.wait("c1", timeout=0.01) == {"content": "早到的回复"}
+    assert queue.status() == {
+        "open": {"blocking": 0, "async": 0},
+        "max_open": 1000,
+        "buffered_inputs": 0,
+        "conversations": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_waiters_on_one_conversation_are_served_in_order() -> None:
+    queue = HandoffQueue()
+    first = asyncio.ensure_future(queue.wait("c1", timeout=1))
+    second = asyncio.ensure_future(queue.wait("c1", timeout=1))
+    await asyncio.sleep(0)
+    assert queue.open_count == 2
+
+    queue.deliver("c1", {"content": "a"})
+    queue.deliver("c1", {"content": "b"})
+
+    assert await first == {"content": "a"}
+    assert await second == {"content": "b"}
+    assert queue.open_count == 0
+
+
+@pytest.mark.asyncio
+async def test_capacity_and_buffer_limits() -> None:
+    queue = HandoffQueue(max_open=1, buffer_size=2)
+    waiter = asyncio.ensure_future(queue.wait("c1", timeout=0.05))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HandoffCapacityError):
+        await queue.wait("c2", timeout=0.05)
+    assert await waiter is None
+
+    for content in ("a", "b", "c"):
+        queue.deliver("c3", {"content": content})
+    assert await queue.wait("c3", timeout=0) == {"content": "b"}
+
+
+def _handoff_events(event: str) -> float:
+    value = REGISTRY.get_sample_value("agentscope_handoff_events_total", {"event": event})
+    return value or 0.0
+
+
+@pytest.mark.asyncio
+async def test_unclaimed_inputs_are_bounded_across_conversations() -> None:
+    queue = HandoffQueue(buffer_size=4, buffer_ttl=60, max_buffered=3)
+    dropped = _handoff_events("dropped")
+    for index in range(5):
+        queue.deliver(f"c{index}", {"content": str(index)})
+
+    assert queue.status()["buffered_inputs"] == 3
+    assert queue.status()["conversations"] == 3
+    assert _handoff_events("dropped") - dropped == 2
+    assert await queue.wait("c0", timeout=0) is None
+    assert await queue.wait("c4", timeout=0) == {"content": "4"}
+
+
+@pytest.mark.asyncio
+async def test_expired_inputs_are_pruned_when_new_input_arrives() -> None:
+    queue = HandoffQueue(buffer_ttl=0.01)
+    expired = _handoff_events("expired")
+    queue.deliver("idle-1", {"content": "a"})
+    queue.deliver("idle-2", {"content": "b"})
+    await asyncio.sleep(0.02)
+
+    queue.deliver("c1", {"content": "c"})
+
+    assert queue.status()["buffered_inputs"] == 1
+    assert queue.status()["conversations"] == 1
+    assert _handoff_events("expired") - expired == 2
+
+
+@pytest.mark.asyncio
+async def test_pending_handoff_resumes_on_input_or_expiry() -> None:
+    queue = HandoffQueue()
+    resumed: list[tuple[str, Any]] = []
+
+    async def resume(handoff_id: str, item: dict[str, Any] | None) -> None:
+        resumed.append((handoff_id, item))
+
+    answered = queue.open_pending("c1", resume, ttl=10)
+    expiring = queue.open_pending("c2", resume, ttl=0.01)
+    assert queue.status()["open"] == {"blocking": 0, "async": 2}
+
+    assert queue.deliver("c1", {"content": "人工回复"}) == "resumed"
+    await asyncio.sleep(0.05)
+
+    assert resumed == [(answered, {"content": "人工回复"}), (expiring, None)]
+    assert queue.open_count == 0
+
+
+@pytest.mark.asyncio
+async def test_adapter_request_async_returns_before_human_answers() -> None:
+    ws_manager = MagicMock()
+    ws_manager.send_to_client = AsyncMock()
+    adapter = HumanAgentAdapter("Human", ws_manager)
+    done = asyncio.Event()
+    replies: list[Any] = []
+
+    async def resume(handoff_id: str, item: dict[str, Any] | None) -> None:
+        replies.append(item)
+        done.set()
+
+    msg = Msg(name="user", content="需要人工", role="user", metadata={"conversationId": "c1"})
+    handoff_id = await adapter.request_async(msg, resume)
+
+    assert ws_manager.send_to_client.await_args.args[1]["handoffId"] == handoff_id
+    adapter.receive_human_input("c1", "已处理", {"agent": "h1"})
+    await asyncio.wait_for(done.wait(), 1)
+    assert replies == [{"content": "已处理", "metadata": {"agent": "h1"}}]
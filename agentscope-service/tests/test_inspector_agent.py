@@ -14,7 +14,7 @@ from agentscope.model import OpenAIChatModel
 from agentscope.tool import Toolkit
 
 from src.agents.inspector_agent import InspectorAgent
-from src.tools.mcp_tools import BackendMCPClient
+from src.tools.mcp_tools import BackendMCPClient, ToolResult
 
 
 @pytest.fixture
@@ -333,7 +333,10 @@ class TestInspectorPrefetch:
         inspector_agent: InspectorAgent,
         mock_mcp_client: BackendMCPClient,
     ) -> None:
-        mock_mcp_client.call_tool.return_value = []
+        mock_mcp_client.call_tools_batch = AsyncMock(return_value=[
+            ToolResult("getConversationHistory", result=[{"role": "user", "content": "hi"}]),
+            ToolResult("getCustomerHistory", error="boom"),
+        ])
         msg = Msg(
             name="user",
             content="hi",
@@ -341,7 +344,23 @@ class TestInspectorPrefetch:
             metadata={"conversationId": "conv-1", "customerId": "cust-1"},
         )
         await inspector_agent._prefetch_context(msg)
-        assert "prefetch" in msg.metadata
+        assert msg.metadata["prefetch"] == {
+            "conversation_history": [{"role": "user", "content": "hi"}],
+        }
+
+    async def test_prefetch_keeps_history_failure_marker(
+        self,
+        inspector_agent: InspectorAgent,
+        mock_mcp_client: BackendMCPClient,
+    ) -> None:
+        mock_mcp_client.call_tools_batch = AsyncMock(return_value=[
+            ToolResult("getConversationHistory", error="boom"),
+        ])
+        msg = Msg(name="user", content="hi", role="user", metadata={"conversationId": "conv-1"})
+        await inspector_agent._prefetch_context(msg)
+        assert msg.metadata["prefetch"] == {
+            "conversation_history": [{"role": "system", "content": "获取对话历史失败: boom"}],
+        }
 
     def test_inject_prefetch_context(
         self,
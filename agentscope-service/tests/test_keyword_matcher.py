@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pytest
+
+from src.heuristics import DEFAULT_KEYWORD_TABLES, KeywordMatcher, load_keyword_tables
+
+
+def _naive(tables: dict[str, list[str]], text: str) -> dict[str, set[str]]:
+    lowered = text.lower()
+    hits: dict[str, set[str]] = {}
+    for category, keywords in tables.items():
+        found = {kw.lower() for kw in keywords if kw.lower() in lowered}
+        if found:
+            hits[category] = found
+    return hits
+
+
+def test_scan_reports_overlapping_matches_across_categories() -> None:
+    matcher = KeywordMatcher({"a": ["he", "she", "hers"], "b": ["his", "rs"]})
+
+    hits = matcher.scan("uSHErs and his")
+
+    assert hits == {"a": {"he", "she", "hers"}, "b": {"rs", "his"}}
+    assert hits.count("a") == 3
+    assert not hits.has("c")
+
+
+def test_scan_matches_naive_substring_search() -> None:
+    matcher = KeywordMatcher(DEFAULT_KEYWORD_TABLES)
+    alphabet = "".join(
+        sorted({ch for kws in DEFAULT_KEYWORD_TABLES.values() for kw in kws for ch in kw})
+    )
+    rng = random.Random(7)
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet + "的了 ?") for _ in range(rng.randint(0, 60)))
+        assert matcher.scan(text) == _naive(DEFAULT_KEYWORD_TABLES, text), text
+
+
+def test_long_texts_scanned_per_keyword_agree_with_automaton() -> None:
+    tables = {"a": ["Hello", "lo w"], "b": ["报错", "500"]}
+    small = KeywordMatcher(tables, cache_size=0)
+    padded = {**tables, "pad": [f"填充{i}" for i in range(200)]}
+    large = KeywordMatcher(padded, cache_size=0)
+    text = "x" * 300 + "HELLO World, 接口报错 500"
+
+    assert small._naive_min_chars is not None and large._naive_min_chars is None
+    assert (
+        small.scan(text) == _naive(tables, text) == {"a": {"hello", "lo w"}, "b": {"报错", "500"}}
+    )
+    assert large.scan(text) == _naive(padded, text)
+
+
+def test_cache_lookup_is_not_interleaved_with_worker_threads() -> None:
+    matcher = KeywordMatcher(DEFAULT_KEYWORD_TABLES, cache_size=1)
+    workers: list[threading.Thread] = []
+
+    class _Interleaving(OrderedDict):  # type: ignore[type-arg]
+        def get(self, key: str, default: object = None) -> object:
+            value = super().get(key, default)
+            if value is not None and not workers:
+                # A worker thread scans another text right after this lookup, evicting ``key``
+                workers.append(threading.Thread(target=matcher.scan, args=("另一条投诉",)))
+                workers[0].start()
+                workers[0].join(timeout=0.2)
+            return value
+
+    matcher.scan("接口报错")
+    matcher._cache = _Interleaving(matcher._cache)
+
+    assert matcher.scan("接口报错").has("fault")
+    workers[0].join()
+    assert list(matcher._cache) == ["另一条投诉"]
+
+
+def test_scan_empty_text() -> None:
+    assert KeywordMatcher(DEFAULT_KEYWORD_TABLES).scan(None) == {}
+
+
+def test_load_keyword_tables_extends_defaults(tmp_path: Path) -> None:
+    json_file = tmp_path / "keywords.json"
+    json_file.write_text(json.dumps({"fault": ["超时"], "billing": ["发票"]}), encoding="utf-8")
+    yaml_file = tmp_path / "keywords.yaml"
+    yaml_file.write_text("fault: [超时, 宕机]\n", encoding="utf-8")
+
+    tables = load_keyword_tables(str(json_file))
+    assert tables["fault"][-1] == "超时"
+    assert tables["billing"] == ["发票"]
+    assert load_keyword_tables(str(yaml_file))["fault"].count("宕机") == 1
+
+    hits = KeywordMatcher(tables).scan("接口超时，开不了发票")
+    assert hits.has("fault") and hits.has("billing")
+
+
+def test_load_keyword_tables_rejects_bad_file(tmp_path: Path) -> None:
+    bad = tmp_path / "keywords.json"
+    bad.write_text(json.dumps({"fault": {"nested": 1}}), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        load_keyword_tables(str(bad))
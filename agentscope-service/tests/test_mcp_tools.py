@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
+import httpx
 import pytest
 
-from src.tools.mcp_tools import BackendMCPClient, setup_toolkit
+from src.tools.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.tools.mcp_tools import BackendMCPClient, ToolCall, setup_toolkit
 from src.config import settings as settings_module
+from src.config.settings import _parse_float_map
 
 
 @pytest.mark.asyncio
@@ -97,3 +102,236 @@ async def test_setup_toolkit_register_failure(monkeypatch: pytest.MonkeyPatch) -
     bundle = await setup_toolkit()
 
     assert bundle.toolkit is mock_toolkit
+
+
+def _ok_http() -> MagicMock:
+    mock_http = MagicMock()
+    mock_http.post = AsyncMock(return_value=MagicMock(
+        json=lambda: {"result": {}},
+        raise_for_status=lambda: None,
+    ))
+    return mock_http
+
+
+@pytest.mark.asyncio
+async def test_backend_mcp_client_uses_per_tool_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = BackendMCPClient(
+        "http://localhost", timeout=12.0, tool_timeouts={"inspectConversation": 60.0}
+    )
+    mock_http = _ok_http()
+    monkeypatch.setattr(client, "_client_instance", AsyncMock(return_value=mock_http))
+
+    await client.call_tool("inspectConversation")
+    await client.call_tool("getCustomerProfile")
+
+    timeouts = [c.kwargs["timeout"] for c in mock_http.post.await_args_list]
+    assert timeouts == [60.0, 12.0]
+
+
+@pytest.mark.asyncio
+async def test_backend_mcp_client_routes_slow_tools_to_own_pool() -> None:
+    client = BackendMCPClient("http://localhost", slow_tools={"inspectConversation"})
+    fast, slow = _ok_http(), _ok_http()
+    client._client, client._slow_client = fast, slow
+
+    await client.call_tool("inspectConversation")
+    await client.call_tool("getCustomerProfile")
+
+    slow.post.assert_awaited_once()
+    fast.post.assert_awaited_once()
+    assert client._in_flight == {"default": 0, "slow": 0}
+
+
+@pytest.mark.asyncio
+async def test_backend_mcp_client_falls_back_without_h2(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("src.tools.mcp_tools._http2_available", lambda: False)
+    client = BackendMCPClient(
+        "http://localhost",
+        limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+        http2=True,
+    )
+
+    instance = await client._client_instance()
+
+    assert isinstance(instance, httpx.AsyncClient)
+    await client.close()
+
+
+def test_parse_float_map_skips_malformed_items() -> None:
+    parsed = _parse_float_map("a=1.5, b = 2,broken,c=x,=3")
+
+    assert parsed == {"a": 1.5, "b": 2.0}
+
+
+def _json_http(body: object) -> MagicMock:
+    mock_http = MagicMock()
+    mock_http.post = AsyncMock(return_value=MagicMock(
+        json=lambda: body,
+        raise_for_status=lambda: None,
+    ))
+    return mock_http
+
+
+@pytest.mark.asyncio
+async def test_call_tools_batch_demultiplexes_partial_failures(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = BackendMCPClient("http://localhost")
+    mock_http = _json_http([
+        {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "boom"}},
+        {"jsonrpc": "2.0", "id": 0, "result": {"score": 0.9}},
+    ])
+    monkeypatch.setattr(client, "_client_instance", AsyncMock(return_value=mock_http))
+
+    results = await client.call_tools_batch([
+        ToolCall("analyzeConversation", {"conversationId": "c1"}),
+        ToolCall("getCustomerProfile", {"customerId": "u1"}),
+        ToolCall("searchKnowledge", {"query": "q"}),
+    ])
+
+    mock_http.post.assert_awaited_once()
+    payload = mock_http.post.await_args.kwargs["json"]
+    assert [item["params"]["name"] for item in payload] == [
+        "analyzeConversation", "getCustomerProfile", "searchKnowledge",
+    ]
+    assert results[0].ok and results[0].result == {"score": 0.9}
+    assert results[1].error == "boom"
+    assert not results[2].ok
+
+
+@pytest.mark.asyncio
+async def test_call_tools_batch_falls_back_when_backend_lacks_batching(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = BackendMCPClient("http://localhost")
+    # A backend that ignores batch bodies answers with its tool listing
+    monkeypatch.setattr(
+        client, "_client_instance", AsyncMock(return_value=_json_http({"tools": []}))
+    )
+    call_tool = AsyncMock(side_effect=[{"a": 1}, RuntimeError("down")])
+    monkeypatch.setattr(client, "_call_tool", call_tool)
+
+    results = await client.call_tools_batch([ToolCall("a"), ToolCall("b")])
+
+    assert client.supports_batch is False
+    assert results[0].result == {"a": 1}
+    assert results[1].error == "down"
+
+
+@pytest.mark.asyncio
+async def test_call_tools_batch_reports_transport_failure_per_call(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = BackendMCPClient("http://localhost")
+    mock_http = MagicMock()
+    mock_http.post = AsyncMock(side_effect=httpx.ConnectError("refused"))
+    monkeypatch.setattr(client, "_client_instance", AsyncMock(return_value=mock_http))
+
+    results = await client.call_tools_batch([ToolCall("a"), ToolCall("b")])
+
+    assert [r.error for r in results] == ["refused", "refused"]
+    assert client.supports_batch is True
+
+
+def _gated_call_tool(gate: asyncio.Event, calls: list[str]) -> Any:
+    async def call_tool(name: str, arguments: dict[str, Any]) -> dict[str, Any]:
+        calls.append(name)
+        await gate.wait()
+        return {"tool": name, "args": arguments}
+
+    return call_tool
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_identical_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = BackendMCPClient("http://localhost", single_flight_tools={"getCustomerProfile"})
+    gate, calls = asyncio.Event(), []
+    monkeypatch.setattr(client, "_call_tool", _gated_call_tool(gate, calls))
+
+    tasks = [
+        asyncio.ensure_future(client.call_tool("getCustomerProfile", customerId="c1"))
+        for _ in range(3)
+    ]
+    other = asyncio.ensure_future(client.call_tool("getCustomerProfile", customerId="c2"))
+    await asyncio.sleep(0)
+    gate.set()
+    results = await asyncio.gather(*tasks, other)
+
+    assert calls == ["getCustomerProfile", "getCustomerProfile"]
+    assert results[0] == results[1] == results[2]
+    assert results[0] is not results[1]
+    assert not client._flights
+
+
+@pytest.mark.asyncio
+async def test_single_flight_skips_side_effect_tools(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = BackendMCPClient("http://localhost", single_flight_tools={"createTask"})
+    gate, calls = asyncio.Event(), []
+    monkeypatch.setattr(client, "_call_tool", _gated_call_tool(gate, calls))
+
+    tasks = [asyncio.ensure_future(client.call_tool("createTask", title="t")) for _ in range(2)]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    assert calls == ["createTask", "createTask"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_survives_one_cancelled_waiter(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = BackendMCPClient("http://localhost", single_flight_tools={"searchKnowledge"})
+    gate, calls = asyncio.Event(), []
+    monkeypatch.setattr(client, "_call_tool", _gated_call_tool(gate, calls))
+
+    first = asyncio.ensure_future(client.call_tool("searchKnowledge", query="q"))
+    second = asyncio.ensure_future(client.call_tool("searchKnowledge", query="q"))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert (await second)["tool"] == "searchKnowledge"
+    assert first.cancelled()
+    assert calls == ["searchKnowledge"]
+
+
+@pytest.mark.asyncio
+async def test_single_flight_cancels_abandoned_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = BackendMCPClient("http://localhost", single_flight_tools={"searchKnowledge"})
+    gate, calls = asyncio.Event(), []
+    monkeypatch.setattr(client, "_call_tool", _gated_call_tool(gate, calls))
+
+    only = asyncio.ensure_future(client.call_tool("searchKnowledge", query="q"))
+    await asyncio.sleep(0)
+    flight = next(iter(client._flights.values()))
+    only.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await only
+
+    with pytest.raises(asyncio.CancelledError):
+        await flight.task
+    assert calls == ["searchKnowledge"]
+    assert not client._flights
+
+
+@pytest.mark.asyncio
+async def test_single_flight_leader_deadline_does_not_fail_followers(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = BackendMCPClient("http://localhost", single_flight_tools={"getCustomerProfile"})
+    gate, calls = asyncio.Event(), []
+    monkeypatch.setattr(client, "_call_tool", _gated_call_tool(gate, calls))
+
+    async def hurried() -> dict[str, Any]:
+        with deadline_scope(Deadline.after(0.01)):
+            return await client.call_tool("getCustomerProfile", customerId="c1")
+
+    leader = asyncio.ensure_future(hurried())
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(client.call_tool("getCustomerProfile", customerId="c1"))
+    with pytest.raises(DeadlineExceeded):
+        await leader
+    gate.set()
+
+    assert (await follower)["args"] == {"customerId": "c1"}
+    assert calls == ["getCustomerProfile"]
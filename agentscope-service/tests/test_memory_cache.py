@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from agentscope.message import Msg
+
+from src.memory import memory_cache as memory_cache_module
+from src.memory.memory_cache import HydratedMemoryCache
+from src.memory.persistent_memory import PersistentMemory
+
+
+def _msg(text: str) -> Msg:
+    return Msg(name="user", content=text, role="user")
+
+
+@pytest.fixture
+def persistence() -> MagicMock:
+    client = MagicMock()
+    client.supports_memory_delta = False
+    client.record_agent_memory = AsyncMock()
+    client.load_agent_memory = AsyncMock(
+        return_value={"memory": {"content": [_msg("stored").to_dict()], "seq": 3}}
+    )
+    client.load_agent_memory_version = AsyncMock(return_value=3)
+    return client
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = HydratedMemoryCache(max_size=2)
+    cache.put("c1", "A", [], 1)
+    cache.put("c2", "A", [], 1)
+    cache.get("c1", "A")
+    cache.put("c3", "A", [], 1)
+
+    assert cache.get("c1", "A") is not None
+    assert cache.get("c2", "A") is None
+    assert len(cache) == 2
+
+
+def test_cache_expires_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(memory_cache_module.time, "monotonic", lambda: now[0])
+    cache = HydratedMemoryCache(ttl=10.0, revalidate_after=5.0)
+    cache.put("c1", "A", [], 1)
+
+    now[0] = 106.0
+    entry = cache.get("c1", "A")
+    assert entry is not None and cache.needs_revalidation(entry)
+
+    now[0] = 111.0
+    assert cache.get("c1", "A") is None
+
+
+def test_invalidate_whole_conversation() -> None:
+    cache = HydratedMemoryCache()
+    cache.put("c1", "A", [], 1)
+    cache.put("c1", "B", [], 1)
+    cache.put("c2", "A", [], 1)
+
+    cache.invalidate("c1")
+
+    assert cache.get("c1", "A") is None
+    assert cache.get("c1", "B") is None
+    assert cache.get("c2", "A") is not None
+
+
+@pytest.mark.asyncio
+async def test_warm_hydrate_skips_backend(persistence: MagicMock) -> None:
+    cache = HydratedMemoryCache()
+    first = PersistentMemory(persistence, "c1", "A", cache=cache)
+    await first.hydrate()
+    await first.add(_msg("turn"))
+
+    second = PersistentMemory(persistence, "c1", "A", cache=cache)
+    await second.hydrate()
+
+    persistence.load_agent_memory.assert_awaited_once()
+    persistence.load_agent_memory_version.assert_not_awaited()
+    assert [m.content for m in await second.get_memory()] == ["stored", "turn"]
+
+
+@pytest.mark.asyncio
+async def test_revalidation_reuses_entry_when_seq_matches(persistence: MagicMock) -> None:
+    cache = HydratedMemoryCache(revalidate_after=0.0)
+    await PersistentMemory(persistence, "c1", "A", cache=cache).hydrate()
+
+    memory = PersistentMemory(persistence, "c1", "A", cache=cache)
+    await memory.hydrate()
+
+    persistence.load_agent_memory.assert_awaited_once()
+    persistence.load_agent_memory_version.assert_awaited_once()
+    assert [m.content for m in await memory.get_memory()] == ["stored"]
+
+
+@pytest.mark.asyncio
+async def test_revalidation_reloads_when_backend_moved_on(persistence: MagicMock) -> None:
+    cache = HydratedMemoryCache(revalidate_after=0.0)
+    await PersistentMemory(persistence, "c1", "A", cache=cache).hydrate()
+    persistence.load_agent_memory_version.return_value = 7
+
+    await PersistentMemory(persistence, "c1", "A", cache=cache).hydrate()
+
+    assert persistence.load_agent_memory.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_invalidates_entry(persistence: MagicMock) -> None:
+    cache = HydratedMemoryCache()
+    memory = PersistentMemory(persistence, "c1", "A", cache=cache)
+    await memory.hydrate()
+    persistence.record_agent_memory.side_effect = RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        await memory.add(_msg("lost"))
+
+    assert cache.get("c1", "A") is None
@@ -5,6 +5,7 @@ OrchestratorAgent单元测试
 from __future__ import annotations
 
 import asyncio
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -350,10 +351,10 @@ class TestCoordination:
     async def test_execute_parallel_timeout(
         self, orchestrator: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        async def _raise_timeout(*args: object, **kwargs: object) -> None:
-            raise asyncio.TimeoutError()
+        async def _nothing_done(fs: Any, *args: object, **kwargs: object) -> tuple[set, set]:
+            return set(), set(fs)
 
-        monkeypatch.setattr(asyncio, "wait_for", _raise_timeout)
+        monkeypatch.setattr(asyncio, "wait", _nothing_done)
         msg = Msg(name="user", content="测试", role="user", metadata={"conversationId": "c-timeout"})
 
         result = await orchestrator._execute_parallel(msg, analysis={"scenario": "fault"})
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from agentscope.message import Msg
+from prometheus_client import REGISTRY
+
+from src.agents.human_agent_adapter import HumanAgentAdapter
+from src.agents.streaming import TokenStream, publish_delta, stream_to
+from src.config.settings import settings
+from src.router.orchestrator_agent import OrchestratorAgent
+from src.tools.deadline import Deadline, check_deadline, deadline_scope
+from src.tools.mcp_tools import ToolResult
+
+
+@pytest.fixture
+def orchestrator() -> OrchestratorAgent:
+    mcp_client = MagicMock()
+    mcp_client.call_tools_batch = AsyncMock(
+        return_value=[
+            ToolResult("analyzeConversation", {"overallSentiment": "neutral", "riskLevel": "low"}),
+            ToolResult("getCustomerProfile", {"isVIP": True}),
+        ]
+    )
+    return OrchestratorAgent(
+        assistant_agent=AsyncMock(),
+        engineer_agent=AsyncMock(),
+        human_agent=MagicMock(),
+        mcp_client=mcp_client,
+        persistence=None,
+        ws_manager=MagicMock(),
+    )
+
+
+def _msg(content: str, **metadata: object) -> Msg:
+    return Msg(
+        name="user",
+        content=content,
+        role="user",
+        metadata={"conversationId": "c1", "customerId": "u1", **metadata},
+    )
+
+
+def _decisions(tier: str, mode: str) -> float:
+    return (
+        REGISTRY.get_sample_value(
+            "agentscope_routing_decisions_total", {"tier": tier, "mode": mode}
+        )
+        or 0.0
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_complaint_skips_remote_analysis(orchestrator: OrchestratorAgent) -> None:
+    before = _decisions("local", "human_first")
+
+    analysis, mode = await orchestrator._decide(_msg("服务太差了，我要投诉"))
+
+    assert mode == "human_first"
+    assert analysis["decision_tier"] == "local"
+    assert analysis["risk_level"] == "unknown"
+    orchestrator.mcp_client.call_tools_batch.assert_not_awaited()
+    assert _decisions("local", "human_first") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_local_complaint_handoff_still_gets_customer_context(
+    orchestrator: OrchestratorAgent,
+) -> None:
+    orchestrator.mcp_client.call_tool = AsyncMock(return_value=[{"title": "投诉处理流程"}])
+    orchestrator.ws_manager.send_to_client = AsyncMock()
+
+    response = await orchestrator.route(_msg("服务太差了，我要投诉", async_review=True))
+
+    assert response.metadata["execution_mode"] == "human_first_async"
+    frame = orchestrator.ws_manager.send_to_client.await_args.args[1]
+    assert frame["suggestions"] == [{"title": "投诉处理流程"}]
+    assert frame["context"] == {
+        "sentiment": {"overallSentiment": "neutral", "riskLevel": "low"},
+        "customer": {"isVIP": True},
+        "risk_level": "low",
+    }
+
+
+@pytest.mark.asyncio
+async def test_explicit_mode_skips_remote_analysis(orchestrator: OrchestratorAgent) -> None:
+    _, human = await orchestrator._decide(_msg("你好", mode="human_first"))
+    _, staged = await orchestrator._decide(
+        _msg("你好", mode="agent_supervised", prompt_stage="reply")
+    )
+
+    assert (human, staged) == ("human_first", "agent_supervised")
+    orchestrator.mcp_client.call_tools_batch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_request_is_enriched_remotely(orchestrator: OrchestratorAgent) -> None:
+    analysis, mode = await orchestrator._decide(_msg("请问发票怎么开"))
+
+    # Locally a simple consultation; the VIP profile moves it to human_first
+    assert mode == "human_first"
+    assert analysis["decision_tier"] == "remote"
+    assert analysis["customer"] == {"isVIP": True}
+    orchestrator.mcp_client.call_tools_batch.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_explicit_agent_mode_still_needs_remote_for_stage(
+    orchestrator: OrchestratorAgent,
+) -> None:
+    analysis, mode = await orchestrator._decide(_msg("系统报错", mode="agent_supervised"))
+
+    assert mode == "agent_supervised"
+    assert analysis["decision_tier"] == "remote"
+    assert orchestrator._decide_assistant_stage(_msg("系统报错"), analysis) == "vip_reply"
+
+
+@pytest.mark.asyncio
+async def test_fast_path_can_be_disabled(
+    orchestrator: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "routing_fast_path", False)
+
+    analysis, mode = await orchestrator._decide(_msg("我要投诉"))
+
+    assert mode == "human_first"
+    assert analysis["decision_tier"] == "remote"
+    orchestrator.mcp_client.call_tools_batch.assert_awaited_once()
+
+
+def _speculations(result: str) -> float:
+    return (
+        REGISTRY.get_sample_value("agentscope_speculative_assistant_total", {"result": result})
+        or 0.0
+    )
+
+
+@pytest.fixture
+def speculative(
+    orchestrator: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
+) -> OrchestratorAgent:
+    monkeypatch.setattr(settings, "speculative_assistant", True)
+    orchestrator.mcp_client.call_tools_batch.return_value = [
+        ToolResult("analyzeConversation", {"overallSentiment": "neutral", "riskLevel": "low"}),
+        ToolResult("getCustomerProfile", {}),
+    ]
+    return orchestrator
+
+
+@pytest.mark.asyncio
+async def test_speculative_reply_is_used_when_decision_agrees(
+    speculative: OrchestratorAgent,
+) -> None:
+    speculative.assistant_agent.return_value = Msg(
+        name="AssistantAgent", content="您好", role="assistant"
+    )
+    before = _speculations("hit")
+
+    response = await speculative.route(_msg("请问发票怎么开"))
+
+    assert response.content == "您好"
+    assert response.metadata["execution_mode"] == "simple"
+    speculative.assistant_agent.assert_awaited_once()
+    assert _speculations("hit") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_speculative_reply_is_cancelled_when_decision_differs(
+    speculative: OrchestratorAgent,
+) -> None:
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def slow_reply(msg: Msg) -> Msg:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return msg
+
+    async def high_risk(calls: object) -> list[ToolResult]:
+        await started.wait()
+        return [
+            ToolResult(
+                "analyzeConversation", {"overallSentiment": "negative", "riskLevel": "high"}
+            ),
+            ToolResult("getCustomerProfile", {}),
+        ]
+
+    speculative.assistant_agent.side_effect = slow_reply
+    speculative.mcp_client.call_tools_batch.side_effect = high_risk
+    speculative.ws_manager.send_to_client = AsyncMock()
+    before = _speculations("miss")
+
+    response = await speculative.route(_msg("请问发票怎么开", async_review=True))
+    await asyncio.wait_for(cancelled.wait(), 1)
+
+    assert response.metadata["execution_mode"] == "human_first_async"
+    assert _speculations("miss") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_speculation_is_cancelled_before_other_modes_start(
+    speculative: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    started = asyncio.Event()
+    states: list[bool] = []
+    speculative_task: list[asyncio.Task[object]] = []
+
+    async def slow_reply(msg: Msg) -> Msg:
+        speculative_task.append(asyncio.current_task())
+        started.set()
+        await asyncio.sleep(10)
+        return msg
+
+    async def fault(calls: object) -> list[ToolResult]:
+        await started.wait()
+        return [
+            ToolResult("analyzeConversation", {"overallSentiment": "neutral", "riskLevel": "low"}),
+            ToolResult("getCustomerProfile", {}),
+        ]
+
+    async def parallel(msg: Msg, analysis: dict[str, object]) -> Msg:
+        await asyncio.sleep(0)
+        states.append(speculative_task[0].done())
+        return msg
+
+    speculative.assistant_agent.side_effect = slow_reply
+    speculative.mcp_client.call_tools_batch.side_effect = fault
+    monkeypatch.setattr(speculative, "_decide_execution_mode", lambda analysis: "parallel")
+    monkeypatch.setattr(speculative, "_execute_parallel", parallel)
+
+    await speculative.route(_msg("请问发票怎么开"))
+
+    assert states == [True]
+    assert speculative_task[0].cancelled()
+
+
+@pytest.mark.asyncio
+async def test_speculation_is_off_by_default(orchestrator: OrchestratorAgent) -> None:
+    assert (
+        orchestrator._speculate(
+            _msg("请问发票怎么开"),
+            {
+                "scenario": "consultation",
+                "complexity": 0.1,
+                "has_requirement": False,
+            },
+        )
+        is None
+    )
+
+
+@pytest.mark.asyncio
+async def test_parallel_mode_answers_with_partial_results_and_pushes_late_ones(
+    orchestrator: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "parallel_timeout", 0.05)
+    release = asyncio.Event()
+
+    async def late_engineer(msg: Msg) -> Msg:
+        await release.wait()
+        return Msg(
+            name="EngineerAgent", content='{"suggested_reply": "已定位故障"}', role="assistant"
+        )
+
+    orchestrator.assistant_agent.return_value = Msg(
+        name="AssistantAgent", content='{"suggested_reply": "正在排查"}', role="assistant"
+    )
+    orchestrator.engineer_agent.side_effect = late_engineer
+    orchestrator.ws_manager.send_to_client = AsyncMock()
+
+    response = await orchestrator._execute_parallel(_msg("系统报错"), {"scenario": "fault"})
+
+    assert response.content == "正在排查"
+    assert response.metadata["execution_mode"] == "parallel_partial"
+    assert response.metadata["pending_agents"] == ["EngineerAgent"]
+
+    release.set()
+    await asyncio.gather(*orchestrator._background)
+
+    conversation_id, frame = orchestrator.ws_manager.send_to_client.await_args.args
+    assert conversation_id == "c1"
+    assert frame["type"] == "agent_update"
+    assert frame["agents"] == ["EngineerAgent"]
+    assert frame["content"] == "已定位故障"
+
+
+@pytest.mark.asyncio
+async def test_late_parallel_agent_outlives_request_deadline_and_stream(
+    orchestrator: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    release = asyncio.Event()
+    deltas: list[dict[str, object]] = []
+
+    async def send(frame: dict[str, object]) -> None:
+        deltas.append(frame)
+
+    async def late_engineer(msg: Msg) -> Msg:
+        await release.wait()
+        # A tool call made after the request's deadline has passed
+        check_deadline("mcp")
+        await publish_delta(
+            "EngineerAgent", Msg(name="EngineerAgent", content="迟到", role="assistant"), True
+        )
+        return Msg(
+            name="EngineerAgent", content='{"suggested_reply": "已定位故障"}', role="assistant"
+        )
+
+    orchestrator.assistant_agent.return_value = Msg(
+        name="AssistantAgent", content='{"suggested_reply": "正在排查"}', role="assistant"
+    )
+    orchestrator.engineer_agent.side_effect = late_engineer
+    orchestrator.ws_manager.send_to_client = AsyncMock()
+
+    with deadline_scope(Deadline.after(0.05)), stream_to(TokenStream("c1", send)):
+        response = await orchestrator._execute_parallel(_msg("系统报错"), {"scenario": "fault"})
+    assert response.metadata["execution_mode"] == "parallel_partial"
+
+    await asyncio.sleep(0.05)
+    release.set()
+    await asyncio.gather(*orchestrator._background)
+
+    assert deltas == []
+    frame = orchestrator.ws_manager.send_to_client.await_args.args[1]
+    assert frame["type"] == "agent_update"
+    assert frame["content"] == "已定位故障"
+
+
+@pytest.mark.asyncio
+async def test_async_human_handoff_returns_pending_and_pushes_reply(
+    orchestrator: OrchestratorAgent, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "human_handoff_async", True)
+    orchestrator.ws_manager.send_to_client = AsyncMock()
+    orchestrator.mcp_client.call_tool = AsyncMock(return_value=[])
+    orchestrator.human_agent = HumanAgentAdapter("Human", orchestrator.ws_manager)
+
+    response = await orchestrator._human_first_mode(_msg("我要投诉"))
+
+    assert response.metadata["execution_mode"] == "human_first_pending"
+    orchestrator.human_agent.receive_human_input("c1", "您好，我来处理", {})
+    await asyncio.gather(*orchestrator.human_agent.handoffs._tasks)
+    frame = orchestrator.ws_manager.send_to_client.await_args.args[1]
+    assert frame["type"] == "human_response"
+    assert frame["handoff_id"] == response.metadata["handoff_id"]
+    assert frame["content"] == "您好，我来处理"
@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from agentscope.message import Msg
+
+from src.memory import persistent_memory
+from src.memory.persistent_memory import PersistentMemory, flush_pending_memories
+from src.tools.persistence import PersistenceClient
+
+
+@pytest.fixture
+def persistence() -> MagicMock:
+    client = MagicMock()
+    client.record_agent_memory = AsyncMock()
+    client.load_agent_memory = AsyncMock(return_value=None)
+    return client
+
+
+def _msg(text: str) -> Msg:
+    return Msg(name="user", content=text, role="user")
+
+
+@pytest.mark.asyncio
+async def test_immediate_mode_flushes_every_mutation(persistence: MagicMock) -> None:
+    memory = PersistentMemory(persistence, "c1", "AssistantAgent")
+
+    await memory.add(_msg("a"))
+    await memory.add(_msg("b"))
+    await memory.delete(0)
+
+    assert persistence.record_agent_memory.await_count == 3
+    assert not memory.dirty
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_until_flush(persistence: MagicMock) -> None:
+    memory = PersistentMemory(persistence, "c1", "AssistantAgent", write_behind=True)
+
+    for text in ["a", "b", "c"]:
+        await memory.add(_msg(text))
+
+    persistence.record_agent_memory.assert_not_awaited()
+    assert memory.dirty
+
+    await memory.flush()
+    await memory.flush()
+
+    persistence.record_agent_memory.assert_awaited_once()
+    sent = persistence.record_agent_memory.await_args.kwargs["memory"]
+    assert [m["content"] for m in sent["content"]] == ["a", "b", "c"]
+    assert not memory.dirty
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_pending_threshold(persistence: MagicMock) -> None:
+    memory = PersistentMemory(persistence, "c1", "AssistantAgent", write_behind=True, max_pending=2)
+
+    await memory.add(_msg("a"))
+    persistence.record_agent_memory.assert_not_awaited()
+    await memory.add(_msg("b"))
+
+    persistence.record_agent_memory.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_interval(persistence: MagicMock) -> None:
+    memory = PersistentMemory(
+        persistence, "c1", "AssistantAgent", write_behind=True, flush_interval=0.0
+    )
+
+    await memory.add(_msg("a"))
+
+    persistence.record_agent_memory.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_state_dirty(persistence: MagicMock) -> None:
+    persistence.record_agent_memory.side_effect = RuntimeError("backend down")
+    memory = PersistentMemory(persistence, "c1", "AssistantAgent", write_behind=True)
+    await memory.add(_msg("a"))
+
+    with pytest.raises(RuntimeError):
+        await memory.flush()
+
+    assert memory.dirty
+
+
+@pytest.mark.asyncio
+async def test_flush_pending_memories_drains_dirty_instances(persistence: MagicMock) -> None:
+    persistent_memory._dirty_memories.clear()
+    first = PersistentMemory(persistence, "c1", "AssistantAgent", write_behind=True)
+    second = PersistentMemory(persistence, "c2", "EngineerAgent", write_behind=True)
+    await first.add(_msg("a"))
+    await second.clear()
+
+    flushed = await flush_pending_memories()
+
+    assert flushed == 2
+    assert persistence.record_agent_memory.await_count == 2
+    assert not first.dirty and not second.dirty
+
+
+@pytest.mark.asyncio
+async def test_hydrate_restores_messages(persistence: MagicMock) -> None:
+    persistence.load_agent_memory.return_value = {
+        "memory": {"content": [_msg("restored").to_dict()]},
+    }
+    memory = PersistentMemory(persistence, "c1", "AssistantAgent")
+
+    await memory.hydrate()
+
+    messages = await memory.get_memory()
+    assert [m.content for m in messages] == ["restored"]
+
+
+@pytest.fixture
+def delta_persistence(persistence: MagicMock) -> MagicMock:
+    persistence.supports_memory_delta = True
+    persistence.record_agent_memory_delta = AsyncMock()
+    return persistence
+
+
+@pytest.mark.asyncio
+async def test_delta_mode_sends_only_appended_records(delta_persistence: MagicMock) -> None:
+    memory = PersistentMemory(delta_persistence, "c1", "AssistantAgent", delta=True)
+
+    await memory.add(_msg("a"))
+    await memory.add([_msg("b"), _msg("c")])
+
+    delta_persistence.record_agent_memory.assert_not_awaited()
+    calls = delta_persistence.record_agent_memory_delta.await_args_list
+    assert calls[0].kwargs["base_seq"] == 0
+    assert [e["seq"] for e in calls[0].kwargs["entries"]] == [1]
+    assert calls[1].kwargs["base_seq"] == 1
+    assert [e["seq"] for e in calls[1].kwargs["entries"]] == [2, 3]
+    assert [e["msg"]["content"] for e in calls[1].kwargs["entries"]] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_delta_mode_snapshots_after_delete(delta_persistence: MagicMock) -> None:
+    memory = PersistentMemory(delta_persistence, "c1", "AssistantAgent", delta=True)
+    await memory.add([_msg("a"), _msg("b")])
+
+    await memory.delete(0)
+
+    delta_persistence.record_agent_memory.assert_awaited_once()
+    snapshot = delta_persistence.record_agent_memory.await_args.kwargs["memory"]
+    assert [m["content"] for m in snapshot["content"]] == ["b"]
+    assert snapshot["seq"] == 3
+
+    await memory.add(_msg("c"))
+    entries = delta_persistence.record_agent_memory_delta.await_args.kwargs["entries"]
+    assert [e["seq"] for e in entries] == [4]
+
+
+@pytest.mark.asyncio
+async def test_delta_mode_compacts_after_threshold(delta_persistence: MagicMock) -> None:
+    memory = PersistentMemory(
+        delta_persistence, "c1", "AssistantAgent", delta=True, compact_after=2
+    )
+
+    await memory.add(_msg("a"))
+    await memory.add(_msg("b"))
+    await memory.add(_msg("c"))
+
+    assert delta_persistence.record_agent_memory_delta.await_count == 2
+    delta_persistence.record_agent_memory.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_delta_mode_falls_back_when_backend_lacks_tool() -> None:
+    request = httpx.Request("POST", "http://backend/mcp")
+    missing = httpx.HTTPStatusError(
+        "not found", request=request, response=httpx.Response(404, request=request)
+    )
+
+    async def call_tool(name: str, **_: object) -> dict:
+        if name == "recordAgentMemoryDelta":
+            raise missing
+        return {}
+
+    backend = MagicMock()
+    backend.call_tool = AsyncMock(side_effect=call_tool)
+    client = PersistenceClient(backend)
+    memory = PersistentMemory(client, "c1", "AssistantAgent", delta=True)
+
+    await memory.add(_msg("a"))
+    await memory.add(_msg("b"))
+
+    names = [c.args[0] for c in backend.call_tool.await_args_list]
+    assert names == ["recordAgentMemoryDelta", "recordAgentMemory", "recordAgentMemory"]
+    assert client.supports_memory_delta is False
+
+
+@pytest.mark.asyncio
+async def test_hydrate_replays_deltas_after_snapshot(delta_persistence: MagicMock) -> None:
+    delta_persistence.load_agent_memory.return_value = {
+        "memory": {"content": [_msg("a").to_dict()], "seq": 2},
+        "deltas": [
+            {"seq": 4, "msg": _msg("c").to_dict()},
+            {"seq": 2, "msg": _msg("stale").to_dict()},
+            {"seq": 3, "msg": _msg("b").to_dict()},
+        ],
+    }
+    memory = PersistentMemory(delta_persistence, "c1", "AssistantAgent", delta=True)
+
+    await memory.hydrate()
+    await memory.add(_msg("d"))
+
+    assert [m.content for m in await memory.get_memory()] == ["a", "b", "c", "d"]
+    kwargs = delta_persistence.record_agent_memory_delta.await_args.kwargs
+    assert kwargs["base_seq"] == 4
+    assert [e["msg"]["content"] for e in kwargs["entries"]] == ["d"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_flush_is_not_reencoded_for_metrics(
+    persistence: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    encoded: list[object] = []
+    monkeypatch.setattr(
+        persistent_memory.json, "dumps", lambda body, **kw: encoded.append(body) or ""
+    )
+    memory = PersistentMemory(persistence, "c1", "AssistantAgent")
+
+    await memory.add(_msg("a"))
+
+    persistence.record_agent_memory.assert_awaited_once()
+    assert encoded == []
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.agents.prefetch import PrefetchEngine, PrefetchSource
+from src.config.settings import settings
+from src.tools.mcp_tools import BackendMCPClient, ToolCall, ToolResult
+
+
+def _samples(agent: str, source: str, status: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "agentscope_prefetch_source_duration_seconds_count",
+        {"agent": agent, "source": source, "status": status},
+    )
+    return value or 0.0
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    return MagicMock(spec=BackendMCPClient)
+
+
+@pytest.mark.asyncio
+async def test_sources_run_concurrently(client: MagicMock) -> None:
+    ready = asyncio.Event()
+
+    async def waiter() -> str:
+        await ready.wait()
+        return "after"
+
+    async def setter() -> str:
+        ready.set()
+        return "before"
+
+    result = await PrefetchEngine(client, "A").fetch(
+        [
+            PrefetchSource("waiter", fetch=waiter, deadline=1.0),
+            PrefetchSource("setter", fetch=setter, deadline=1.0),
+        ]
+    )
+
+    assert result == {"waiter": "after", "setter": "before"}
+
+
+@pytest.mark.asyncio
+async def test_source_missing_deadline_is_dropped(client: MagicMock) -> None:
+    async def slow() -> str:
+        await asyncio.sleep(1.0)
+        return "late"
+
+    async def fast() -> str:
+        return "ok"
+
+    before = _samples("Deadline", "slow", "timeout")
+    result = await PrefetchEngine(client, "Deadline").fetch(
+        [
+            PrefetchSource("slow", fetch=slow, deadline=0.01),
+            PrefetchSource("fast", fetch=fast, deadline=1.0),
+        ]
+    )
+
+    assert result == {"fast": "ok"}
+    assert _samples("Deadline", "slow", "timeout") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_tool_sources_share_one_batch(client: MagicMock) -> None:
+    client.call_tools_batch = AsyncMock(
+        return_value=[
+            ToolResult("getSystemStatus", result={"up": True}),
+            ToolResult("searchKnowledge", error="boom"),
+        ]
+    )
+
+    result = await PrefetchEngine(client, "A").fetch(
+        [
+            PrefetchSource("status", ToolCall("getSystemStatus")),
+            PrefetchSource("knowledge", ToolCall("searchKnowledge", {"query": "q"})),
+        ]
+    )
+
+    client.call_tools_batch.assert_awaited_once()
+    assert result == {"status": {"up": True}}
+
+
+@pytest.mark.asyncio
+async def test_unbatched_calls_are_cancelled_after_deadline(client: MagicMock) -> None:
+    client.supports_batch = False
+    cancelled = asyncio.Event()
+
+    async def call_tool(name: str, **_: Any) -> dict[str, Any]:
+        if name == "slowTool":
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        return {"tool": name}
+
+    client.call_tool = AsyncMock(side_effect=call_tool)
+
+    result = await PrefetchEngine(client, "A").fetch(
+        [
+            PrefetchSource("slow", ToolCall("slowTool"), deadline=0.01),
+            PrefetchSource("fast", ToolCall("fastTool"), deadline=1.0),
+        ]
+    )
+
+    assert result == {"fast": {"tool": "fastTool"}}
+    assert cancelled.is_set()
+
+
+def test_deadline_falls_back_to_settings(
+    client: MagicMock, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "prefetch_deadline", 2.0)
+    monkeypatch.setattr(settings, "prefetch_deadlines", {"knowledge": 0.7})
+    engine = PrefetchEngine(client, "A")
+
+    assert engine.deadline_for(PrefetchSource("knowledge")) == 0.7
+    assert engine.deadline_for(PrefetchSource("other")) == 2.0
+    assert engine.deadline_for(PrefetchSource("knowledge", deadline=0.1)) == 0.1
+
+
+@pytest.mark.asyncio
+async def test_on_error_reports_failed_and_late_sources(client: MagicMock) -> None:
+    async def broken() -> str:
+        raise RuntimeError("boom")
+
+    async def slow() -> str:
+        await asyncio.sleep(1.0)
+        return "late"
+
+    result = await PrefetchEngine(client, "OnError").fetch(
+        [
+            PrefetchSource("broken", fetch=broken, deadline=1.0, on_error=lambda e: f"failed: {e}"),
+            PrefetchSource("slow", fetch=slow, deadline=0.01, on_error=lambda e: f"failed: {e}"),
+        ]
+    )
+
+    assert result == {"broken": "failed: boom", "slow": "failed: no response within 0.01s"}
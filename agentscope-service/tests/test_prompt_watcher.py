@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from src.prompts import agent_prompt, loader
+from src.prompts import watcher as watcher_module
+from src.prompts.agent_prompt import compiled_prompts, stage_configs
+from src.prompts.loader import prompt_registry
+from src.prompts.watcher import PromptWatcher
+
+
+@pytest.fixture
+def repo_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    agents = tmp_path / "docs" / "prompts" / "agents"
+    (agents / "assistant").mkdir(parents=True)
+    (agents / "orchestrator").mkdir(parents=True)
+    (agents / "assistant" / "base.md").write_text("v1", encoding="utf-8")
+    (agents / "orchestrator" / "stage_config.yaml").write_text(
+        "assistant:\n  default: reply\n", encoding="utf-8"
+    )
+    monkeypatch.setattr(agent_prompt, "_repo_root", lambda: tmp_path)
+    monkeypatch.setattr(loader, "_repo_root", lambda: tmp_path)
+    prompt_registry.invalidate()
+    compiled_prompts.invalidate()
+    stage_configs.invalidate()
+    return tmp_path
+
+
+def _rewrite(path: Path, text: str) -> None:
+    stat = path.stat()
+    path.write_text(text, encoding="utf-8")
+    # Coarse filesystem timestamps could otherwise hide the change from polling
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+
+
+async def _wait_for_reload(watcher: PromptWatcher, count: int) -> None:
+    for _ in range(200):
+        if watcher.reload_count >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("prompt watcher did not reload")
+
+
+@pytest.mark.asyncio
+async def test_poll_watcher_reloads_changed_prompt(repo_root: Path) -> None:
+    watcher = PromptWatcher(backend="poll", poll_interval=0.01)
+    await watcher.start()
+    try:
+        assert watcher.backend == "poll"
+        assert prompt_registry.revalidate_after is None
+        assert prompt_registry.get("agents/assistant/base.md") == "v1"
+
+        _rewrite(repo_root / "docs/prompts/agents/assistant/base.md", "v2")
+        await _wait_for_reload(watcher, 1)
+
+        assert prompt_registry.get("agents/assistant/base.md") == "v2"
+        assert watcher.last_reload_at is not None
+    finally:
+        await watcher.stop()
+    assert prompt_registry.revalidate_after is not None
+
+
+@pytest.mark.asyncio
+async def test_inotify_watcher_reloads_stage_config(repo_root: Path) -> None:
+    if watcher_module._load_libc() is None:
+        pytest.skip("inotify not available")
+    watcher = PromptWatcher(backend="inotify", debounce=0.01)
+    await watcher.start()
+    try:
+        if watcher.backend != "inotify":
+            pytest.skip("inotify not available")
+        assert agent_prompt.load_agent_stage_config()["assistant"]["default"] == "reply"
+
+        _rewrite(
+            repo_root / "docs/prompts/agents/orchestrator/stage_config.yaml",
+            "assistant:\n  default: clarify\n",
+        )
+        await _wait_for_reload(watcher, 1)
+
+        assert agent_prompt.load_agent_stage_config()["assistant"]["default"] == "clarify"
+    finally:
+        await watcher.stop()
+
+
+def test_steady_state_lookups_skip_stat(repo_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(stage_configs, "revalidate_after", None)
+    monkeypatch.setattr(compiled_prompts, "revalidate_after", None)
+    (repo_root / "docs/prompts/agents/assistant/reply.md").write_text("stage", encoding="utf-8")
+    assert agent_prompt.load_agent_stage_config()
+    compiled_prompts.build("base", "assistant", ("reply",))
+
+    def _no_stat(path: Path) -> None:
+        raise AssertionError(f"unexpected stat of {path}")
+
+    monkeypatch.setattr(agent_prompt, "_mtime", _no_stat)
+    assert agent_prompt.load_agent_stage_config()["assistant"]["default"] == "reply"
+    assert compiled_prompts.build("base", "assistant", ("reply",)).endswith("stage")
+
+
+def test_reload_scopes_invalidation_to_agent(
+    repo_root: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(compiled_prompts, "revalidate_after", None)
+    agents = repo_root / "docs/prompts/agents"
+    (agents / "assistant" / "reply.md").write_text("one", encoding="utf-8")
+    (agents / "orchestrator" / "routing.md").write_text("route", encoding="utf-8")
+    compiled_prompts.build("base", "assistant", ("reply",))
+    compiled_prompts.build("base", "orchestrator", ("routing",))
+
+    PromptWatcher().reload([agents / "assistant" / "reply.md"])
+
+    assert len(compiled_prompts) == 1
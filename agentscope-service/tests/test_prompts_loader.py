@@ -36,3 +36,31 @@ def test_prompt_registry_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch)
 
     assert value1 == "first"
     assert value2 == "first"
+
+
+def test_prompt_registry_skips_stat_within_window(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(loader, "_repo_root", lambda: tmp_path)
+    prompt_dir = tmp_path / "docs" / "prompts"
+    prompt_dir.mkdir(parents=True, exist_ok=True)
+    prompt_file = prompt_dir / "window.md"
+    prompt_file.write_text("first", encoding="utf-8")
+    registry = loader.PromptRegistry(revalidate_after=None)
+
+    assert registry.get("window.md") == "first"
+    prompt_file.write_text("second", encoding="utf-8")
+    assert registry.get("window.md") == "first"
+
+    registry.invalidate("window.md")
+    assert registry.get("window.md") == "second"
+
+
+def test_prompt_registry_caches_missing_file_fallback(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(loader, "_repo_root", lambda: tmp_path)
+    registry = loader.PromptRegistry(revalidate_after=None)
+
+    assert registry.get("absent.md", fallback="fb") == "fb"
+    assert registry.get("absent.md") == ""
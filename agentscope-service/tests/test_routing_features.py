@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pytest
+
+from src.heuristics import routing_features
+from src.heuristics.routing_features import extract_routing_features, extract_routing_features_async
+
+
+def test_extract_routing_features_in_one_pass() -> None:
+    features = extract_routing_features("系统报错了，为什么？需要尽快处理，怎么办？")
+
+    assert features.scenario == "fault"
+    assert features.has_requirement is True
+    assert features.complexity == pytest.approx(0.0 + 0.2 + 0.2, abs=0.01)
+    assert features.hits.count("complex") == 2
+
+
+def test_extract_routing_features_defaults_for_empty_message() -> None:
+    features = extract_routing_features(None)
+
+    assert features.scenario == "consultation"
+    assert features.has_requirement is False
+    assert features.complexity == 0.0
+
+
+@pytest.mark.asyncio
+async def test_short_messages_stay_on_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    offloaded: list[str] = []
+
+    async def _to_thread(fn, content, matcher):
+        offloaded.append(content)
+        return fn(content, matcher)
+
+    monkeypatch.setattr(routing_features.asyncio, "to_thread", _to_thread)
+
+    short = await extract_routing_features_async("我要投诉", offload_threshold=16)
+    long = await extract_routing_features_async("投诉" * 20, offload_threshold=16)
+    always_inline = await extract_routing_features_async("投诉" * 20, offload_threshold=0)
+
+    assert offloaded == ["投诉" * 20]
+    assert short.scenario == long.scenario == always_inline.scenario == "complaint"
@@ -45,3 +45,63 @@ def test_load_stage_config_fallback_to_md(tmp_path: Path, monkeypatch: pytest.Mo
     data = agent_prompt.load_agent_stage_config()
 
     assert data["assistant"]["default"] == "reply"
+
+
+def _write_yaml(repo_root: Path, text: str) -> Path:
+    cfg_dir = repo_root / "docs" / "prompts" / "agents" / "orchestrator"
+    cfg_dir.mkdir(parents=True, exist_ok=True)
+    yaml_file = cfg_dir / "stage_config.yaml"
+    yaml_file.write_text(text, encoding="utf-8")
+    return yaml_file
+
+
+def test_stage_config_is_validated_against_defaults(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write_yaml(
+        tmp_path,
+        "assistant:\n"
+        "  fault: fault_reply_v2\n"
+        "engineer:\n"
+        "  parallel: []\n",
+    )
+    monkeypatch.setattr(agent_prompt, "_repo_root", lambda: tmp_path)
+
+    config = agent_prompt.StageConfigCache().get()
+
+    assert config.source == "yaml"
+    assert config.assistant_stage("fault") == "fault_reply_v2"
+    assert config.assistant_stage("vip") == "vip_reply"
+    assert config.engineer_parallel == ("diagnosis", "severity", "escalation", "report_summary")
+    assert config.inspector_quality == ("quality_report", "follow_up", "report_summary")
+    assert config.errors == ("engineer.parallel: expected a non-empty list",)
+    assert config.load_seconds >= 0 and config.parse_seconds >= 0
+
+
+def test_stage_config_is_parsed_once_and_versioned(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    _write_yaml(tmp_path, "assistant:\n  default: reply\n")
+    monkeypatch.setattr(agent_prompt, "_repo_root", lambda: tmp_path)
+    parse_calls: list[str] = []
+    original_parse = agent_prompt._parse_simple_yaml
+
+    def _counting_parse(raw: str) -> dict | None:
+        parse_calls.append(raw)
+        return original_parse(raw)
+
+    monkeypatch.setattr(agent_prompt, "_parse_simple_yaml", _counting_parse)
+    cache = agent_prompt.StageConfigCache(revalidate_after=None)
+
+    first = cache.get()
+    assert cache.get() is first
+    assert len(parse_calls) == 1
+
+    cache.invalidate()
+    assert cache.get().version == first.version
+
+    _write_yaml(tmp_path, "assistant:\n  default: clarify\n")
+    cache.invalidate()
+    updated = cache.get()
+    assert updated.version == first.version + 1
+    assert updated.assistant_stage("default") == "clarify"
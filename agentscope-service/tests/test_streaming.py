@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from agentscope.formatter import OpenAIChatFormatter
+from agentscope.memory import InMemoryMemory
+from agentscope.message import Msg
+from agentscope.model import OpenAIChatModel
+from agentscope.tool import Toolkit
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.agents.assistant_agent import AssistantAgent
+from src.agents.streaming import HeldStream, TokenStream, publish_delta, stream_to
+from src.api.routes import chat as chat_router
+from src.api.state import agent_manager
+from src.tools.mcp_tools import BackendMCPClient
+
+
+def _chunk(msg_id: str, text: str) -> Msg:
+    msg = Msg(name="AssistantAgent", content=text, role="assistant")
+    msg.id = msg_id
+    return msg
+
+
+class _StreamingRouter:
+    """Stands in for OrchestratorAgent: prints cumulative chunks like ReActAgent."""
+
+    async def route(self, msg: Msg) -> Msg:
+        for text, last in [("你", False), ("你好", False), ("你好！", True)]:
+            await publish_delta("AssistantAgent", _chunk("m1", text), last)
+        return Msg(name="AssistantAgent", content="你好！", role="assistant", metadata={})
+
+
+@pytest.fixture
+def streaming_router() -> Any:
+    agent_manager["router"] = _StreamingRouter()
+    yield agent_manager["router"]
+    agent_manager.pop("router", None)
+
+
+@pytest.mark.asyncio
+async def test_token_stream_sends_only_new_text() -> None:
+    frames: list[dict[str, Any]] = []
+
+    async def send(frame: dict[str, Any]) -> None:
+        frames.append(frame)
+
+    stream = TokenStream("c1", send)
+    await stream.publish("A", _chunk("m1", "he"), False)
+    await stream.publish("A", _chunk("m1", "he"), False)
+    await stream.publish("B", _chunk("m2", "x"), False)
+    await stream.publish("A", _chunk("m1", "hello"), True)
+
+    assert [(f["messageId"], f["delta"], f["last"]) for f in frames] == [
+        ("m1", "he", False),
+        ("m2", "x", False),
+        ("m1", "llo", True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publish_delta_follows_context_into_tasks() -> None:
+    frames: list[dict[str, Any]] = []
+
+    async def send(frame: dict[str, Any]) -> None:
+        frames.append(frame)
+
+    await publish_delta("A", _chunk("m0", "ignored"), True)
+    with stream_to(TokenStream("c1", send)):
+        await asyncio.gather(
+            publish_delta("A", _chunk("m1", "a"), True),
+            publish_delta("B", _chunk("m2", "b"), True),
+        )
+
+    assert sorted(f["delta"] for f in frames) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_held_stream_catches_up_on_release_and_drops_on_discard() -> None:
+    frames: list[dict[str, Any]] = []
+
+    async def send(frame: dict[str, Any]) -> None:
+        frames.append(frame)
+
+    stream = TokenStream("c1", send)
+    kept, dropped = HeldStream(stream), HeldStream(stream)
+    await kept.publish("A", _chunk("m1", "he"), False)
+    await kept.publish("A", _chunk("m1", "hell"), False)
+    await dropped.publish("A", _chunk("m2", "nope"), True)
+    assert frames == []
+
+    await kept.release()
+    await kept.publish("A", _chunk("m1", "hello"), True)
+    dropped.discard()
+    await dropped.publish("A", _chunk("m2", "nope!"), True)
+
+    assert [(f["messageId"], f["delta"], f["last"]) for f in frames] == [
+        ("m1", "hell", False),
+        ("m1", "o", True),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_agent_print_publishes_deltas() -> None:
+    agent = AssistantAgent(
+        name="AssistantAgent",
+        sys_prompt="prompt",
+        model=MagicMock(spec=OpenAIChatModel),
+        formatter=MagicMock(spec=OpenAIChatFormatter),
+        toolkit=Toolkit(),
+        mcp_client=MagicMock(spec=BackendMCPClient),
+        memory=InMemoryMemory(),
+        max_iters=1,
+    )
+    agent.set_console_output_enabled(False)
+    frames: list[dict[str, Any]] = []
+
+    async def send(frame: dict[str, Any]) -> None:
+        frames.append(frame)
+
+    with stream_to(TokenStream("c1", send)):
+        await agent.print(_chunk("m1", "部分"), False)
+
+    assert frames[0]["delta"] == "部分"
+    assert frames[0]["agent"] == "AssistantAgent"
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(chat_router.router, prefix="/api/chat")
+    return TestClient(app)
+
+
+_REQUEST = {"conversation_id": "c1", "message": "hi", "customer_id": "u1"}
+
+
+def test_sse_endpoint_streams_deltas_then_done(streaming_router: Any) -> None:
+    with _client().stream("POST", "/api/chat/message/stream", json=_REQUEST) as resp:
+        body = "".join(resp.iter_text())
+
+    events = [
+        (block.split("\n")[0].removeprefix("event: "), json.loads(block.split("\n")[1][6:]))
+        for block in body.strip().split("\n\n")
+    ]
+    assert [e for e, _ in events] == ["delta", "delta", "delta", "done"]
+    assert "".join(d["delta"] for e, d in events if e == "delta") == "你好！"
+    assert events[-1][1]["message"] == "你好！"
+
+
+def test_message_endpoint_pushes_deltas_to_websocket(streaming_router: Any) -> None:
+    sent: list[dict[str, Any]] = []
+
+    class _Manager:
+        async def send_to_client(self, conversation_id: str, payload: dict[str, Any]) -> None:
+            sent.append(payload)
+
+    previous = agent_manager.get("ws_manager")
+    agent_manager["ws_manager"] = _Manager()
+    try:
+        resp = _client().post("/api/chat/message", json=_REQUEST)
+    finally:
+        agent_manager["ws_manager"] = previous
+
+    assert resp.json()["message"] == "你好！"
+    assert [f["type"] for f in sent] == ["delta", "delta", "delta"]
+    assert sent[-1]["last"] is True
+
+
+def test_websocket_unregisters_when_the_handler_fails() -> None:
+    calls: list[tuple[str, str]] = []
+
+    class _Manager:
+        def register_client(self, conversation_id: str, socket: Any) -> None:
+            calls.append(("register", conversation_id))
+
+        def unregister_client(self, conversation_id: str, socket: Any) -> None:
+            calls.append(("unregister", conversation_id))
+
+    previous = agent_manager.get("ws_manager")
+    agent_manager["ws_manager"] = _Manager()
+    try:
+        with (
+            pytest.raises(json.JSONDecodeError),
+            _client().websocket_connect("/api/chat/ws/c1") as ws,
+        ):
+            ws.send_text("not json")
+            ws.receive_json()
+    finally:
+        agent_manager["ws_manager"] = previous
+
+    assert calls == [("register", "c1"), ("unregister", "c1")]
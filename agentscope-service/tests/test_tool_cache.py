@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.api.routes.events import BridgeEventRequest, bridge_event, register_bridge_handlers
+from src.api.state import agent_manager
+from src.events import EventDispatcher, NodeEventLedger
+from src.tools import tool_cache as tool_cache_module
+from src.tools.mcp_tools import BackendMCPClient, ToolCall
+from src.tools.tool_cache import ToolResultCache
+
+
+def _http(results: list[object]) -> MagicMock:
+    mock_http = MagicMock()
+    mock_http.post = AsyncMock(
+        side_effect=[MagicMock(json=lambda r=r: r, raise_for_status=lambda: None) for r in results]
+    )
+    return mock_http
+
+
+def test_key_ignores_argument_order() -> None:
+    cache = ToolResultCache(ttls={"searchKnowledge": 60})
+    cache.put("searchKnowledge", {"query": "q", "mode": "semantic"}, [1])
+
+    assert cache.get("searchKnowledge", {"mode": "semantic", "query": "q"}) == (True, [1])
+    assert cache.get("searchKnowledge", {"query": "other", "mode": "semantic"}) == (False, None)
+
+
+def test_entries_expire_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(tool_cache_module.time, "monotonic", lambda: now[0])
+    cache = ToolResultCache(ttls={"getSystemStatus": 10})
+    cache.put("getSystemStatus", {}, {"up": True})
+
+    now[0] = 109.0
+    assert cache.get("getSystemStatus", {})[0]
+    now[0] = 111.0
+    assert not cache.get("getSystemStatus", {})[0]
+
+
+def test_side_effect_tools_are_never_cached() -> None:
+    cache = ToolResultCache(ttls={"createTask": 60})
+
+    cache.put("createTask", {"title": "t"}, {"taskId": "1"})
+
+    assert not cache.cacheable("createTask")
+    assert len(cache) == 0
+
+
+def test_per_tool_max_size_evicts_lru() -> None:
+    cache = ToolResultCache(
+        ttls={"getCustomerProfile": 60, "searchKnowledge": 60},
+        max_sizes={"getCustomerProfile": 2},
+    )
+    for customer in ["a", "b"]:
+        cache.put("getCustomerProfile", {"customerId": customer}, {})
+    cache.get("getCustomerProfile", {"customerId": "a"})
+    cache.put("getCustomerProfile", {"customerId": "c"}, {})
+    cache.put("searchKnowledge", {"query": "q"}, [])
+
+    assert cache.get("getCustomerProfile", {"customerId": "a"})[0]
+    assert not cache.get("getCustomerProfile", {"customerId": "b"})[0]
+    assert len(cache) == 3
+
+
+def test_domain_events_invalidate_matching_entries() -> None:
+    cache = ToolResultCache(ttls={"getCustomerProfile": 60, "searchKnowledge": 60})
+    cache.put("getCustomerProfile", {"customerId": "c1"}, {})
+    cache.put("getCustomerProfile", {"customerId": "c2"}, {})
+    cache.put("searchKnowledge", {"query": "a"}, [])
+    cache.put("searchKnowledge", {"query": "b"}, [])
+
+    assert cache.invalidate_for_event({"eventType": "ProfileRefreshed", "aggregateId": "c1"}) == 1
+    assert (
+        cache.invalidate_for_event({"eventType": "KnowledgeItemUpdated", "aggregateId": "k"}) == 2
+    )
+    assert cache.invalidate_for_event({"eventType": "TaskCreated", "aggregateId": "t"}) == 0
+
+    assert not cache.get("getCustomerProfile", {"customerId": "c1"})[0]
+    assert cache.get("getCustomerProfile", {"customerId": "c2"})[0]
+    assert len(cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_client_serves_read_only_tools_from_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ToolResultCache(ttls={"getCustomerProfile": 60})
+    client = BackendMCPClient("http://localhost", cache=cache)
+    mock_http = _http(
+        [{"result": {"name": "A"}}, {"result": {"taskId": "1"}}, {"result": {"taskId": "2"}}]
+    )
+    monkeypatch.setattr(client, "_client_instance", AsyncMock(return_value=mock_http))
+
+    first = await client.call_tool("getCustomerProfile", customerId="c1")
+    first["name"] = "mutated"
+    second = await client.call_tool("getCustomerProfile", customerId="c1")
+    await client.call_tool("createTask", title="t")
+    await client.call_tool("createTask", title="t")
+
+    assert second == {"name": "A"}
+    assert mock_http.post.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_only_sends_uncached_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ToolResultCache(ttls={"getCustomerProfile": 60, "searchKnowledge": 60})
+    cache.put("getCustomerProfile", {"customerId": "c1"}, {"name": "A"})
+    client = BackendMCPClient("http://localhost", cache=cache)
+    mock_http = _http(
+        [
+            [
+                {"id": 0, "result": [{"title": "k"}]},
+                {"id": 1, "result": {"up": True}},
+            ]
+        ]
+    )
+    monkeypatch.setattr(client, "_client_instance", AsyncMock(return_value=mock_http))
+
+    results = await client.call_tools_batch(
+        [
+            ToolCall("searchKnowledge", {"query": "q"}),
+            ToolCall("getCustomerProfile", {"customerId": "c1"}),
+            ToolCall("getSystemStatus"),
+        ]
+    )
+
+    sent = mock_http.post.await_args.kwargs["json"]
+    assert [item["params"]["name"] for item in sent] == ["searchKnowledge", "getSystemStatus"]
+    assert [r.result for r in results] == [[{"title": "k"}], {"name": "A"}, {"up": True}]
+    assert cache.get("searchKnowledge", {"query": "q"}) == (True, [{"title": "k"}])
+
+
+@pytest.mark.asyncio
+async def test_bridge_event_invalidates_tool_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ToolResultCache(ttls={"getCustomerProfile": 60})
+    cache.put("getCustomerProfile", {"customerId": "c1"}, {})
+    monkeypatch.setattr("src.api.routes.events.tool_cache", cache)
+    dispatcher = EventDispatcher(workers=1)
+    register_bridge_handlers(dispatcher, NodeEventLedger(), None)
+    monkeypatch.setitem(agent_manager, "event_dispatcher", dispatcher)
+
+    await bridge_event(BridgeEventRequest(eventType="CustomerMarkedAsVIP", aggregateId="c1"))
+
+    # Invalidated before the EventBus gets its ack, not when a worker gets to the event
+    assert len(cache) == 0
+    await dispatcher.close()
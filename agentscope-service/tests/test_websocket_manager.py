@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from src.api.websocket_manager import WebSocketManager
+
+
+class _Socket:
+    def __init__(self, blocked: bool = False) -> None:
+        self.sent: list[dict[str, Any]] = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+        self.closed_with: int | None = None
+
+    async def send_json(self, payload: dict[str, Any]) -> None:
+        await self.gate.wait()
+        self.sent.append(payload)
+
+    async def close(self, code: int = 1000) -> None:
+        self.closed_with = code
+
+
+async def _drain() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_every_subscriber_of_a_conversation_receives_frames() -> None:
+    manager = WebSocketManager()
+    first, second, other = _Socket(), _Socket(), _Socket()
+    manager.register_client("c1", first)
+    manager.register_client("c1", second)
+    manager.register_client("c2", other)
+
+    await manager.send_to_client("c1", {"type": "agent_suggestions"})
+    await _drain()
+
+    assert first.sent == second.sent == [{"type": "agent_suggestions"}]
+    assert other.sent == []
+
+    manager.unregister_client("c1", first)
+    await manager.send_to_client("c1", {"type": "review_request"})
+    await _drain()
+    assert len(first.sent) == 1
+    assert second.sent[-1] == {"type": "review_request"}
+    await manager.close()
+    assert manager.connection_count == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_disconnected_without_blocking_sender() -> None:
+    manager = WebSocketManager(queue_size=2)
+    slow, fast = _Socket(blocked=True), _Socket()
+    manager.register_client("c1", slow)
+    manager.register_client("c1", fast)
+
+    for index in range(5):
+        await manager.send_to_client("c1", {"seq": index})
+        await _drain()
+
+    assert slow.closed_with == 1013
+    assert manager.subscribers("c1") == [fast]
+    assert [frame["seq"] for frame in fast.sent] == [0, 1, 2, 3, 4]
+    assert manager.status()["queued_frames"] == 0
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_keeps_connection_and_latest_frames() -> None:
+    manager = WebSocketManager(queue_size=2, slow_consumer_policy="drop_oldest")
+    slow = _Socket(blocked=True)
+    manager.register_client("c1", slow)
+    await _drain()
+
+    for index in range(5):
+        await manager.send_to_client("c1", {"seq": index})
+        await _drain()
+    slow.gate.set()
+    await asyncio.sleep(0.01)
+
+    # Frame 0 was already being sent; 1 and 2 were dropped for 3 and 4
+    assert [frame["seq"] for frame in slow.sent] == [0, 3, 4]
+    assert slow.closed_with is None
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_stalled_send_times_out() -> None:
+    manager = WebSocketManager(send_timeout=0.01)
+    stalled = _Socket(blocked=True)
+    manager.register_client("c1", stalled)
+
+    await manager.send_to_client("c1", {"seq": 0})
+    await asyncio.sleep(0.05)
+
+    assert manager.connection_count == 0
+    assert stalled.closed_with == 1013
+    await manager.close()